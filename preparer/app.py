@@ -17,6 +17,13 @@ def create_app(config: dict = None) -> Flask:
     app.config["PORTAL_DB_PATH"]    = str(portal_data / "portal.db")
     app.config["PREPARER_DB_PATH"]  = str(portal_data / "preparer.db")
     app.config["UPLOAD_FOLDER"]     = str(portal_data / "uploads")
+    # Rendered draft 1040 PDFs, keyed by input fingerprint (see pdf_cache.py)
+    app.config["PDF_CACHE_DIR"]       = str(portal_data / "pdf_cache")
+    app.config["PDF_CACHE_MAX_BYTES"] = 256 * 1024 * 1024
+    # Worker processes for the season batch download (None = one per CPU)
+    app.config["BATCH_1040_WORKERS"]  = None
+    # Clients per season batch zip; larger seasons download in ?part=N pieces
+    app.config["BATCH_1040_PART_SIZE"] = 100
     app.config["ALLOWED_EXTENSIONS"] = {
         ".pdf", ".jpg", ".jpeg", ".png", ".tif", ".tiff",
         ".doc", ".docx", ".xls", ".xlsx", ".csv", ".xml"
@@ -0,0 +1,203 @@
+"""
+Bulk rendering of draft Form 1040 packets.
+
+Filling a packet is CPU-bound pypdf work that holds the GIL, and the 1040 and
+its schedules are appended into one shared writer (see form_1040_filler), so
+the unit of parallelism is the whole packet: clients are spread across a
+process pool and each worker keeps its own parsed-template registry warm for
+every packet it renders.
+
+Everything here reads portal.db / preparer.db directly and needs no Flask app
+context, so the same code backs the preparer batch-download route and the
+headless season run:
+
+    python -m preparer.batch_1040 --year 2024 --out drafts_2024/
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from .database import get_manual_entries, get_parsed_documents, get_preparer_client_list
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@dataclass
+class PacketResult:
+    user_id: int
+    pdf_bytes: bytes | None
+    seconds: float
+    error: str | None = None
+
+
+def load_schedule_c_summaries(portal_db_path: str, user_id: int, year: int) -> list[dict]:
+    """Return one summary dict per business (business_index 0, 1, …). Empty list if none."""
+    try:
+        from portal.database import get_schedule_c_responses, get_schedule_c_business_count
+        from portal.schedule_c_interview import compute_net_profit
+        count = get_schedule_c_business_count(portal_db_path, user_id, year)
+        summaries = []
+        for bi in range(count):
+            responses = get_schedule_c_responses(portal_db_path, user_id, year, business_index=bi)
+            if not responses:
+                continue
+            all_answers: dict = {}
+            for part_data in responses.values():
+                all_answers.update(part_data.get("answers", {}))
+            summary = compute_net_profit(all_answers)
+            if summary.get("net_profit") is None:
+                continue
+            summaries.append({**summary, **all_answers, "business_index": bi})
+        return summaries
+    except Exception:
+        return []
+
+
+def season_clients(portal_db: str, preparer_db: str, year: int) -> list[dict]:
+    """Clients with at least one parsed document for year, in client-list order."""
+    return [c for c in get_preparer_client_list(portal_db, preparer_db, year) if c["parsed_count"]]
+
+
+def batch_parts(client_count: int, part_size: int) -> int:
+    """Number of zip parts the season batch download of client_count clients is split into."""
+    return max(1, -(-client_count // part_size))
+
+
+def packet_filename(client: dict, year: int) -> str:
+    from werkzeug.utils import secure_filename
+    return secure_filename(f"{client['display_name']}_{client['user_id']}_1040_{year}.pdf")
+
+
+def load_1040_data(portal_db: str, preparer_db: str, user_id: int, year: int) -> dict:
+    """Aggregate one client's Form 1040 data exactly as the preview route does."""
+    from portal.database import get_user_by_id
+    from .form_1040_filler import aggregate_1040_data
+
+    user           = get_user_by_id(portal_db, user_id)
+    parsed_docs    = get_parsed_documents(preparer_db, user_id, year)
+    manual_entries = get_manual_entries(preparer_db, user_id, year)
+    sc_summaries   = load_schedule_c_summaries(portal_db, user_id, year)
+    data           = aggregate_1040_data(parsed_docs, user or {}, year,
+                                         manual_entries=manual_entries,
+                                         schedule_c_summary=sc_summaries[0] if sc_summaries else None)
+    data["_user"] = user or {}
+    return data
+
+
+def _render_one(user_id: int, data: dict, pdf_forms_dir: str) -> PacketResult:
+    # Calls _do_fill rather than fill_1040_pdf so a failure is reported instead
+    # of silently replaced by the blank template.
+    from .form_1040_filler import _do_fill
+
+    start = time.perf_counter()
+    try:
+        pdf_bytes = _do_fill(data, pdf_forms_dir)
+    except Exception as exc:
+        return PacketResult(user_id, None, time.perf_counter() - start, f"{type(exc).__name__}: {exc}")
+    return PacketResult(user_id, pdf_bytes, time.perf_counter() - start)
+
+
+def render_packets(
+    jobs: Iterable[tuple[int, dict]],
+    pdf_forms_dir: str,
+    max_workers: int | None = None,
+) -> Iterator[PacketResult]:
+    """
+    Fill a draft 1040 packet for each (user_id, data) job, yielding results as
+    they complete.
+
+    jobs is consumed lazily with at most two packets queued per worker, so a
+    whole season can be streamed without holding every client's data in memory.
+    max_workers=1 renders in-process without a pool.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        for user_id, data in jobs:
+            yield _render_one(user_id, data, pdf_forms_dir)
+        return
+
+    job_iter = iter(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_workers * 2:
+                job = next(job_iter, None)
+                if job is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_render_one, job[0], job[1], pdf_forms_dir))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+
+def main(argv: list[str] | None = None) -> int:
+    portal_data = _PROJECT_ROOT / "portal_data"
+    p = argparse.ArgumentParser(description="Render draft Form 1040 packets for every client in a tax year")
+    p.add_argument("--year", required=True, type=int, help="Tax year (e.g. 2024)")
+    p.add_argument("--out", required=True, help="Output folder for the PDFs")
+    p.add_argument("--portal-db", default=str(portal_data / "portal.db"))
+    p.add_argument("--preparer-db", default=str(portal_data / "preparer.db"))
+    p.add_argument("--pdf-forms", default=str(_PROJECT_ROOT / "pdf_forms"), help="Blank IRS form templates")
+    p.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    p.add_argument("--user-id", type=int, action="append", default=[], help="Only this client, repeatable")
+    args = p.parse_args(argv)
+
+    clients = season_clients(args.portal_db, args.preparer_db, args.year)
+    if args.user_id:
+        clients = [c for c in clients if c["user_id"] in set(args.user_id)]
+    by_id = {c["user_id"]: c for c in clients}
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    done = 0
+
+    def _report_failure(client: dict, seconds: float, error: str) -> None:
+        print(f"[{done}/{len(clients)}] {client['display_name']} (#{client['user_id']}) "
+              f"FAILED {seconds:.2f}s  {error}", file=sys.stderr)
+
+    def _jobs():
+        # Each client's data is loaded only when a worker slot frees up.
+        nonlocal failed, done
+        for c in clients:
+            t0 = time.perf_counter()
+            try:
+                data = load_1040_data(args.portal_db, args.preparer_db, c["user_id"], args.year)
+            except Exception as exc:
+                failed += 1
+                done += 1
+                _report_failure(c, time.perf_counter() - t0, f"{type(exc).__name__}: {exc}")
+                continue
+            yield c["user_id"], data
+
+    start = time.perf_counter()
+    for result in render_packets(_jobs(), args.pdf_forms, args.workers):
+        done += 1
+        client = by_id[result.user_id]
+        prefix = f"[{done}/{len(clients)}] {client['display_name']} (#{result.user_id})"
+        if result.error:
+            failed += 1
+            _report_failure(client, result.seconds, result.error)
+            continue
+        (out_dir / packet_filename(client, args.year)).write_bytes(result.pdf_bytes)
+        print(f"{prefix} ok {result.seconds:.2f}s")
+
+    print(f"Rendered {len(clients) - failed}/{len(clients)} packets in "
+          f"{time.perf_counter() - start:.1f}s -> {out_dir}"
+          + (f" ({failed} failed)" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -45,8 +45,58 @@ CREATE TABLE IF NOT EXISTS field_overrides (
     UNIQUE(user_id, tax_year, doc_type, person, field)
 );
 CREATE INDEX IF NOT EXISTS idx_overrides_user_year ON field_overrides(user_id, tax_year);
+
+CREATE TABLE IF NOT EXISTS trades (
+    id                          INTEGER PRIMARY KEY AUTOINCREMENT,
+    upload_id                   INTEGER NOT NULL,
+    user_id                     INTEGER NOT NULL,
+    tax_year                    INTEGER NOT NULL,
+    seq                         INTEGER NOT NULL,
+    broker_name                 TEXT,
+    source_file                 TEXT,
+    source_sha256               TEXT,
+    source_page                 INTEGER,
+    description                 TEXT NOT NULL DEFAULT '',
+    security_identifier         TEXT,
+    date_acquired               TEXT,
+    date_sold_or_disposed       TEXT,
+    proceeds_gross              REAL,
+    cost_basis                  REAL,
+    wash_sale_code              TEXT,
+    wash_sale_amount            REAL,
+    federal_income_tax_withheld REAL,
+    holding_period              TEXT NOT NULL DEFAULT 'unknown',
+    basis_reported_to_irs       TEXT NOT NULL DEFAULT 'unknown',
+    adjustment_code             TEXT,
+    adjustment_amount           REAL,
+    realized_gain_loss          REAL,
+    form_8949_box               TEXT NOT NULL DEFAULT '',
+    raw_trade_line              TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trades_upload ON trades(upload_id, seq);
+CREATE INDEX IF NOT EXISTS idx_trades_user_year ON trades(user_id, tax_year);
+CREATE INDEX IF NOT EXISTS idx_trades_security ON trades(security_identifier);
+CREATE INDEX IF NOT EXISTS idx_trades_sold ON trades(date_sold_or_disposed);
+CREATE INDEX IF NOT EXISTS idx_trades_box ON trades(form_8949_box);
 """
 
+# Brokerage1099Trade fields persisted as columns of the trades table, in insert order.
+_TRADE_COLUMNS = (
+    "broker_name", "source_file", "source_sha256", "source_page",
+    "description", "security_identifier", "date_acquired", "date_sold_or_disposed",
+    "proceeds_gross", "cost_basis", "wash_sale_code", "wash_sale_amount",
+    "federal_income_tax_withheld", "holding_period", "basis_reported_to_irs",
+    "adjustment_code", "adjustment_amount", "realized_gain_loss",
+    "form_8949_box", "raw_trade_line",
+)
+
+_TRADE_DEFAULTS = {
+    "description": "",
+    "holding_period": "unknown",
+    "basis_reported_to_irs": "unknown",
+    "form_8949_box": "",
+}
+
 
 def _get_db(db_path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path)
@@ -58,11 +108,50 @@ def init_preparer_db(db_path: str) -> None:
     conn = _get_db(db_path)
     try:
         conn.executescript(SCHEMA)
+        _migrate_embedded_trades(conn)
         conn.commit()
     finally:
         conn.close()
 
 
+def _migrate_embedded_trades(conn: sqlite3.Connection) -> None:
+    """Move trades still stored inside extracted_json (pre-trades-table rows) into the trades table."""
+    rows = conn.execute(
+        """SELECT upload_id, user_id, tax_year, extracted_json FROM parsed_documents
+           WHERE json_type(extracted_json, '$.brokerage_1099_trades') IS NOT NULL"""
+    ).fetchall()
+    for r in rows:
+        extracted = json.loads(r["extracted_json"])
+        trades = extracted.pop("brokerage_1099_trades", None) or []
+        _replace_trades(conn, r["upload_id"], r["user_id"], r["tax_year"], trades)
+        conn.execute(
+            "UPDATE parsed_documents SET extracted_json = ? WHERE upload_id = ?",
+            (json.dumps(extracted), r["upload_id"]),
+        )
+
+
+def _replace_trades(
+    conn: sqlite3.Connection, upload_id: int, user_id: int, tax_year: int, trades: list[dict]
+) -> None:
+    """Replace all trade rows for an upload with one bulk insert."""
+    conn.execute("DELETE FROM trades WHERE upload_id = ?", (upload_id,))
+    if not trades:
+        return
+    placeholders = ", ".join("?" for _ in range(4 + len(_TRADE_COLUMNS)))
+    conn.executemany(
+        f"""INSERT INTO trades (upload_id, user_id, tax_year, seq, {", ".join(_TRADE_COLUMNS)})
+            VALUES ({placeholders})""",
+        (
+            (upload_id, user_id, tax_year, seq)
+            + tuple(
+                t.get(col) if t.get(col) is not None else _TRADE_DEFAULTS.get(col)
+                for col in _TRADE_COLUMNS
+            )
+            for seq, t in enumerate(trades)
+        ),
+    )
+
+
 def upsert_parsed_document(
     db_path: str,
     upload_id: int,
@@ -80,6 +169,9 @@ def upsert_parsed_document(
     flags: list,
 ) -> None:
     parsed_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    # Trades live in their own table; keep extracted_json small.
+    extracted_json = dict(extracted_json)
+    trades = extracted_json.pop("brokerage_1099_trades", None) or []
     conn = _get_db(db_path)
     try:
         conn.execute(
@@ -103,18 +195,26 @@ def upsert_parsed_document(
                 json.dumps(extracted_json), json.dumps(drake_json), json.dumps(flags),
             ),
         )
+        _replace_trades(conn, upload_id, user_id, tax_year, trades)
         conn.commit()
     finally:
         conn.close()
 
 
 def get_parsed_documents(db_path: str, user_id: int, tax_year: int) -> list[dict]:
+    """Return parsed documents with per-document trade_count / trade_fed_withheld
+    totals. The trade rows themselves are read with get_trades_page()."""
     conn = _get_db(db_path)
     try:
         rows = conn.execute(
-            """SELECT * FROM parsed_documents
-               WHERE user_id = ? AND tax_year = ?
-               ORDER BY category, original_name""",
+            """SELECT pd.*,
+                      COUNT(t.id)                          AS trade_count,
+                      SUM(t.federal_income_tax_withheld)   AS trade_fed_withheld
+               FROM parsed_documents pd
+               LEFT JOIN trades t ON t.upload_id = pd.upload_id
+               WHERE pd.user_id = ? AND pd.tax_year = ?
+               GROUP BY pd.id
+               ORDER BY pd.category, pd.original_name""",
             (user_id, tax_year),
         ).fetchall()
         result = []
@@ -236,6 +336,7 @@ def delete_parsed_document(db_path: str, upload_id: int) -> dict | None:
         ).fetchone()
         if row:
             conn.execute("DELETE FROM parsed_documents WHERE upload_id = ?", (upload_id,))
+            conn.execute("DELETE FROM trades WHERE upload_id = ?", (upload_id,))
             conn.commit()
             d = dict(row)
             d["extracted_json"] = json.loads(d["extracted_json"])
@@ -247,6 +348,62 @@ def delete_parsed_document(db_path: str, upload_id: int) -> dict | None:
         conn.close()
 
 
+def get_trades_page(
+    db_path: str,
+    user_id: int,
+    tax_year: int,
+    page: int = 1,
+    per_page: int = 100,
+    form_8949_box: str | None = None,
+    security_identifier: str | None = None,
+) -> dict:
+    """
+    Return one page of a client's 1099-B trades:
+    {"trades": [...], "total": int, "page": int, "per_page": int, "pages": int}
+
+    Each trade dict carries the trades-table columns plus the owning document's
+    original_name and account_number.
+    """
+    where = ["t.user_id = ?", "t.tax_year = ?"]
+    params: list = [user_id, tax_year]
+    if form_8949_box:
+        where.append("t.form_8949_box = ?")
+        params.append(form_8949_box)
+    if security_identifier:
+        where.append("t.security_identifier = ?")
+        params.append(security_identifier)
+    where_sql = " AND ".join(where)
+
+    per_page = max(1, per_page)
+    conn = _get_db(db_path)
+    try:
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM trades t WHERE {where_sql}", params
+        ).fetchone()[0]
+        pages = max(1, -(-total // per_page))
+        page = min(max(1, page), pages)
+        rows = conn.execute(
+            f"""SELECT t.*,
+                       pd.original_name,
+                       json_extract(pd.extracted_json, '$.brokerage_1099[0].account_number') AS account_number
+                FROM trades t
+                JOIN parsed_documents pd ON pd.upload_id = t.upload_id
+                WHERE {where_sql}
+                ORDER BY pd.category, pd.original_name, t.upload_id, t.seq
+                LIMIT ? OFFSET ?""",
+            params + [per_page, (page - 1) * per_page],
+        ).fetchall()
+        return {
+            "trades": [dict(r) for r in rows],
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+        }
+    finally:
+        conn.close()
+
+
 def get_manual_entries(db_path: str, user_id: int, tax_year: int) -> list[dict]:
     conn = _get_db(db_path)
     try:
@@ -14,13 +14,16 @@ Field-name reference (terminal /T value → line):
 NOTE ON MERGE CONFLICTS:
   Schedule B shares field-name prefixes (f1_01–f1_64) with Form 1040.
   Schedule D and Form 1040 both use f1_10–f1_43.
-  To prevent values leaking across forms when merged, schedule PDFs are filled
-  with auto_regenerate=True (bakes in appearance streams), then their AcroForm
-  is stripped before merging. Form 1040 retains its interactive AcroForm.
+  To prevent values leaking across forms when merged, schedules are appended to
+  the same output writer, filled with generated appearance streams, and their
+  fields are then dropped from the AcroForm. Form 1040 retains its interactive
+  AcroForm.
 """
 from __future__ import annotations
 
 import io
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -71,69 +74,103 @@ def _fmt_dob(dob: str | None) -> tuple[str, str, str]:
 
 
 # ---------------------------------------------------------------------------
-# AcroForm fill helper
+# Form template registry
 # ---------------------------------------------------------------------------
-
-def _fill_acro_pdf(template_path: str, fields_by_page: dict[int, dict[str, str]],
-                   generate_appearances: bool = False) -> bytes:
+#
+# Each blank IRS template in pdf_forms/ is parsed once per process and kept
+# with a map of its widget field names (/T) to page index. A template is
+# reloaded only if its file mtime changes. pypdf readers are not safe for
+# concurrent cloning, so appends from a shared reader hold the template lock.
+
+@dataclass(frozen=True)
+class _FormTemplate:
+    path: str
+    mtime_ns: int
+    reader: Any                                  # pypdf.PdfReader
+    field_pages: dict[str, int]                  # field name (/T) -> page index
+    lock: threading.Lock = field(default_factory=threading.Lock, compare=False)
+
+    def fields_on_page(self, page_idx: int, fields: dict[str, str]) -> dict[str, str]:
+        """Non-empty values in fields whose widget lives on page_idx."""
+        return {k: v for k, v in fields.items() if v and self.field_pages.get(k) == page_idx}
+
+
+_TEMPLATES: dict[str, _FormTemplate] = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def _widget_field_pages(reader) -> dict[str, int]:
+    field_pages: dict[str, int] = {}
+    for page_idx, page in enumerate(reader.pages):
+        for annot in page.get("/Annots") or []:
+            annot = annot.get_object()
+            if annot.get("/Subtype") != "/Widget":
+                continue
+            name = annot.get("/T")
+            if name is None and "/Parent" in annot:
+                name = annot["/Parent"].get_object().get("/T")
+            if name is not None:
+                field_pages.setdefault(str(name), page_idx)
+    return field_pages
+
+
+def _get_template(template_path: str) -> _FormTemplate:
     import pypdf
 
-    reader = pypdf.PdfReader(template_path)
-    writer = pypdf.PdfWriter()
-    writer.append(reader)
+    mtime_ns = Path(template_path).stat().st_mtime_ns
+    with _TEMPLATES_LOCK:
+        tpl = _TEMPLATES.get(template_path)
+        if tpl is None or tpl.mtime_ns != mtime_ns:
+            reader = pypdf.PdfReader(template_path)
+            tpl = _FormTemplate(template_path, mtime_ns, reader, _widget_field_pages(reader))
+            _TEMPLATES[template_path] = tpl
+        return tpl
 
-    acroform = writer._root_object.get("/AcroForm")
-    if acroform:
-        acroform_obj = acroform.get_object()
-        acroform_obj.update({
-            pypdf.generic.NameObject("/NeedAppearances"): pypdf.generic.BooleanObject(True)
-        })
 
-    for page_idx, fields in fields_by_page.items():
-        if page_idx < len(writer.pages):
-            writer.update_page_form_field_values(
-                writer.pages[page_idx],
-                {k: v for k, v in fields.items() if v},
-                auto_regenerate=generate_appearances,
-            )
-
-    buf = io.BytesIO()
-    writer.write(buf)
-    return buf.getvalue()
+# ---------------------------------------------------------------------------
+# AcroForm fill helpers
+# ---------------------------------------------------------------------------
 
+def _append_filled(writer, template_path: str, fields_by_page: dict[int, dict[str, str]],
+                   flatten: bool = False) -> None:
+    """
+    Append a template to writer and fill its pages in place.
 
-def _fill_schedule_flat(template_path: str, fields_by_page: dict[int, dict[str, str]]) -> bytes:
-    """Fill a schedule PDF with baked-in appearances, then strip AcroForm to prevent merge conflicts."""
+    With flatten=True the schedule's appearance streams are baked in and its
+    fields are dropped from the writer's AcroForm, so field names that collide
+    with Form 1040 (see module docstring) cannot leak values across forms.
+    """
     import pypdf
+    from pypdf.generic import ArrayObject, NameObject
 
-    # Fill with auto-generated appearances so values show without an AcroForm
-    pdf_bytes = _fill_acro_pdf(template_path, fields_by_page, generate_appearances=True)
-
-    # Strip AcroForm so the merged result doesn't have field-name collisions
-    reader = pypdf.PdfReader(io.BytesIO(pdf_bytes))
-    writer = pypdf.PdfWriter()
-    writer.append(reader)
-    root = writer._root_object
-    root_obj = root.get_object()
-    if "/AcroForm" in root_obj:
-        del root_obj[pypdf.generic.NameObject("/AcroForm")]
-
-    buf = io.BytesIO()
-    writer.write(buf)
-    return buf.getvalue()
+    tpl = _get_template(template_path)
+    first_page = len(writer.pages)
+    acroform = writer._root_object.get("/AcroForm")
+    fields_before = len(acroform.get_object().get("/Fields", [])) if acroform else 0
 
+    with tpl.lock:
+        writer.append(tpl.reader)
 
-def _merge_pdfs(pdf_bytes_list: list[bytes]) -> bytes:
-    import pypdf
+    acroform = writer._root_object.get("/AcroForm")
+    if acroform is None:
+        return
+    acroform_obj = acroform.get_object()
+    if not flatten:
+        acroform_obj[NameObject("/NeedAppearances")] = pypdf.generic.BooleanObject(True)
 
-    writer = pypdf.PdfWriter()
-    for pdf_bytes in pdf_bytes_list:
-        reader = pypdf.PdfReader(io.BytesIO(pdf_bytes))
-        writer.append(reader)
+    for page_idx, fields in fields_by_page.items():
+        values = tpl.fields_on_page(page_idx, fields)
+        if values and first_page + page_idx < len(writer.pages):
+            writer.update_page_form_field_values(
+                writer.pages[first_page + page_idx],
+                values,
+                # Leave the document-level flag alone while filling schedules
+                auto_regenerate=None if flatten else False,
+            )
 
-    buf = io.BytesIO()
-    writer.write(buf)
-    return buf.getvalue()
+    if flatten:
+        # Widgets keep their generated /AP; only the interactive field entries go.
+        acroform_obj[NameObject("/Fields")] = ArrayObject(acroform_obj["/Fields"][:fields_before])
 
 
 # ---------------------------------------------------------------------------
@@ -570,8 +607,12 @@ def aggregate_1040_data(parsed_docs: list[dict], user: dict, year: int,
                     if ws is not None:
                         lt_wash  = (lt_wash  or 0.0) + ws * lt_frac
 
-        for trade in ej.get("brokerage_1099_trades", []):
-            fw = trade.get("federal_income_tax_withheld")
+        # Trades are stored in the trades table; get_parsed_documents() attaches
+        # their withholding total. Docs built in memory may still embed trades.
+        trade_withheld = [doc.get("trade_fed_withheld")] + [
+            trade.get("federal_income_tax_withheld") for trade in ej.get("brokerage_1099_trades", [])
+        ]
+        for fw in trade_withheld:
             if fw is not None:
                 b_withheld += float(fw); has_any = True
                 if name not in b1099_sources:
@@ -900,6 +941,16 @@ def _build_sch1_fields(agg: dict, user: dict) -> dict[int, dict[str, str]]:
 # PDF generation entry point
 # ---------------------------------------------------------------------------
 
+# Schedules in packet order: (aggregate flag, template file, field builder)
+_SCHEDULES = (
+    ("has_sched_a", "f1040sa.pdf", _build_scha_fields),
+    ("has_sched_b", "f1040sb.pdf", _build_schb_fields),
+    ("has_sched_d", "f1040sd.pdf", _build_schd_fields),
+    ("has_sched_c", "f1040sc.pdf", _build_schc_fields),
+    ("has_sched_1", "f1040s1.pdf", _build_sch1_fields),
+)
+
+
 def fill_1040_pdf(data: dict, pdf_forms_dir: str) -> bytes:
     try:
         return _do_fill(data, pdf_forms_dir)
@@ -911,47 +962,27 @@ def fill_1040_pdf(data: dict, pdf_forms_dir: str) -> bytes:
 
 
 def _do_fill(data: dict, pdf_forms_dir: str) -> bytes:
+    import pypdf
+
     forms_dir = Path(pdf_forms_dir)
     user = data.get("_user", {})
 
-    all_pdfs: list[bytes] = []
+    # All forms are filled and flattened straight into one output writer.
+    writer = pypdf.PdfWriter()
 
     # Form 1040 — keep interactive AcroForm
     f1040_path = str(forms_dir / "f1040.pdf")
     f1040_fields = _build_1040_fields(data, user)
-    all_pdfs.append(_fill_acro_pdf(f1040_path, f1040_fields, generate_appearances=False))
-
-    # Schedules — flatten (bake appearances, strip AcroForm) to prevent field-name conflicts
-    if data.get("has_sched_a"):
-        scha_path = str(forms_dir / "f1040sa.pdf")
-        if Path(scha_path).exists():
-            scha_fields = _build_scha_fields(data, user)
-            all_pdfs.append(_fill_schedule_flat(scha_path, scha_fields))
-
-    if data.get("has_sched_b"):
-        schb_path = str(forms_dir / "f1040sb.pdf")
-        if Path(schb_path).exists():
-            schb_fields = _build_schb_fields(data, user)
-            all_pdfs.append(_fill_schedule_flat(schb_path, schb_fields))
-
-    if data.get("has_sched_d"):
-        schd_path = str(forms_dir / "f1040sd.pdf")
-        if Path(schd_path).exists():
-            schd_fields = _build_schd_fields(data, user)
-            all_pdfs.append(_fill_schedule_flat(schd_path, schd_fields))
-
-    if data.get("has_sched_c"):
-        schc_path = str(forms_dir / "f1040sc.pdf")
-        if Path(schc_path).exists():
-            schc_fields = _build_schc_fields(data, user)
-            all_pdfs.append(_fill_schedule_flat(schc_path, schc_fields))
-
-    if data.get("has_sched_1"):
-        sch1_path = str(forms_dir / "f1040s1.pdf")
-        if Path(sch1_path).exists():
-            sch1_fields = _build_sch1_fields(data, user)
-            all_pdfs.append(_fill_schedule_flat(sch1_path, sch1_fields))
-
-    if len(all_pdfs) == 1:
-        return all_pdfs[0]
-    return _merge_pdfs(all_pdfs)
+    _append_filled(writer, f1040_path, f1040_fields)
+
+    # Schedules — flatten (bake appearances, drop from AcroForm) to prevent field-name conflicts
+    for flag, filename, build_fields in _SCHEDULES:
+        if not data.get(flag):
+            continue
+        sched_path = str(forms_dir / filename)
+        if Path(sched_path).exists():
+            _append_filled(writer, sched_path, build_fields(data, user), flatten=True)
+
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
@@ -17,22 +17,21 @@ def parse_uploaded_file(file_path: str, use_ocr: bool = False, category_hint: st
         "confidence": float,
         "parsing_status": "done" | "failed",
         "parse_error": str | None,
-        "extracted": dict,   # raw parser output sliced into ExtractionResult shape
+        "extracted": dict,   # raw parser output sliced into ExtractionResult shape;
+                             # brokerage_1099_trades is split into the trades table on save
         "drake": dict,       # Drake-normalized field names (for Phase 2 RPA)
         "flags": list[dict], # review flags
     }
     """
     path = Path(file_path)
     try:
-        from src.extract.generic_pdf import get_document_text
+        # Parsers are imported per doc type, so a W-2 upload never loads the
+        # brokerage or 1098 parsers.
+        from src.extract.generic_pdf import get_document
         from src.classify import classify_document
-        from src.extract.w2 import parse_w2_text
-        from src.extract.brokerage_1099 import parse_brokerage_1099_text
-        from src.extract.form_1098 import parse_1098_text
-        from src.extract.form_1099b_trades import parse_1099b_trades_text
 
-        text, _notes = get_document_text(path, enable_ocr=use_ocr)
-        doc_type, confidence, _year = classify_document(path, text)
+        doc, _notes = get_document(path, enable_ocr=use_ocr)
+        doc_type, confidence, _year = classify_document(path, doc)
 
         # If the upload category implies a brokerage form but classification didn't
         # pick it up (e.g. low-confidence composite PDF), force brokerage parsing.
@@ -47,21 +46,25 @@ def parse_uploaded_file(file_path: str, use_ocr: bool = False, category_hint: st
 
         extracted: dict = {}
         if doc_type == "w2":
-            data = parse_w2_text(text)
+            from src.extract.w2 import parse_w2_text
+            data = parse_w2_text(doc)
             extracted = {"w2": [asdict(data)]}
         elif doc_type == "brokerage_1099":
-            summary = parse_brokerage_1099_text(text)
-            trades = parse_1099b_trades_text(text)
+            from src.extract.brokerage_1099 import parse_brokerage_1099_text
+            from src.extract.form_1099b_trades import parse_1099b_trades_text
+            summary = parse_brokerage_1099_text(doc)
+            trades, _diag = parse_1099b_trades_text(doc, summary.broker_name, path.name, "")
             extracted = {
                 "brokerage_1099": [asdict(summary)],
                 "brokerage_1099_trades": [asdict(t) for t in trades],
             }
         elif doc_type == "form_1098":
-            data = parse_1098_text(text)
+            from src.extract.form_1098 import parse_1098_text
+            data = parse_1098_text(doc)
             extracted = {"form_1098": [asdict(data)]}
         elif doc_type == "prior_year_return":
             from src.extract.prior_year_return import parse_prior_year_return_text
-            data = parse_prior_year_return_text(text)
+            data = parse_prior_year_return_text(doc)
             extracted = {"prior_year_return": [asdict(data)]}
 
         drake = _to_drake_fields(doc_type, extracted)
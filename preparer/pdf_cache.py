@@ -0,0 +1,102 @@
+"""
+On-disk cache of rendered draft 1040 PDFs.
+
+Entries are keyed by a fingerprint of the aggregated 1040 data, the
+versions (size + mtime) of the blank IRS templates in pdf_forms/, and a hash
+of the filler's source, so a cached PDF is reused until the client's data, a
+template, or the filling code changes. The same
+fingerprint doubles as the HTTP ETag for the preview and download routes.
+
+The cache directory is bounded by total size; least-recently-used entries
+(by file mtime, refreshed on every hit) are evicted first.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SUFFIX = ".pdf"
+
+
+def _template_versions(pdf_forms_dir: str) -> list[tuple[str, int, int]]:
+    versions = []
+    for p in sorted(Path(pdf_forms_dir).glob("*.pdf")):
+        st = p.stat()
+        versions.append((p.name, st.st_size, st.st_mtime_ns))
+    return versions
+
+
+@lru_cache(maxsize=1)
+def _filler_version() -> str:
+    """Hash of form_1040_filler.py, so a deploy that changes how packets are filled invalidates them."""
+    return hashlib.sha256(Path(__file__).with_name("form_1040_filler.py").read_bytes()).hexdigest()
+
+
+def fingerprint(data: dict, pdf_forms_dir: str) -> str:
+    """Return a stable hex digest of the 1040 data, the template file versions and the filler version."""
+    payload = json.dumps(
+        {"data": data, "templates": _template_versions(pdf_forms_dir), "filler": _filler_version()},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get(cache_dir: str, key: str) -> bytes | None:
+    """Return cached PDF bytes for key, or None on a miss."""
+    path = Path(cache_dir) / f"{key}{_SUFFIX}"
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # mark as recently used
+    except OSError:
+        pass
+    return data
+
+
+def put(cache_dir: str, key: str, pdf_bytes: bytes, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    """Store pdf_bytes under key (atomically), then evict LRU entries above max_bytes."""
+    if not pdf_bytes or len(pdf_bytes) > max_bytes:
+        return
+    root = Path(cache_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=root, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp, root / f"{key}{_SUFFIX}")
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return
+    _evict(root, max_bytes)
+
+
+def _evict(root: Path, max_bytes: int) -> None:
+    entries = []
+    for p in root.glob(f"*{_SUFFIX}"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, p in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        try:
+            p.unlink()
+            total -= size
+        except OSError:
+            pass
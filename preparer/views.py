@@ -3,13 +3,14 @@ import json
 from pathlib import Path
 from flask import (
     Blueprint, render_template, request, redirect,
-    url_for, session, current_app, jsonify, flash, send_file,
+    url_for, session, current_app, jsonify, flash, send_file, abort,
 )
 from .auth import login_required
 from .database import (
     get_preparer_client_list,
     get_parsed_documents,
     get_parsed_document_by_upload_id,
+    get_trades_page,
     reparse_document,
     reparse_document_azure,
     delete_parsed_document,
@@ -21,6 +22,7 @@ from .database import (
     delete_field_overrides_for_doctype,
     delete_field_override_by_person_field,
 )
+from .batch_1040 import load_1040_data, load_schedule_c_summaries as _load_schedule_c_summaries
 
 preparer_bp = Blueprint(
     "preparer",
@@ -61,6 +63,10 @@ def _tax_year_context() -> dict:
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Rows per page in the 1099-B Individual Transactions table
+_TRADES_PER_PAGE = 100
+
+
 def _portal_db() -> str:
     return current_app.config["PORTAL_DB_PATH"]
 
@@ -236,11 +242,14 @@ def client_list():
         preparer_db=_preparer_db(),
         tax_year=year,
     )
+    from .batch_1040 import batch_parts
+    season_count = sum(1 for c in clients if c["parsed_count"])
     return render_template(
         "preparer/client_list.html",
         clients=clients,
         year=year,
         tax_years=ctx["tax_years"],
+        batch_parts=batch_parts(season_count, current_app.config["BATCH_1040_PART_SIZE"]),
     )
 
 
@@ -300,6 +309,12 @@ def client_detail(user_id: int):
     form_1040_data = aggregate_1040_data(parsed_docs, user, year, manual_entries=manual_entries,
                                          schedule_c_summaries=sc_summaries)
     field_overrides = get_field_overrides(_preparer_db(), user_id, year)
+    trades_page = get_trades_page(
+        _preparer_db(), user_id, year,
+        page=request.args.get("trades_page", 1, type=int),
+        per_page=_TRADES_PER_PAGE,
+        form_8949_box=request.args.get("trades_box") or None,
+    )
 
     num_children = int(user.get("num_dependents") or 0)
 
@@ -466,6 +481,8 @@ def client_detail(user_id: int):
         manual_entries=manual_entries,
         charitable_entries=[e for e in manual_entries if e["category"] in ("charitable_cash", "charitable_noncash")],
         field_overrides=field_overrides,
+        trades_page=trades_page,
+        trades_box=request.args.get("trades_box", ""),
         tax_estimate=tax_estimate,
         year_columns=year_columns,
         ref_main_lines=ref_main_lines,
@@ -1036,74 +1053,117 @@ def delete_manual_entry_route(user_id: int, year: int, entry_id: int):
     return redirect(url_for("preparer.client_detail", user_id=user_id, year=year))
 
 
-def _load_schedule_c_summaries(portal_db_path: str, user_id: int, year: int) -> list[dict]:
-    """Return one summary dict per business (business_index 0, 1, …). Empty list if none."""
-    try:
-        from portal.database import get_schedule_c_responses, get_schedule_c_business_count
-        from portal.schedule_c_interview import compute_net_profit
-        count = get_schedule_c_business_count(portal_db_path, user_id, year)
-        summaries = []
-        for bi in range(count):
-            responses = get_schedule_c_responses(portal_db_path, user_id, year, business_index=bi)
-            if not responses:
-                continue
-            all_answers: dict = {}
-            for part_data in responses.values():
-                all_answers.update(part_data.get("answers", {}))
-            summary = compute_net_profit(all_answers)
-            if summary.get("net_profit") is None:
-                continue
-            summaries.append({**summary, **all_answers, "business_index": bi})
-        return summaries
-    except Exception:
-        return []
+def _generate_1040_pdf(user_id: int, year: int) -> tuple[bytes | None, str]:
+    """
+    Return (pdf_bytes, etag) for the client's draft 1040 packet.
+
+    pdf_bytes is None when the request's If-None-Match already matches the
+    etag, so the caller can answer 304 without touching the PDF cache.
+    """
+    from .form_1040_filler import fill_1040_pdf
+    from . import pdf_cache
 
+    data = load_1040_data(_portal_db(), _preparer_db(), user_id, year)
+    pdf_forms_dir = str(Path(current_app.root_path).parent / "pdf_forms")
 
-def _load_schedule_c_summary(portal_db_path: str, user_id: int, year: int) -> dict | None:
-    """Return first business summary for callers that expect a single dict (e.g. PDF filler)."""
-    summaries = _load_schedule_c_summaries(portal_db_path, user_id, year)
-    return summaries[0] if summaries else None
+    etag = pdf_cache.fingerprint(data, pdf_forms_dir)
+    if etag in request.if_none_match:
+        return None, etag
 
+    cache_dir = current_app.config["PDF_CACHE_DIR"]
+    pdf_bytes = pdf_cache.get(cache_dir, etag)
+    if pdf_bytes is None:
+        pdf_bytes = fill_1040_pdf(data, pdf_forms_dir)
+        pdf_cache.put(cache_dir, etag, pdf_bytes,
+                      max_bytes=current_app.config["PDF_CACHE_MAX_BYTES"])
+    return pdf_bytes, etag
 
-def _generate_1040_pdf(user_id: int, year: int) -> bytes:
-    from portal.database import get_user_by_id
-    from .form_1040_filler import aggregate_1040_data, fill_1040_pdf
 
-    user           = get_user_by_id(_portal_db(), user_id)
-    parsed_docs    = get_parsed_documents(_preparer_db(), user_id, year)
-    manual_entries = get_manual_entries(_preparer_db(), user_id, year)
-    sc_summary     = _load_schedule_c_summary(_portal_db(), user_id, year)
-    data           = aggregate_1040_data(parsed_docs, user or {}, year,
-                                         manual_entries=manual_entries,
-                                         schedule_c_summary=sc_summary)
-    data["_user"] = user or {}
-    pdf_forms_dir = str(Path(current_app.root_path).parent / "pdf_forms")
-    return fill_1040_pdf(data, pdf_forms_dir)
+def _send_1040_pdf(pdf_bytes: bytes | None, etag: str, **send_kwargs):
+    if pdf_bytes is None:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+    else:
+        response = send_file(io.BytesIO(pdf_bytes), mimetype="application/pdf",
+                             etag=etag, conditional=True, **send_kwargs)
+    # The PDF contains client PII: allow browser reuse only after revalidation.
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 
 @preparer_bp.route("/client/<int:user_id>/tax-return/pdf")
 @login_required
 def tax_return_pdf(user_id: int):
     year = int(request.args.get("year", _tax_year_context()["current_year"]))
-    pdf_bytes = _generate_1040_pdf(user_id, year)
-    return send_file(
-        io.BytesIO(pdf_bytes),
-        mimetype="application/pdf",
-        as_attachment=False,
-    )
+    pdf_bytes, etag = _generate_1040_pdf(user_id, year)
+    return _send_1040_pdf(pdf_bytes, etag, as_attachment=False)
 
 
 @preparer_bp.route("/client/<int:user_id>/tax-return/download")
 @login_required
 def tax_return_download(user_id: int):
     year = int(request.args.get("year", _tax_year_context()["current_year"]))
-    pdf_bytes = _generate_1040_pdf(user_id, year)
-    return send_file(
-        io.BytesIO(pdf_bytes),
-        mimetype="application/pdf",
-        as_attachment=True,
-        download_name=f"Form_1040_draft_{year}.pdf",
-    )
+    pdf_bytes, etag = _generate_1040_pdf(user_id, year)
+    return _send_1040_pdf(pdf_bytes, etag, as_attachment=True,
+                          download_name=f"Form_1040_draft_{year}.pdf")
+
+
+@preparer_bp.route("/tax-returns/<int:year>/batch")
+@login_required
+def tax_return_batch(year: int):
+    """Zip of draft 1040 packets for one part (?part=N) of the clients with parsed documents in year."""
+    import tempfile
+    import zipfile
+    from .batch_1040 import batch_parts, packet_filename, render_packets, season_clients
+    from . import pdf_cache
+
+    pdf_forms_dir = str(Path(current_app.root_path).parent / "pdf_forms")
+    cache_dir = current_app.config["PDF_CACHE_DIR"]
+    part_size = current_app.config["BATCH_1040_PART_SIZE"]
+    clients = season_clients(_portal_db(), _preparer_db(), year)
+    parts = batch_parts(len(clients), part_size)
+    part = request.args.get("part", 1, type=int)
+    if not 1 <= part <= parts:
+        abort(404)
+    clients = clients[(part - 1) * part_size:part * part_size]
+    names = {c["user_id"]: packet_filename(c, year) for c in clients}
+
+    # Built in a temp file (in memory only while small) and streamed from it.
+    out = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    failures: list[str] = []
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        # Serve unchanged packets from the PDF cache; only misses are rendered.
+        jobs, etags = [], {}
+        for c in clients:
+            try:
+                data = load_1040_data(_portal_db(), _preparer_db(), c["user_id"], year)
+                etags[c["user_id"]] = etag = pdf_cache.fingerprint(data, pdf_forms_dir)
+            except Exception as exc:
+                failures.append(f"{names[c['user_id']]}: {type(exc).__name__}: {exc}")
+                continue
+            cached = pdf_cache.get(cache_dir, etag)
+            if cached is not None:
+                zf.writestr(names[c["user_id"]], cached)
+            else:
+                jobs.append((c["user_id"], data))
+
+        for result in render_packets(jobs, pdf_forms_dir,
+                                     max_workers=current_app.config.get("BATCH_1040_WORKERS")):
+            if result.error:
+                failures.append(f"{names[result.user_id]}: {result.error}")
+                continue
+            zf.writestr(names[result.user_id], result.pdf_bytes)
+            pdf_cache.put(cache_dir, etags[result.user_id], result.pdf_bytes,
+                          max_bytes=current_app.config["PDF_CACHE_MAX_BYTES"])
+        if failures:
+            zf.writestr("FAILED.txt", "\n".join(sorted(failures)) + "\n")
+
+    out.seek(0)
+    suffix = f"_part{part}of{parts}" if parts > 1 else ""
+    response = send_file(out, mimetype="application/zip", as_attachment=True,
+                         download_name=f"Form_1040_drafts_{year}{suffix}.zip")
+    response.headers["Cache-Control"] = "private, no-store"
+    return response
 
 
 @preparer_bp.route("/settings", methods=["GET"])
@@ -3,6 +3,10 @@ from __future__ import annotations
 import re
 from collections import Counter
 from pathlib import Path
+from typing import NamedTuple, Optional
+
+from src.extract.document import Document, as_document
+from src.extract.generic_pdf import get_document_cached
 
 W2_PATTERNS = [r"w[-_ ]?2", r"form\s*w-?2", r"wage and tax statement"]
 BROKER_PATTERNS = [
@@ -49,13 +53,20 @@ def _score(patterns: list[str], haystack: str) -> float:
     return round(min(1.0, hits / len(patterns)), 3)
 
 
-def detect_year(text: str) -> int | None:
+def _year_counts(text: str) -> Counter[int]:
     raw = re.findall(r"\b(20\d{2})\b", text)
-    candidates = [int(y) for y in raw if 2000 <= int(y) <= 2100]
-    if not candidates:
+    return Counter(int(y) for y in raw if 2000 <= int(y) <= 2100)
+
+
+def detect_year(text: str) -> int | None:
+    return _most_common_year(_year_counts(text))
+
+
+def _most_common_year(counts: Counter[int]) -> int | None:
+    if not counts:
         return None
     # Most common year is almost always the document's actual tax year.
-    return Counter(candidates).most_common(1)[0][0]
+    return counts.most_common(1)[0][0]
 
 
 def classify_document_structured(file_path: Path) -> tuple[str, float] | None:
@@ -84,7 +95,9 @@ def classify_document_structured(file_path: Path) -> tuple[str, float] | None:
     return None
 
 
-def classify_document(file_path: Path, text: str) -> tuple[str, float, int | None]:
+def classify_document(file_path: Path, text: str | Document) -> tuple[str, float, int | None]:
+    doc = as_document(text)
+    text = doc.text
     # Sample beginning, middle, and end to catch form indicators across all pages
     # without running all patterns against the full text of very large PDFs.
     text_len = len(text)
@@ -94,6 +107,12 @@ def classify_document(file_path: Path, text: str) -> tuple[str, float, int | Non
         mid = text_len // 2
         sample = text[:4000] + text[mid - 2000:mid + 2000] + text[-4000:]
     haystack = f"{file_path.name}\n{sample}"
+    if sample is text:
+        # The haystack is the file name plus the whole text, whose year
+        # counts the Document already holds.
+        year = _most_common_year(_year_counts(file_path.name) + doc.year_counts)
+    else:
+        year = detect_year(haystack)
 
     scores = {
         "w2": _score(W2_PATTERNS, haystack),
@@ -113,5 +132,31 @@ def classify_document(file_path: Path, text: str) -> tuple[str, float, int | Non
 
     doc_type, confidence = max(scores.items(), key=lambda kv: kv[1])
     if confidence < 0.25:
-        return "unknown", round(confidence * 0.8, 2), detect_year(haystack)
-    return doc_type, round(confidence, 2), detect_year(haystack)
+        return "unknown", round(confidence * 0.8, 2), year
+    return doc_type, round(confidence, 2), year
+
+
+class ClassifiedFile(NamedTuple):
+    doc_type: str
+    confidence: float
+    year: int | None
+    # Extracted text; None for structured CSV/XML files, which are not extracted
+    doc: Optional[Document]
+    notes: list[str]
+
+
+def classify_file(
+    file_path: Path,
+    enable_ocr: bool = False,
+    extracted: Optional[tuple[Document, list[str]]] = None,
+) -> ClassifiedFile:
+    """Classify a file as process_client() does: CSV/XML by content signature,
+    everything else from its extracted text (extracted, else the shared
+    document cache)."""
+    structured = classify_document_structured(file_path)
+    if structured is not None:
+        doc_type, confidence = structured
+        return ClassifiedFile(doc_type, confidence, None, None, [f"structured:{file_path.suffix.lower()[1:]}"])
+    doc, notes = extracted or get_document_cached(file_path, enable_ocr)
+    doc_type, confidence, year = classify_document(file_path, doc)
+    return ClassifiedFile(doc_type, confidence, year, doc, notes)
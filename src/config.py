@@ -18,11 +18,15 @@ class AppConfig:
     client_filter: str | None = None
     organize: bool = False
     organize_dry_run: bool = False
+    # Undo an interrupted --organize run instead of processing
+    organize_rollback: bool = False
     taxpayer_name: str | None = None
     spouse_name: str | None = None
     spouse_aliases: tuple[str, ...] = ()
     compare_prior_year: bool = False
     prior_year_root: Path | None = None
+    # Processes extracting and parsing one client's documents; 0 = one per CPU
+    workers: int = 1
     enable_azure: bool = False
     azure_endpoint: str | None = None
     azure_api_key: str | None = None
@@ -31,3 +35,13 @@ class AppConfig:
     num_children: int = 0
     estimated_payments: float = 0.0
     foreign_tax_credit: float = 0.0
+    # Only rebuild Tax_Estimate.* from existing Data_Extract.json files
+    recompute_estimates: bool = False
+    # Multi-year comparison: (tax_year, root) per prior year
+    history_roots: tuple[tuple[int, Path], ...] = ()
+    anomaly_pct_threshold: float = 20.0
+    anomaly_z_threshold: float = 3.0
+    # Watch mode: reprocess clients as documents land (see src/watch.py)
+    watch: bool = False
+    watch_debounce: float = 2.0
+    watch_polling: bool = False
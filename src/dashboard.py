@@ -2,22 +2,33 @@ from __future__ import annotations
 
 import csv
 import json
+import os
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-# Module-level mtime cache: key=(str_path, mtime) -> parsed result
-_file_cache: dict[tuple, Any] = {}
+from src.file_cache import FileCache
+
+# Written by process_client: one small record per client, so the dashboard
+# never has to re-read Document_Index.csv or the (potentially huge)
+# Data_Extract.json just to count rows.
+SUMMARY_FILE = "Client_Summary.json"
+# Root-level, append-only JSON lines index of those records (last line per
+# client wins); compacted by the dashboard once superseded lines pile up.
+INDEX_FILE = "Dashboard_Index.jsonl"
+
+_SOURCE_FILES = ("Document_Index.csv", "Questions_For_Client.md", "Data_Extract.json")
+_EXTRACT_COUNT_KEYS = ("w2", "brokerage_1099", "form_1098", "unknown")
+_index_lock = threading.Lock()
+
+# Parsed workpaper files, shared by every request of a long-running webapp.
+_file_cache = FileCache()
 
 
 def _read_cached(path: Path, loader):
-    """Return loader(path) cached by (absolute_path, mtime). Returns None if file missing."""
-    if not path.exists():
-        return None
-    key = (str(path.resolve()), path.stat().st_mtime)
-    if key not in _file_cache:
-        _file_cache[key] = loader(path)
-    return _file_cache[key]
+    """Return loader(path), cached until the file changes. Returns None if file missing."""
+    return _file_cache.get(path, loader)
 
 
 @dataclass
@@ -33,15 +44,19 @@ class ClientSummary:
     extraction_counts: dict[str, int] = field(default_factory=dict)
 
 
-def _parse_questions(path: Path) -> list[str]:
+def question_tasks(markdown: str) -> list[str]:
     tasks: list[str] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
+    for line in markdown.splitlines():
         line = line.strip()
         if line.startswith("- "):
             tasks.append(line[2:].strip())
     return tasks
 
 
+def _parse_questions(path: Path) -> list[str]:
+    return question_tasks(path.read_text(encoding="utf-8"))
+
+
 def parse_questions_markdown(path: Path) -> list[str]:
     result = _read_cached(path, _parse_questions)
     return result if result is not None else []
@@ -65,7 +80,7 @@ def load_document_index(path: Path) -> dict[str, Any]:
 def _parse_extract_counts(path: Path) -> dict[str, int]:
     data = json.loads(path.read_text(encoding="utf-8"))
     counts: dict[str, int] = {}
-    for key in ["w2", "brokerage_1099", "form_1098", "unknown"]:
+    for key in _EXTRACT_COUNT_KEYS:
         val = data.get(key)
         if isinstance(val, list):
             counts[key] = len(val)
@@ -77,17 +92,34 @@ def load_extract_counts(path: Path) -> dict[str, int]:
     return result if result is not None else {}
 
 
-def _parse_document_records(path: Path) -> list[dict[str, Any]]:
-    """Load Document_Index.csv with key_fields column parsed from JSON string to dict."""
-    records = []
+def iter_document_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream Document_Index.csv rows with key_fields parsed; nothing is cached."""
     with path.open("r", encoding="utf-8", newline="") as f:
         for row in csv.DictReader(f):
             try:
                 row["key_fields"] = json.loads(row.get("key_fields") or "{}")
             except (json.JSONDecodeError, TypeError):
                 row["key_fields"] = {}
-            records.append(dict(row))
-    return records
+            yield dict(row)
+
+
+def _parse_document_records(path: Path) -> list[dict[str, Any]]:
+    """Load Document_Index.csv with key_fields column parsed from JSON string to dict."""
+    return list(iter_document_records(path))
+
+
+def key_field_columns(records) -> list[str]:
+    """Every key_fields name across records, in first-seen order."""
+    columns: dict[str, None] = {}
+    for rec in records:
+        kf = rec.get("key_fields")
+        if isinstance(kf, dict):
+            columns.update(dict.fromkeys(kf))
+    return list(columns)
+
+
+def _parse_key_field_columns(path: Path) -> list[str]:
+    return key_field_columns(iter_document_records(path))
 
 
 def load_document_records(path: Path) -> list[dict[str, Any]]:
@@ -96,6 +128,12 @@ def load_document_records(path: Path) -> list[dict[str, Any]]:
     return result if result is not None else []
 
 
+def load_key_field_columns(path: Path) -> list[str]:
+    """Export column schema for a Document_Index.csv, cached until the file changes."""
+    result = _read_cached(path, _parse_key_field_columns)
+    return result if result is not None else []
+
+
 def build_client_summary(client_dir: Path) -> ClientSummary:
     out_dir = client_dir / "_workpapers"
     has_outputs = out_dir.exists()
@@ -113,6 +151,225 @@ def build_client_summary(client_dir: Path) -> ClientSummary:
     return summary
 
 
+def _source_stamps(out_dir: Path) -> dict[str, list[int] | None]:
+    """(mtime_ns, size) of each file a summary is derived from; None if missing."""
+    stamps: dict[str, list[int] | None] = {}
+    for name in _SOURCE_FILES:
+        try:
+            st = (out_dir / name).stat()
+        except OSError:
+            stamps[name] = None
+        else:
+            stamps[name] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+def _summary_record(summary: ClientSummary, sources: dict[str, list[int] | None]) -> dict[str, Any]:
+    return {
+        "client": summary.client,
+        "sources": sources,
+        "document_count": summary.document_count,
+        "unknown_count": summary.unknown_count,
+        "error_count": summary.error_count,
+        "tasks": summary.tasks,
+        "extraction_counts": summary.extraction_counts,
+    }
+
+
+def _summary_from_record(client_dir: Path, record: dict[str, Any]) -> ClientSummary:
+    tasks = list(record.get("tasks") or [])
+    return ClientSummary(
+        client=client_dir.name,
+        workpapers_dir=client_dir / "_workpapers",
+        has_outputs=True,
+        document_count=int(record.get("document_count", 0)),
+        unknown_count=int(record.get("unknown_count", 0)),
+        error_count=int(record.get("error_count", 0)),
+        task_count=len(tasks),
+        tasks=tasks,
+        extraction_counts=dict(record.get("extraction_counts") or {}),
+    )
+
+
+def _append_index(root: Path, records: list[dict[str, Any]]) -> None:
+    lines = "".join(json.dumps(r, sort_keys=True, separators=(",", ":")) + "\n" for r in records)
+    with _index_lock, (root / INDEX_FILE).open("a", encoding="utf-8") as f:
+        f.write(lines)
+
+
+def _load_index(path: Path) -> tuple[dict[str, dict[str, Any]], int]:
+    """Latest record per client, plus the number of lines read."""
+    latest: dict[str, dict[str, Any]] = {}
+    lines = 0
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            lines += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn write from an interrupted run
+            if isinstance(record, dict) and record.get("client"):
+                latest[record["client"]] = record
+    return latest, lines
+
+
+def _compact_index(root: Path, records: list[dict[str, Any]]) -> None:
+    path = root / INDEX_FILE
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with _index_lock:
+        with tmp.open("w", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r, sort_keys=True, separators=(",", ":")) + "\n")
+        os.replace(tmp, path)
+
+
+def write_client_summary(
+    client_dir: Path,
+    doc_types: list[str],
+    extraction: Any,
+    questions_markdown: str,
+) -> ClientSummary:
+    """
+    Record the dashboard summary for a freshly processed client: writes
+    _workpapers/Client_Summary.json and appends it to the root index. Call
+    after Document_Index.csv, Questions_For_Client.md and Data_Extract.json
+    are written so the recorded source stamps match them.
+    """
+    out_dir = client_dir / "_workpapers"
+    tasks = question_tasks(questions_markdown)
+    summary = ClientSummary(
+        client=client_dir.name,
+        workpapers_dir=out_dir,
+        has_outputs=True,
+        document_count=len(doc_types),
+        unknown_count=doc_types.count("unknown"),
+        error_count=doc_types.count("error"),
+        task_count=len(tasks),
+        tasks=tasks,
+        extraction_counts={key: len(getattr(extraction, key)) for key in _EXTRACT_COUNT_KEYS},
+    )
+    record = _summary_record(summary, _source_stamps(out_dir))
+    (out_dir / SUMMARY_FILE).write_text(json.dumps(record, sort_keys=True), encoding="utf-8")
+    _append_index(client_dir.parent, [record])
+    return summary
+
+
+def _refresh_summary(client_dir: Path, sources: dict[str, list[int] | None]) -> tuple[ClientSummary, dict[str, Any]]:
+    """Summary for a client whose index entry is missing or stale."""
+    out_dir = client_dir / "_workpapers"
+    try:
+        record = json.loads((out_dir / SUMMARY_FILE).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        record = None
+    if isinstance(record, dict) and record.get("sources") == sources:
+        return _summary_from_record(client_dir, record), record
+    # Outputs from before summaries existed, or hand-edited since: parse them.
+    summary = build_client_summary(client_dir)
+    return summary, _summary_record(summary, sources)
+
+
 def list_client_summaries(root: Path) -> list[ClientSummary]:
+    """
+    Summaries for every client under root, served from the root index. Each
+    client is revalidated by stat()ing its source files only; clients whose
+    files changed since their record was written are re-summarised and the
+    fresh records appended to the index.
+    """
     clients = [p for p in root.iterdir() if p.is_dir() and not p.name.startswith("_")]
-    return sorted((build_client_summary(c) for c in clients), key=lambda x: x.client.lower())
+    loaded = _read_cached(root / INDEX_FILE, _load_index)
+    index, line_count = loaded if loaded is not None else ({}, 0)
+
+    summaries: list[ClientSummary] = []
+    live: list[dict[str, Any]] = []
+    refreshed: list[dict[str, Any]] = []
+    for client_dir in clients:
+        out_dir = client_dir / "_workpapers"
+        if not out_dir.exists():
+            summaries.append(ClientSummary(client=client_dir.name, workpapers_dir=out_dir, has_outputs=False))
+            continue
+        sources = _source_stamps(out_dir)
+        record = index.get(client_dir.name)
+        if record is not None and record.get("sources") == sources:
+            summaries.append(_summary_from_record(client_dir, record))
+        else:
+            summary, record = _refresh_summary(client_dir, sources)
+            summaries.append(summary)
+            refreshed.append(record)
+        live.append(record)
+
+    if line_count + len(refreshed) > 2 * len(live) + 16:
+        _compact_index(root, live)
+    elif refreshed:
+        _append_index(root, refreshed)
+    return sorted(summaries, key=lambda x: x.client.lower())
+
+
+# Sort keys accepted by query_client_summaries -> ClientSummary attribute.
+SORT_FIELDS = {
+    "client": "client",
+    "docs": "document_count",
+    "unknown": "unknown_count",
+    "errors": "error_count",
+    "tasks": "task_count",
+}
+# Filters accepted by query_client_summaries -> predicate on a summary.
+FILTERS = {
+    "unknown": lambda s: s.unknown_count > 0,
+    "errors": lambda s: s.error_count > 0,
+    "tasks": lambda s: s.task_count > 0,
+    "no_outputs": lambda s: not s.has_outputs,
+}
+MAX_PER_PAGE = 500
+
+
+@dataclass
+class ClientPage:
+    clients: list[ClientSummary]
+    total: int
+    page: int
+    per_page: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.per_page))
+
+
+def query_client_summaries(
+    root: Path,
+    q: str = "",
+    filters: tuple[str, ...] | list[str] = (),
+    sort: str = "client",
+    descending: bool = False,
+    page: int = 1,
+    per_page: int = 50,
+) -> ClientPage:
+    """
+    One page of client summaries from the root index. q matches a substring
+    of the client folder name (case-insensitive); every named filter must
+    hold. Ties in the sort key are broken by client name. Unknown sort or
+    filter names raise ValueError; page and per_page are clamped.
+    """
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Unknown sort {sort!r}; expected one of {sorted(SORT_FIELDS)}")
+    unknown = [f for f in filters if f not in FILTERS]
+    if unknown:
+        raise ValueError(f"Unknown filter(s) {unknown}; expected any of {sorted(FILTERS)}")
+
+    summaries = list_client_summaries(root)   # already sorted by client name
+    needle = q.strip().lower()
+    if needle:
+        summaries = [s for s in summaries if needle in s.client.lower()]
+    for name in filters:
+        summaries = [s for s in summaries if FILTERS[name](s)]
+    if sort != "client":
+        attr = SORT_FIELDS[sort]
+        summaries.sort(key=lambda s: getattr(s, attr), reverse=descending)   # stable
+    elif descending:
+        summaries.reverse()
+
+    per_page = min(max(1, per_page), MAX_PER_PAGE)
+    result = ClientPage(clients=[], total=len(summaries), page=1, per_page=per_page)
+    result.page = min(max(1, page), result.pages)
+    start = (result.page - 1) * per_page
+    result.clients = summaries[start:start + per_page]
+    return result
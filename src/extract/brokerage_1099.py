@@ -3,7 +3,8 @@ from __future__ import annotations
 import re
 from typing import Optional
 
-from src.extract.text_utils import extract_amount_after_label, normalize_extracted_text, parse_amount_token
+from src.extract.document import Document, as_document
+from src.extract.text_utils import extract_amount_after_label, parse_amount_token
 from src.models import Brokerage1099Data
 
 
@@ -78,13 +79,13 @@ def _parse_covered_noncovered_totals(text: str) -> dict:
     return result
 
 
-def parse_brokerage_1099_text(text: str) -> Brokerage1099Data:
+def parse_brokerage_1099_text(text: str | Document) -> Brokerage1099Data:
     data = Brokerage1099Data()
-    text = normalize_extracted_text(text)
+    doc = as_document(text)
+    text = doc.normalized
 
-    year_match = re.search(r"\b(20\d{2})\b", text)
-    if year_match:
-        data.year = int(year_match.group(1))
+    if doc.years:
+        data.year = doc.years[0]
 
     broker_match = re.search(r"(?:Broker|Payer|Financial Institution)[:\s]+(.+)", text, re.IGNORECASE)
     if broker_match:
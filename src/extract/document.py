@@ -0,0 +1,104 @@
+"""
+One source document's text plus the views every classifier and parser
+derives from it.
+
+process_client() builds a Document per file and hands the same object to
+classify_document() and to whichever parse_*_text() applies, so the
+normalized text, its lines, amount tokens and years are computed once per
+document however many consumers read them. Every view is lazy: a parser that
+never asks for lines never pays for them.
+
+The parsers also still accept a plain string; as_document() wraps it.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections import Counter
+from functools import cached_property
+from typing import NamedTuple, Sequence
+
+from src.extract.text_utils import normalize_extracted_text, parse_amount_token
+
+_AMOUNT_TOKEN_RE = re.compile(r"\d[\d,]*\.\d{2}")
+_YEAR_RE = re.compile(r"\b(20\d{2})\b")
+
+
+class AmountToken(NamedTuple):
+    value: float
+    token: str
+    start: int
+    end: int
+
+
+def find_amount_tokens(text: str) -> list[AmountToken]:
+    """Every "1,234.56"-style amount in text order."""
+    return [
+        AmountToken(parse_amount_token(m.group(0)), m.group(0), m.start(), m.end())
+        for m in _AMOUNT_TOKEN_RE.finditer(text)
+    ]
+
+
+class Document:
+    """Extracted text of one file with memoized derived views.
+
+    pages, when given, are the per-page texts the extractor joined into text
+    (embedded pages first, then any OCR pages); page_offsets locates each of
+    them in text.
+    """
+
+    def __init__(self, text: str, pages: Sequence[str] = ()) -> None:
+        self.text = text
+        self.pages = tuple(pages)
+
+    @cached_property
+    def normalized(self) -> str:
+        return normalize_extracted_text(self.text)
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercase normalized text."""
+        return self.normalized.lower()
+
+    @cached_property
+    def lines(self) -> list[str]:
+        """Lines of the normalized text."""
+        return self.normalized.splitlines()
+
+    @cached_property
+    def amount_tokens(self) -> list[AmountToken]:
+        """Amount tokens of the normalized text, with offsets into it."""
+        return find_amount_tokens(self.normalized)
+
+    @cached_property
+    def years(self) -> list[int]:
+        """Every 20xx year in the normalized text, in order of appearance."""
+        return [int(y) for y in _YEAR_RE.findall(self.normalized)]
+
+    @cached_property
+    def year_counts(self) -> Counter[int]:
+        """Occurrences of each 20xx year in the raw text, first seen first."""
+        return Counter(int(y) for y in _YEAR_RE.findall(self.text))
+
+    @cached_property
+    def page_offsets(self) -> list[int]:
+        """Offset in text where each page starts; [0] when pages are unknown."""
+        offsets: list[int] = []
+        cursor = 0
+        for page in self.pages:
+            body = page.strip()
+            found = self.text.find(body, cursor) if body else -1
+            if found >= 0:
+                cursor = found
+            offsets.append(cursor)
+            if found >= 0:
+                cursor += len(body)
+        return offsets or [0]
+
+    def page_at(self, offset: int) -> int:
+        """1-based page number holding text offset."""
+        return max(1, bisect_right(self.page_offsets, offset))
+
+
+def as_document(source: str | Document) -> Document:
+    return source if isinstance(source, Document) else Document(source)
@@ -3,7 +3,8 @@ from __future__ import annotations
 import re
 from typing import Optional
 
-from src.extract.text_utils import extract_amount_after_label, normalize_extracted_text, parse_amount_token
+from src.extract.document import Document, as_document
+from src.extract.text_utils import extract_amount_after_label, parse_amount_token
 from src.models import Form1098Data
 
 
@@ -16,9 +17,10 @@ def _amt(raw: str) -> Optional[float]:
     return parse_amount_token(raw.replace(",", ""))
 
 
-def parse_1098_text(text: str) -> Form1098Data:
+def parse_1098_text(text: str | Document) -> Form1098Data:
     data = Form1098Data()
-    text = normalize_extracted_text(text)
+    doc = as_document(text)
+    text = doc.normalized
 
     # --- Year ---
     # Prefer explicit "YEAR: 2024" label from Rocket/Mr.Cooper escrow header.
@@ -29,10 +31,8 @@ def parse_1098_text(text: str) -> Form1098Data:
         cal_m = re.search(r"For\s+calendar\s+year\s*\n?\s*(20\d{2})", text, re.IGNORECASE)
         if cal_m:
             data.year = int(cal_m.group(1))
-        else:
-            generic_m = re.search(r"\b(20\d{2})\b", text)
-            if generic_m:
-                data.year = int(generic_m.group(1))
+        elif doc.years:
+            data.year = doc.years[0]
 
     # --- Lender name ---
     # Strategy 1: escrow summary line "BORROWER_NAME  LenderName\nYEAR: 20XX".
@@ -3,7 +3,8 @@ from __future__ import annotations
 import re
 from typing import Optional
 
-from src.extract.text_utils import extract_amount_after_label, normalize_extracted_text
+from src.extract.document import Document, as_document
+from src.extract.text_utils import extract_amount_after_label
 from src.models import Form1098TData
 
 
@@ -11,13 +12,13 @@ def _money(pattern: str, text: str) -> Optional[float]:
     return extract_amount_after_label(pattern, text)
 
 
-def parse_1098_t_text(text: str) -> Form1098TData:
+def parse_1098_t_text(text: str | Document) -> Form1098TData:
     data = Form1098TData()
-    text = normalize_extracted_text(text)
+    doc = as_document(text)
+    text = doc.normalized
 
-    year_match = re.search(r"\b(20\d{2})\b", text)
-    if year_match:
-        data.year = int(year_match.group(1))
+    if doc.years:
+        data.year = doc.years[0]
 
     # Filer (institution) name — appears before FILER'S TIN or as first block
     filer_match = re.search(
@@ -8,7 +8,8 @@ from typing import Dict, List, Optional, Tuple
 
 _log = logging.getLogger(__name__)
 
-from src.extract.text_utils import normalize_extracted_text, parse_amount_token
+from src.extract.document import Document, as_document
+from src.extract.text_utils import parse_amount_token
 from src.models import Brokerage1099Trade
 
 _DATE_PATTERNS = ["%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d"]
@@ -172,13 +173,12 @@ def _extract_trade_line(
 
 
 def parse_1099b_trades_text(
-    text: str,
+    text: str | Document,
     broker_name: Optional[str],
     source_file: str,
     source_sha256: str,
 ) -> Tuple[List[Brokerage1099Trade], ParseDiagnostics]:
-    normalized = normalize_extracted_text(text)
-    rows = [r.strip() for r in normalized.splitlines() if r.strip()]
+    rows = [r.strip() for r in as_document(text).lines if r.strip()]
     context = SectionContext()
     diagnostics = ParseDiagnostics()
     trades: List[Brokerage1099Trade] = []
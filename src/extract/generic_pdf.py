@@ -1,44 +1,53 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import Optional
 
 from src.config import MIN_TEXT_LENGTH_FOR_OCR_SKIP
+from src.extract.document import Document
+from src.file_cache import FileCache
 
+# (Document, notes) per file, shared by --organize and process_client() so a
+# file is extracted once per run. Keyed by file identity: a file organize
+# moved within the filesystem is still a hit. The byte budget counts source
+# file sizes, which bound the extracted text.
+_document_cache = FileCache(max_entries=4096, max_bytes=256 * 1024 * 1024, by_identity=True)
 
-def extract_pdf_text(path: Path) -> tuple[str, list[str]]:
-    text_parts: List[str] = []
+
+def extract_pdf_pages(path: Path) -> tuple[list[str], list[str]]:
+    """Embedded text of each PDF page, and extraction notes."""
     notes: list[str] = []
     try:
         import pdfplumber  # type: ignore
 
         with pdfplumber.open(str(path)) as pdf:
-            for page in pdf.pages:
-                text_parts.append(page.extract_text() or "")
-        combined = "\n".join(text_parts).strip()
+            pages = [page.extract_text() or "" for page in pdf.pages]
         # Distinguish image-only PDFs (no embedded text) from text PDFs.
-        if combined:
+        if "\n".join(pages).strip():
             notes.append("embedded_text_extracted:pdfplumber")
         else:
             notes.append("embedded_text_empty:pdfplumber")
-        return combined, notes
+        return pages, notes
     except Exception as exc_pdfplumber:
         notes.append(f"embedded_text_error:pdfplumber:{type(exc_pdfplumber).__name__}")
         try:
             from pypdf import PdfReader  # type: ignore
 
             reader = PdfReader(str(path))
-            for page in reader.pages:
-                text_parts.append(page.extract_text() or "")
-            combined = "\n".join(text_parts).strip()
-            if combined:
+            pages = [page.extract_text() or "" for page in reader.pages]
+            if "\n".join(pages).strip():
                 notes.append("embedded_text_extracted:pypdf")
             else:
                 notes.append("embedded_text_empty:pypdf")
-            return combined, notes
+            return pages, notes
         except Exception as exc_pypdf:
             notes.append(f"embedded_text_error:pypdf:{type(exc_pypdf).__name__}")
-            return "", notes
+            return [], notes
+
+
+def extract_pdf_text(path: Path) -> tuple[str, list[str]]:
+    pages, notes = extract_pdf_pages(path)
+    return "\n".join(pages).strip(), notes
 
 
 def _configure_tesseract(pytesseract: object) -> None:
@@ -102,14 +111,15 @@ def _pdf_pages_to_images(path: Path, notes: list[str]) -> list:
     return []
 
 
-def ocr_image_or_pdf(path: Path) -> tuple[str, list[str]]:
+def ocr_pages(path: Path) -> tuple[list[str], list[str]]:
+    """OCR text of each page of a PDF or image, and OCR notes."""
     notes: list[str] = []
     try:
         import pytesseract  # type: ignore
         from PIL import Image, ImageOps  # type: ignore
     except Exception as exc:
         notes.append(f"ocr_unavailable:{type(exc).__name__}")
-        return "", notes
+        return [], notes
 
     _configure_tesseract(pytesseract)
 
@@ -125,25 +135,33 @@ def ocr_image_or_pdf(path: Path) -> tuple[str, list[str]]:
     suffix = path.suffix.lower()
     if suffix in {".jpg", ".jpeg", ".png"}:
         try:
-            return _ocr_image(Image.open(path)), ["ocr_applied:image"]
+            return [_ocr_image(Image.open(path))], ["ocr_applied:image"]
         except Exception as exc:
             notes.append(f"ocr_error:image:{type(exc).__name__}")
-            return "", notes
+            return [], notes
 
-    pages = _pdf_pages_to_images(path, notes)
-    if not pages:
-        return "", notes
-    text = "\n".join(_ocr_image(p) for p in pages)
-    if text.strip():
+    images = _pdf_pages_to_images(path, notes)
+    if not images:
+        return [], notes
+    pages = [_ocr_image(img) for img in images]
+    if "\n".join(pages).strip():
         notes.append("ocr_applied:pdf")
-    return text, notes
+    return pages, notes
 
 
-def get_document_text(path: Path, enable_ocr: bool) -> tuple[str, list[str]]:
+def ocr_image_or_pdf(path: Path) -> tuple[str, list[str]]:
+    pages, notes = ocr_pages(path)
+    return "\n".join(pages), notes
+
+
+def get_document(path: Path, enable_ocr: bool) -> tuple[Document, list[str]]:
+    """Extracted text of path as a Document, with per-page offsets, and extraction notes."""
     notes: list[str] = []
+    pages: list[str] = []
     text = ""
     if path.suffix.lower() == ".pdf":
-        text, pdf_notes = extract_pdf_text(path)
+        pages, pdf_notes = extract_pdf_pages(path)
+        text = "\n".join(pages).strip()
         notes.extend(pdf_notes)
     ocr_used = False
     # Always attempt OCR when embedded text is completely empty (image-only PDF),
@@ -151,14 +169,52 @@ def get_document_text(path: Path, enable_ocr: bool) -> tuple[str, list[str]]:
     # pdfplumber/pypdf is the primary method; OCR is the automatic fallback.
     auto_ocr = len(text) == 0
     if (enable_ocr and len(text) < MIN_TEXT_LENGTH_FOR_OCR_SKIP) or auto_ocr:
-        ocr_text, ocr_notes = ocr_image_or_pdf(path)
+        scanned, ocr_notes = ocr_pages(path)
+        ocr_text = "\n".join(scanned)
         notes.extend(ocr_notes)
         if ocr_text:
             text = f"{text}\n{ocr_text}".strip()
+            pages = [*pages, *scanned]
             ocr_used = True
     if text:
         method = "ocr_supplement" if ocr_used else "embedded_only"
         notes.append(f"final_text_length:{len(text)}:method={method}")
     else:
         notes.append("final_text_empty:no_usable_text_extracted")
-    return text, notes
+    return Document(text, pages), notes
+
+
+def get_document_text(path: Path, enable_ocr: bool) -> tuple[str, list[str]]:
+    doc, notes = get_document(path, enable_ocr)
+    return doc.text, notes
+
+
+def _extract(path: Path) -> tuple[Document, list[str]]:
+    return get_document(path, enable_ocr=False)
+
+
+def _extract_with_ocr(path: Path) -> tuple[Document, list[str]]:
+    return get_document(path, enable_ocr=True)
+
+
+_EXTRACTORS = {False: _extract, True: _extract_with_ocr}
+
+
+def get_document_cached(path: Path, enable_ocr: bool) -> tuple[Document, list[str]]:
+    """get_document() through the shared document cache; the notes list is the caller's own."""
+    cached = _document_cache.get(path, _EXTRACTORS[enable_ocr])
+    if cached is None:
+        return get_document(path, enable_ocr)
+    doc, notes = cached
+    return doc, list(notes)
+
+
+def cached_document(path: Path, enable_ocr: bool) -> Optional[tuple[Document, list[str]]]:
+    """The cached get_document() result for path, or None; never extracts."""
+    cached = _document_cache.peek(path, _EXTRACTORS[enable_ocr])
+    return None if cached is None else (cached[0], list(cached[1]))
+
+
+def cache_document(path: Path, enable_ocr: bool, doc: Document, notes: list[str]) -> None:
+    """Record a get_document() result computed elsewhere, e.g. in a worker process."""
+    _document_cache.put(path, _EXTRACTORS[enable_ocr], (doc, list(notes)))
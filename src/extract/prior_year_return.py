@@ -11,7 +11,8 @@ import logging
 import re
 from typing import Optional
 
-from src.extract.text_utils import normalize_extracted_text, parse_amount_token
+from src.extract.document import Document, as_document
+from src.extract.text_utils import parse_amount_token
 from src.models import PriorYearReturnData
 
 _log = logging.getLogger(__name__)
@@ -1149,20 +1150,20 @@ def _score_confidence(data: PriorYearReturnData) -> float:
 
 
 def parse_prior_year_return_text(
-    text: str,
+    text: str | Document,
     fallback_year: Optional[int] = None,
 ) -> PriorYearReturnData:
     """Parse extracted text from a prior-year Form 1040 PDF.
 
     Args:
-        text: Raw text extracted from the PDF (all pages concatenated).
+        text: Raw text extracted from the PDF (all pages concatenated), or its Document.
         fallback_year: Use this year if the year cannot be detected from the text.
 
     Returns:
         A populated PriorYearReturnData instance.
     """
     data = PriorYearReturnData()
-    text = normalize_extracted_text(text)
+    text = as_document(text).normalized
 
     # --- Year ---
     data.year = _extract_year(text)
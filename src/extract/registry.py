@@ -0,0 +1,223 @@
+"""
+Extraction handlers per document type.
+
+process_client() looks every classified document up here instead of
+branching on doc_type. A handler names the local parser, the ExtractionResult
+list its result goes to, how to read the issuer off it, and optionally the
+Azure Document Intelligence parser to escalate to when the local confidence
+falls below its threshold. A new form (K-1, Schedule E, ...) plugs in with
+register_doc_type() and needs no change to src/main.py.
+
+Handlers are registered at import time, so processes started by the
+process_client() worker pool see the same registry as the parent. The
+registry itself imports no parser: each parser module, and each Azure module
+with the Azure SDK it loads, is imported the first time a document of its
+type needs it (LazyFunction), so startup pays only for what a run uses.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.extract.document import Document
+
+
+@dataclass
+class ParseInput:
+    """What a handler's parse and finish callables get for one file."""
+
+    path: Path
+    sha256: str
+    doc: Document
+    tax_year: int
+
+
+@dataclass
+class Parsed:
+    """A handler's result for one file.
+
+    data goes to the handler's ExtractionResult list; related holds items for
+    other lists (e.g. brokerage_1099_trades) and key_fields extra Document_Index
+    fields. year, when set, replaces the classifier's detected year. A
+    structured result was read from CSV/XML and is never sent to Azure or
+    finished.
+    """
+
+    data: Any
+    year: Optional[int] = None
+    structured: bool = False
+    related: Dict[str, List[Any]] = field(default_factory=dict)
+    key_fields: Dict[str, Any] = field(default_factory=dict)
+
+
+class LazyFunction:
+    """Stand-in for "package.module:function" that imports the module on first call.
+
+    __module__ names the target module, as it would for the function itself.
+    """
+
+    def __init__(self, target: str) -> None:
+        self.__module__, _, self._name = target.partition(":")
+        self._func: Optional[Callable[..., Any]] = None
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self._func is None:
+            self._func = getattr(import_module(self.__module__), self._name)
+        return self._func(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyFunction({self.__module__}:{self._name})"
+
+
+@dataclass(frozen=True)
+class DocTypeHandler:
+    slot: str
+    parse: Callable[[ParseInput], Parsed]
+    issuer: Callable[[Any], Optional[str]]
+    azure_parse: Optional[Callable[[Path, str, str], Any]] = None
+    # None: the AZURE_CONFIDENCE_THRESHOLD of azure_parse's module
+    azure_threshold: Optional[float] = None
+    # Runs after any Azure escalation, on the data that was kept
+    finish: Optional[Callable[[ParseInput, Parsed], None]] = None
+
+    def escalation_threshold(self) -> float:
+        """Local confidence below which azure_parse is tried; imports its module."""
+        if self.azure_threshold is not None:
+            return self.azure_threshold
+        return import_module(self.azure_parse.__module__).AZURE_CONFIDENCE_THRESHOLD
+
+
+_HANDLERS: Dict[str, DocTypeHandler] = {}
+
+
+def register_doc_type(doc_type: str, handler: DocTypeHandler) -> DocTypeHandler:
+    """Route documents classified as doc_type to handler, replacing any earlier one."""
+    _HANDLERS[doc_type] = handler
+    return handler
+
+
+def get_handler(doc_type: str) -> Optional[DocTypeHandler]:
+    return _HANDLERS.get(doc_type)
+
+
+def _from_text(target: str) -> Callable[[ParseInput], Parsed]:
+    parse = LazyFunction(target)
+    return lambda inp: Parsed(parse(inp.doc))
+
+
+def _payer_name(data: Any) -> Optional[str]:
+    return data.payer_name
+
+
+def _parse_w2(inp: ParseInput) -> Parsed:
+    from src.extract.w2 import parse_w2_text
+
+    return Parsed(parse_w2_text(inp.doc, fallback_year=inp.tax_year))
+
+
+def _parse_brokerage_1099(inp: ParseInput) -> Parsed:
+    suffix = inp.path.suffix.lower()
+    if suffix not in (".csv", ".xml"):
+        from src.extract.brokerage_1099 import parse_brokerage_1099_text
+
+        return Parsed(parse_brokerage_1099_text(inp.doc))
+    if suffix == ".csv":
+        from src.extract.brokerage_1099_csv import parse_brokerage_1099_csv as parse
+    else:
+        from src.extract.brokerage_1099_xml import parse_brokerage_1099_xml as parse
+    data, trades = parse(
+        inp.path.read_text(encoding="utf-8", errors="replace"),
+        source_file=inp.path.name,
+        source_sha256=inp.sha256,
+    )
+    return Parsed(
+        data,
+        year=data.year,
+        structured=True,
+        related={"brokerage_1099_trades": trades},
+        key_fields={"trade_count": len(trades)},
+    )
+
+
+def _brokerage_1099_trades(inp: ParseInput, parsed: Parsed) -> None:
+    from src.extract.form_1099b_trades import parse_1099b_trades_text
+
+    # Uses the broker name Azure settled on, if it was escalated.
+    trades, diag = parse_1099b_trades_text(inp.doc, parsed.data.broker_name, inp.path.name, inp.sha256)
+    parsed.related["brokerage_1099_trades"] = trades
+    parsed.key_fields["trade_count"] = len(trades)
+    parsed.key_fields["trade_candidates"] = diag.row_candidates
+
+
+register_doc_type("w2", DocTypeHandler(
+    slot="w2",
+    parse=_parse_w2,
+    issuer=lambda d: d.employer_name,
+    azure_parse=LazyFunction("src.extract.azure_w2:parse_w2_azure"),
+))
+register_doc_type("brokerage_1099", DocTypeHandler(
+    slot="brokerage_1099",
+    parse=_parse_brokerage_1099,
+    issuer=lambda d: d.broker_name,
+    azure_parse=LazyFunction("src.extract.azure_1099:parse_brokerage_1099_azure"),
+    finish=_brokerage_1099_trades,
+))
+register_doc_type("form_1098", DocTypeHandler(
+    slot="form_1098",
+    parse=_from_text("src.extract.form_1098:parse_1098_text"),
+    issuer=lambda d: d.lender_name,
+    azure_parse=LazyFunction("src.extract.azure_1098:parse_1098_azure"),
+))
+register_doc_type("form_1099_nec", DocTypeHandler(
+    slot="form_1099_nec",
+    parse=_from_text("src.extract.form_1099_nec:parse_1099_nec_text"),
+    issuer=_payer_name,
+))
+register_doc_type("form_1099_r", DocTypeHandler(
+    slot="form_1099_r",
+    parse=_from_text("src.extract.form_1099_r:parse_1099_r_text"),
+    issuer=_payer_name,
+))
+register_doc_type("form_1099_g", DocTypeHandler(
+    slot="form_1099_g",
+    parse=_from_text("src.extract.form_1099_g:parse_1099_g_text"),
+    issuer=_payer_name,
+    azure_parse=LazyFunction("src.extract.azure_1099_g:parse_1099_g_azure"),
+))
+register_doc_type("form_1099_misc", DocTypeHandler(
+    slot="form_1099_misc",
+    parse=_from_text("src.extract.form_1099_misc:parse_1099_misc_text"),
+    issuer=_payer_name,
+    azure_parse=LazyFunction("src.extract.azure_1099_misc:parse_1099_misc_azure"),
+))
+register_doc_type("form_1098_t", DocTypeHandler(
+    slot="form_1098_t",
+    parse=_from_text("src.extract.form_1098_t:parse_1098_t_text"),
+    issuer=lambda d: d.filer_name,
+    azure_parse=LazyFunction("src.extract.azure_1098_t:parse_1098_t_azure"),
+))
+register_doc_type("form_1099_q", DocTypeHandler(
+    slot="form_1099_q",
+    parse=_from_text("src.extract.form_1099_q:parse_1099_q_text"),
+    issuer=_payer_name,
+    azure_parse=LazyFunction("src.extract.azure_1099_q:parse_1099_q_azure"),
+))
+register_doc_type("form_1099_sa", DocTypeHandler(
+    slot="form_1099_sa",
+    parse=_from_text("src.extract.form_1099_sa:parse_1099_sa_text"),
+    issuer=_payer_name,
+    azure_parse=LazyFunction("src.extract.azure_1099_sa:parse_1099_sa_azure"),
+))
+register_doc_type("ssa_1099", DocTypeHandler(
+    slot="ssa_1099",
+    parse=_from_text("src.extract.ssa_1099:parse_ssa_1099_text"),
+    issuer=lambda d: "Social Security Administration",
+))
+register_doc_type("schedule_c", DocTypeHandler(
+    slot="schedule_c",
+    parse=_from_text("src.extract.schedule_c:parse_schedule_c_text"),
+    issuer=lambda d: d.line_c_business_name or d.proprietor_name,
+    azure_parse=LazyFunction("src.extract.azure_schedule_c:parse_schedule_c_azure"),
+))
@@ -1,13 +1,80 @@
 from __future__ import annotations
 
 import re
+from collections import defaultdict
+from functools import lru_cache
 from typing import Optional
 
-from src.extract.text_utils import normalize_extracted_text, parse_amount_token
+from src.extract.document import Document, as_document
+from src.extract.text_utils import parse_amount_token
 from src.models import ScheduleCData
 
+_AMOUNT_AFTER = r"[^\n]{0,80}?(\(?-?\$?\s*[\d,]+\.\d{2}\)?)"
+_CHECK_MARKER_RE = re.compile(r"\[X\]|☒|✓")
+_YES_NO_RES = (
+    # Trailing-marker form: "Yes [X]" / "No [X]"
+    (re.compile(r"\bYes\b\s{0,3}(?:\[X\]|☒|✓)", re.IGNORECASE), True),
+    (re.compile(r"\bNo\b\s{0,3}(?:\[X\]|☒|✓)", re.IGNORECASE), False),
+    # Leading-marker form: "[X] Yes" / "[X] No"
+    (re.compile(r"(?:\[X\]|☒|✓)\s{0,3}\bYes\b", re.IGNORECASE), True),
+    (re.compile(r"(?:\[X\]|☒|✓)\s{0,3}\bNo\b", re.IGNORECASE), False),
+)
+
+# Line markers: a number or a lone letter followed by whitespace or a
+# subletter ("8 Advertising", "16a", "a Travel", "G Did you"). Every label
+# pattern that starts the same way is keyed by its marker; see _label_pattern().
+_MARKER_TOKEN_RE = re.compile(r"\d{1,2}(?=[\sabAB])|\b[A-Za-z](?=\s)")
+_LABEL_KEY_RE = re.compile(r"(?:\\b)?(\d{1,2})(?=\\s|[ab])|\\b([A-Za-z])(?=\\s)")
+
+
+@lru_cache(maxsize=512)
+def _label_pattern(pattern: str) -> tuple[re.Pattern, Optional[str]]:
+    """Compiled case-insensitive pattern and the line-marker key it starts with, if any."""
+    m = _LABEL_KEY_RE.match(pattern)
+    key = None if not m else (m.group(1) or m.group(2).lower())
+    return re.compile(pattern, re.IGNORECASE), key
+
+
+class _MarkerIndex:
+    """Offsets of every line marker in a Schedule C text, built in one pass.
+
+    Nearly every label the field extractors look for starts with a line
+    number ("8 Advertising", "16a", "32b [X] Some investment") or a lone
+    letter ("b Other", "G Did you"). Instead of searching the whole text for
+    each label, search() matches it only at the offsets of its marker, so a
+    label that is absent costs a dictionary lookup rather than a full scan.
+
+    Labels without a leading word boundary may match inside a longer number
+    ("1 Gross" in "21 Gross"), so each number is indexed under its last one
+    and two digits; search() returns exactly what re.search() would.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        offsets: defaultdict[str, list[int]] = defaultdict(list)
+        for m in _MARKER_TOKEN_RE.finditer(text):
+            token, start = m.group(), m.start()
+            if len(token) == 2:
+                # "21 Gross" also holds "1 Gross" (labels without a leading \b)
+                offsets[token].append(start)
+                offsets[token[1]].append(start + 1)
+            else:
+                offsets[token.lower()].append(start)
+        self._offsets = offsets
+
+    def search(self, pattern: str) -> Optional[re.Match]:
+        """First match of pattern (case-insensitive) in the text."""
+        compiled, key = _label_pattern(pattern)
+        if key is None:
+            return compiled.search(self.text)
+        for pos in self._offsets.get(key, ()):
+            m = compiled.match(self.text, pos)
+            if m:
+                return m
+        return None
+
 
-def _money_line(label_pattern: str, text: str) -> Optional[float]:
+def _money_line(label_pattern: str, index: _MarkerIndex) -> Optional[float]:
     """Extract a Schedule C line amount.
 
     Schedule C lines often render as "8 Advertising . . . . . 8 5,432.00"
@@ -15,17 +82,13 @@ def _money_line(label_pattern: str, text: str) -> Optional[float]:
     allow digits in the gap. Decimal-required matching prevents the repeated
     line number from being captured when a field is empty.
     """
-    m = re.search(
-        label_pattern + r"[^\n]{0,80}?(\(?-?\$?\s*[\d,]+\.\d{2}\)?)",
-        text,
-        re.IGNORECASE,
-    )
+    m = index.search(label_pattern + _AMOUNT_AFTER)
     if not m:
         return None
     return parse_amount_token(m.group(1))
 
 
-def _yes_no(label_pattern: str, text: str) -> Optional[bool]:
+def _yes_no(label_pattern: str, index: _MarkerIndex) -> Optional[bool]:
     """Extract a Yes/No checkbox answer following a label.
 
     Adjacency-based detection: a marker ([X], ☒, ✓) within ~3 chars of Yes/No
@@ -34,45 +97,38 @@ def _yes_no(label_pattern: str, text: str) -> Optional[bool]:
     by word" form, since the trailing-marker layout is most common in
     preparer-software output.
     """
-    m = re.search(label_pattern, text, re.IGNORECASE)
+    m = index.search(label_pattern)
     if not m:
         return None
+    text = index.text
     # Limit the window to the rest of the current line — extending across newlines
     # risks capturing a Yes/No answer from the next question.
     nl = text.find("\n", m.end())
     end = (nl if 0 <= nl - m.end() <= 250 else m.end() + 250)
     window = text[m.end() : end]
-    marker = r"(?:\[X\]|☒|✓)"
-    # Trailing-marker form: "Yes [X]" / "No [X]"
-    if re.search(rf"\bYes\b\s{{0,3}}{marker}", window, re.IGNORECASE):
-        return True
-    if re.search(rf"\bNo\b\s{{0,3}}{marker}", window, re.IGNORECASE):
-        return False
-    # Leading-marker form: "[X] Yes" / "[X] No"
-    if re.search(rf"{marker}\s{{0,3}}\bYes\b", window, re.IGNORECASE):
-        return True
-    if re.search(rf"{marker}\s{{0,3}}\bNo\b", window, re.IGNORECASE):
-        return False
+    for answer_re, answer in _YES_NO_RES:
+        if answer_re.search(window):
+            return answer
     return None
 
 
-def _checkbox_after(label_pattern: str, text: str, window_chars: int = 80) -> bool:
+def _checkbox_after(label_pattern: str, index: _MarkerIndex, window_chars: int = 80) -> bool:
     """Return True if a checked marker appears within window_chars surrounding the label.
 
     Some preparer software places the marker before the label
     (e.g. "32b [X] Some investment is not at risk"), others after, so check both sides.
     """
-    m = re.search(label_pattern, text, re.IGNORECASE)
+    m = index.search(label_pattern)
     if not m:
         return False
+    text = index.text
     pre_window = text[max(0, m.start() - 30) : m.start()]
     post_window = text[m.end() : m.end() + window_chars]
-    marker = r"\[X\]|☒|✓"
-    return bool(re.search(marker, pre_window) or re.search(marker, post_window))
+    return bool(_CHECK_MARKER_RE.search(pre_window) or _CHECK_MARKER_RE.search(post_window))
 
 
-def _accounting_method(text: str) -> Optional[str]:
-    m = re.search(r"\bF\s+Accounting\s+method[^\n]{0,300}", text, re.IGNORECASE)
+def _accounting_method(index: _MarkerIndex) -> Optional[str]:
+    m = index.search(r"\bF\s+Accounting\s+method[^\n]{0,300}")
     if not m:
         return None
     window = m.group(0)
@@ -85,8 +141,8 @@ def _accounting_method(text: str) -> Optional[str]:
     return None
 
 
-def _inventory_method(text: str) -> Optional[str]:
-    m = re.search(r"33\s+Method\(s\)\s+used[^\n]{0,300}", text, re.IGNORECASE)
+def _inventory_method(index: _MarkerIndex) -> Optional[str]:
+    m = index.search(r"33\s+Method\(s\)\s+used[^\n]{0,300}")
     if not m:
         return None
     window = m.group(0)
@@ -129,14 +185,17 @@ def _parse_other_expenses(text: str) -> list[dict]:
     return items
 
 
-def parse_schedule_c_text(text: str) -> ScheduleCData:
+def parse_schedule_c_text(text: str | Document) -> ScheduleCData:
     data = ScheduleCData()
-    text = normalize_extracted_text(text)
+    doc = as_document(text)
+    text = doc.normalized
+    index = _MarkerIndex(text)
 
-    year_match = re.search(r"Schedule\s+C[^\n]{0,80}?(20\d{2})", text, re.IGNORECASE) \
-        or re.search(r"\b(20\d{2})\b", text)
+    year_match = re.search(r"Schedule\s+C[^\n]{0,80}?(20\d{2})", text, re.IGNORECASE)
     if year_match:
         data.year = int(year_match.group(1))
+    elif doc.years:
+        data.year = doc.years[0]
 
     # Header — proprietor name (left-column label, value usually on next line or same line).
     # Two-column layout often puts the SSN on the same value line, so strip a trailing SSN.
@@ -224,97 +283,97 @@ def parse_schedule_c_text(text: str) -> ScheduleCData:
             data.line_e_city_state_zip = city_zip[:120]
 
     # Line F — Accounting method
-    data.line_f_accounting_method = _accounting_method(text)
+    data.line_f_accounting_method = _accounting_method(index)
 
     # Lines G, H, I, J — Y/N or checkbox answers
-    data.line_g_material_participation = _yes_no(r"\bG\s+Did\s+you\s+.materially", text)
+    data.line_g_material_participation = _yes_no(r"\bG\s+Did\s+you\s+.materially", index)
     data.line_h_started_or_acquired = _checkbox_after(
-        r"\bH\s+If\s+you\s+started\s+or\s+acquired", text, window_chars=200
+        r"\bH\s+If\s+you\s+started\s+or\s+acquired", index, window_chars=200
     )
     data.line_i_made_payments_requiring_1099 = _yes_no(
-        r"\bI\s+Did\s+you\s+make\s+any\s+payments", text
+        r"\bI\s+Did\s+you\s+make\s+any\s+payments", index
     )
     data.line_j_filed_required_1099 = _yes_no(
-        r"\bJ\s+If\s+.Yes,?.\s+did\s+you", text
+        r"\bJ\s+If\s+.Yes,?.\s+did\s+you", index
     )
 
     # ===== Part I — Income =====
-    data.line_1_gross_receipts = _money_line(r"1\s+Gross\s+receipts\s+or\s+sales", text)
+    data.line_1_gross_receipts = _money_line(r"1\s+Gross\s+receipts\s+or\s+sales", index)
     data.line_1_statutory_employee = bool(
         re.search(r"\.Statutory\s+employee.\s+box[^\n]{0,80}(?:\[X\]|☒|✓|\bX\b)",
                   text, re.IGNORECASE)
     )
-    data.line_2_returns_allowances = _money_line(r"2\s+Returns\s+and\s+allowances", text)
-    data.line_3_net_receipts = _money_line(r"3\s+Subtract\s+line\s+2\s+from\s+line\s+1", text)
-    data.line_4_cogs = _money_line(r"4\s+Cost\s+of\s+goods\s+sold\s+\(from\s+line\s+42\)", text)
-    data.line_5_gross_profit = _money_line(r"5\s+Gross\s+profit", text)
-    data.line_6_other_income = _money_line(r"6\s+Other\s+income", text)
-    data.line_7_gross_income = _money_line(r"7\s+Gross\s+income", text)
+    data.line_2_returns_allowances = _money_line(r"2\s+Returns\s+and\s+allowances", index)
+    data.line_3_net_receipts = _money_line(r"3\s+Subtract\s+line\s+2\s+from\s+line\s+1", index)
+    data.line_4_cogs = _money_line(r"4\s+Cost\s+of\s+goods\s+sold\s+\(from\s+line\s+42\)", index)
+    data.line_5_gross_profit = _money_line(r"5\s+Gross\s+profit", index)
+    data.line_6_other_income = _money_line(r"6\s+Other\s+income", index)
+    data.line_7_gross_income = _money_line(r"7\s+Gross\s+income", index)
 
     # ===== Part II — Expenses =====
-    data.line_8_advertising = _money_line(r"\b8\s+Advertising\b", text)
-    data.line_9_car_truck = _money_line(r"\b9\s+Car\s+and\s+truck\s+expenses", text)
-    data.line_10_commissions_fees = _money_line(r"\b10\s+Commissions\s+and\s+fees", text)
-    data.line_11_contract_labor = _money_line(r"\b11\s+Contract\s+labor", text)
-    data.line_12_depletion = _money_line(r"\b12\s+Depletion", text)
+    data.line_8_advertising = _money_line(r"\b8\s+Advertising\b", index)
+    data.line_9_car_truck = _money_line(r"\b9\s+Car\s+and\s+truck\s+expenses", index)
+    data.line_10_commissions_fees = _money_line(r"\b10\s+Commissions\s+and\s+fees", index)
+    data.line_11_contract_labor = _money_line(r"\b11\s+Contract\s+labor", index)
+    data.line_12_depletion = _money_line(r"\b12\s+Depletion", index)
     data.line_13_depreciation_section_179 = _money_line(
-        r"\b13\s+Depreciation\s+and\s+section\s+179", text
+        r"\b13\s+Depreciation\s+and\s+section\s+179", index
     )
     data.line_14_employee_benefit_programs = _money_line(
-        r"\b14\s+Employee\s+benefit\s+programs", text
+        r"\b14\s+Employee\s+benefit\s+programs", index
     )
-    data.line_15_insurance = _money_line(r"\b15\s+Insurance", text)
+    data.line_15_insurance = _money_line(r"\b15\s+Insurance", index)
     data.line_16a_mortgage_interest = _money_line(
-        r"\b16\s*a\s+Mortgage\s+\(paid\s+to\s+banks", text
-    ) or _money_line(r"\b16a\b", text)
+        r"\b16\s*a\s+Mortgage\s+\(paid\s+to\s+banks", index
+    ) or _money_line(r"\b16a\b", index)
     # Line 16b often renders as "b Other 16b VALUE" (subletter-only label,
     # with the line marker on the right); fall back to matching the marker directly.
-    data.line_16b_other_interest = _money_line(r"\b16\s*b\s+Other\b", text) \
-        or _money_line(r"\b16b\b", text)
+    data.line_16b_other_interest = _money_line(r"\b16\s*b\s+Other\b", index) \
+        or _money_line(r"\b16b\b", index)
     data.line_17_legal_professional = _money_line(
-        r"\b17\s+Legal\s+and\s+professional\s+services", text
+        r"\b17\s+Legal\s+and\s+professional\s+services", index
     )
-    data.line_18_office_expense = _money_line(r"\b18\s+Office\s+expense", text)
+    data.line_18_office_expense = _money_line(r"\b18\s+Office\s+expense", index)
     data.line_19_pension_profit_sharing = _money_line(
-        r"\b19\s+Pension\s+and\s+profit-sharing", text
+        r"\b19\s+Pension\s+and\s+profit-sharing", index
     )
     data.line_20a_rent_vehicles_machinery = _money_line(
-        r"\b20\s*a\s+Vehicles,\s+machinery", text
-    ) or _money_line(r"\ba\s+Vehicles,\s+machinery", text) \
-        or _money_line(r"\b20a\b", text)
+        r"\b20\s*a\s+Vehicles,\s+machinery", index
+    ) or _money_line(r"\ba\s+Vehicles,\s+machinery", index) \
+        or _money_line(r"\b20a\b", index)
     data.line_20b_rent_other_property = _money_line(
-        r"\b20\s*b\s+Other\s+business\s+property", text
-    ) or _money_line(r"\bb\s+Other\s+business\s+property", text) \
-        or _money_line(r"\b20b\b", text)
-    data.line_21_repairs_maintenance = _money_line(r"\b21\s+Repairs\s+and\s+maintenance", text)
-    data.line_22_supplies = _money_line(r"\b22\s+Supplies", text)
-    data.line_23_taxes_licenses = _money_line(r"\b23\s+Taxes\s+and\s+licenses", text)
+        r"\b20\s*b\s+Other\s+business\s+property", index
+    ) or _money_line(r"\bb\s+Other\s+business\s+property", index) \
+        or _money_line(r"\b20b\b", index)
+    data.line_21_repairs_maintenance = _money_line(r"\b21\s+Repairs\s+and\s+maintenance", index)
+    data.line_22_supplies = _money_line(r"\b22\s+Supplies", index)
+    data.line_23_taxes_licenses = _money_line(r"\b23\s+Taxes\s+and\s+licenses", index)
     # Lines 24a/b often render as bare subletter ("a Travel", "b Deductible meals")
     # because line 24's heading "Travel and meals:" sits above on its own row.
-    data.line_24a_travel = _money_line(r"\b24\s*a\s+Travel\b", text) \
-        or _money_line(r"\ba\s+Travel\b[^\n]*?24a", text) \
-        or _money_line(r"\b24a\b", text)
-    data.line_24b_meals = _money_line(r"\b24\s*b\s+Deductible\s+meals", text) \
-        or _money_line(r"\bb\s+Deductible\s+meals", text) \
-        or _money_line(r"\b24b\b", text)
-    data.line_25_utilities = _money_line(r"\b25\s+Utilities", text)
-    data.line_26_wages = _money_line(r"\b26\s+Wages", text)
+    data.line_24a_travel = _money_line(r"\b24\s*a\s+Travel\b", index) \
+        or _money_line(r"\ba\s+Travel\b[^\n]*?24a", index) \
+        or _money_line(r"\b24a\b", index)
+    data.line_24b_meals = _money_line(r"\b24\s*b\s+Deductible\s+meals", index) \
+        or _money_line(r"\bb\s+Deductible\s+meals", index) \
+        or _money_line(r"\b24b\b", index)
+    data.line_25_utilities = _money_line(r"\b25\s+Utilities", index)
+    data.line_26_wages = _money_line(r"\b26\s+Wages", index)
     data.line_27a_energy_efficient_bldg = _money_line(
-        r"\b27\s*a\s+Energy\s+efficient", text
-    ) or _money_line(r"\ba\s+Energy\s+efficient", text) \
-        or _money_line(r"\b27a\b", text)
+        r"\b27\s*a\s+Energy\s+efficient", index
+    ) or _money_line(r"\ba\s+Energy\s+efficient", index) \
+        or _money_line(r"\b27a\b", index)
     data.line_27b_other_expenses = _money_line(
-        r"\b27\s*b\s+Other\s+expenses\s+\(from\s+line\s+48\)", text
-    ) or _money_line(r"\bb\s+Other\s+expenses\s+\(from\s+line\s+48\)", text) \
-        or _money_line(r"\b27b\b", text)
+        r"\b27\s*b\s+Other\s+expenses\s+\(from\s+line\s+48\)", index
+    ) or _money_line(r"\bb\s+Other\s+expenses\s+\(from\s+line\s+48\)", index) \
+        or _money_line(r"\b27b\b", index)
     data.line_28_total_expenses = _money_line(
-        r"\b28\s+Total\s+expenses\s+before\s+expenses\s+for\s+business\s+use", text
+        r"\b28\s+Total\s+expenses\s+before\s+expenses\s+for\s+business\s+use", index
     )
     data.line_29_tentative_profit_loss = _money_line(
-        r"\b29\s+Tentative\s+profit\s+or\s+\(loss\)", text
+        r"\b29\s+Tentative\s+profit\s+or\s+\(loss\)", index
     )
     data.line_30_home_office = _money_line(
-        r"\b30\s+Expenses\s+for\s+business\s+use\s+of\s+your\s+home", text
+        r"\b30\s+Expenses\s+for\s+business\s+use\s+of\s+your\s+home", index
     )
     # Simplified-method square footages (unlabelled — captured if present right of "(a)" / "(b)")
     sqft_a = re.search(
@@ -331,46 +390,42 @@ def parse_schedule_c_text(text: str) -> ScheduleCData:
         data.line_30_simplified_method_business_sqft = float(sqft_b.group(1))
 
     data.line_31_net_profit_loss = _money_line(
-        r"\b31\s+Net\s+profit\s+or\s+\(loss\)", text
+        r"\b31\s+Net\s+profit\s+or\s+\(loss\)", index
     )
     data.line_32a_all_at_risk = _checkbox_after(
-        r"32a\s+All\s+investment\s+is\s+at\s+risk", text, window_chars=60
-    ) or _checkbox_after(r"All\s+investment\s+is\s+at\s+risk", text, window_chars=40)
+        r"32a\s+All\s+investment\s+is\s+at\s+risk", index, window_chars=60
+    ) or _checkbox_after(r"All\s+investment\s+is\s+at\s+risk", index, window_chars=40)
     data.line_32b_some_not_at_risk = _checkbox_after(
-        r"32b\s+Some\s+investment\s+is\s+not", text, window_chars=60
-    ) or _checkbox_after(r"Some\s+investment\s+is\s+not\s+at\s+risk", text, window_chars=40)
+        r"32b\s+Some\s+investment\s+is\s+not", index, window_chars=60
+    ) or _checkbox_after(r"Some\s+investment\s+is\s+not\s+at\s+risk", index, window_chars=40)
 
     # ===== Part III — Cost of Goods Sold =====
-    data.line_33_inventory_method = _inventory_method(text)
+    data.line_33_inventory_method = _inventory_method(index)
     data.line_34_inventory_method_change = _yes_no(
-        r"34\s+Was\s+there\s+any\s+change\s+in\s+determining", text
+        r"34\s+Was\s+there\s+any\s+change\s+in\s+determining", index
     )
-    data.line_35_inventory_beginning = _money_line(r"\b35\s+Inventory\s+at\s+beginning", text)
-    data.line_36_purchases = _money_line(r"\b36\s+Purchases", text)
-    data.line_37_cost_of_labor = _money_line(r"\b37\s+Cost\s+of\s+labor", text)
-    data.line_38_materials_supplies = _money_line(r"\b38\s+Materials\s+and\s+supplies", text)
-    data.line_39_other_costs = _money_line(r"\b39\s+Other\s+costs", text)
-    data.line_40_total_inputs = _money_line(r"\b40\s+Add\s+lines\s+35\s+through\s+39", text)
-    data.line_41_inventory_end = _money_line(r"\b41\s+Inventory\s+at\s+end", text)
-    data.line_42_cogs = _money_line(r"\b42\s+Cost\s+of\s+goods\s+sold", text)
+    data.line_35_inventory_beginning = _money_line(r"\b35\s+Inventory\s+at\s+beginning", index)
+    data.line_36_purchases = _money_line(r"\b36\s+Purchases", index)
+    data.line_37_cost_of_labor = _money_line(r"\b37\s+Cost\s+of\s+labor", index)
+    data.line_38_materials_supplies = _money_line(r"\b38\s+Materials\s+and\s+supplies", index)
+    data.line_39_other_costs = _money_line(r"\b39\s+Other\s+costs", index)
+    data.line_40_total_inputs = _money_line(r"\b40\s+Add\s+lines\s+35\s+through\s+39", index)
+    data.line_41_inventory_end = _money_line(r"\b41\s+Inventory\s+at\s+end", index)
+    data.line_42_cogs = _money_line(r"\b42\s+Cost\s+of\s+goods\s+sold", index)
 
     # ===== Part IV — Vehicle =====
-    date_match = re.search(
+    date_match = index.search(
         r"43\s+When\s+did\s+you\s+place\s+your\s+vehicle[^\n]{0,200}?"
-        r"(\d{1,2}\s*/\s*\d{1,2}\s*/\s*\d{2,4})",
-        text,
-        re.IGNORECASE,
+        r"(\d{1,2}\s*/\s*\d{1,2}\s*/\s*\d{2,4})"
     )
     if date_match:
         data.line_43_date_placed_in_service = re.sub(r"\s+", "", date_match.group(1))
 
     # Mileage row often spans two lines: "44 ... \n a Business N b Commuting N c Other N"
-    miles_match = re.search(
+    miles_match = index.search(
         r"44[\s\S]{0,200}?\ba\s+Business[^\d]{0,40}(\d[\d,]*)"
         r"[\s\S]{0,80}?\bb\s+Commuting[^\d]{0,40}(\d[\d,]*)"
-        r"[\s\S]{0,80}?\bc\s+Other[^\d]{0,40}(\d[\d,]*)",
-        text,
-        re.IGNORECASE,
+        r"[\s\S]{0,80}?\bc\s+Other[^\d]{0,40}(\d[\d,]*)"
     )
     if miles_match:
         data.line_44a_business_miles = parse_amount_token(miles_match.group(1))
@@ -378,22 +433,22 @@ def parse_schedule_c_text(text: str) -> ScheduleCData:
         data.line_44c_other_miles = parse_amount_token(miles_match.group(3))
 
     data.line_45_personal_use_offduty = _yes_no(
-        r"45\s+Was\s+your\s+vehicle\s+available\s+for\s+personal", text
+        r"45\s+Was\s+your\s+vehicle\s+available\s+for\s+personal", index
     )
     data.line_46_another_vehicle_personal = _yes_no(
-        r"46\s+Do\s+you\s+\(or\s+your\s+spouse\)\s+have\s+another", text
+        r"46\s+Do\s+you\s+\(or\s+your\s+spouse\)\s+have\s+another", index
     )
     data.line_47a_evidence_to_support = _yes_no(
-        r"47a\s+Do\s+you\s+have\s+evidence", text
+        r"47a\s+Do\s+you\s+have\s+evidence", index
     )
     data.line_47b_evidence_written = _yes_no(
-        r"\bb\s+If\s+.Yes,?.\s+is\s+the\s+evidence\s+written", text
+        r"\bb\s+If\s+.Yes,?.\s+is\s+the\s+evidence\s+written", index
     )
 
     # ===== Part V — Other Expenses =====
     data.other_expenses_items = _parse_other_expenses(text)
     data.line_48_total_other_expenses = _money_line(
-        r"\b48\s+Total\s+other\s+expenses", text
+        r"\b48\s+Total\s+other\s+expenses", index
     )
 
     # Confidence — weight the identity + bottom-line fields heavily
@@ -3,7 +3,8 @@ from __future__ import annotations
 import re
 from typing import Optional
 
-from src.extract.text_utils import extract_amount_after_label, normalize_extracted_text
+from src.extract.document import Document, as_document
+from src.extract.text_utils import extract_amount_after_label
 from src.models import FormSSA1099Data
 
 
@@ -22,14 +23,14 @@ def _parenthesized_amount(pattern: str, text: str) -> Optional[float]:
         return None
 
 
-def parse_ssa_1099_text(text: str) -> FormSSA1099Data:
+def parse_ssa_1099_text(text: str | Document) -> FormSSA1099Data:
     data = FormSSA1099Data()
-    text = normalize_extracted_text(text)
+    doc = as_document(text)
+    text = doc.normalized
 
     # Tax year
-    year_match = re.search(r"\b(20\d{2})\b", text)
-    if year_match:
-        data.year = int(year_match.group(1))
+    if doc.years:
+        data.year = doc.years[0]
 
     # Box 1 — Beneficiary name
     name_match = re.search(
@@ -7,20 +7,39 @@ from typing import Optional
 _log = logging.getLogger(__name__)
 
 
+_NORMALIZE_TRANSLATION = str.maketrans({"\u2013": "-", "\u2014": "-", "\u2212": "-", "\u00a0": " "})
+# Everything normalize_extracted_text() rewrites after translation, in one
+# alternation. Each branch checks its context with lookarounds and no rewrite
+# changes the context another one looks at, so a single pass matches applying
+# them in turn. The leading class lets the scan skip everything else quickly.
+_NORMALIZE_RE = re.compile(
+    r"[OolIiL \t\n]"
+    r"(?:(?<=\d[OolI])(?=\d)"  # OCR letter inside a number: "1O5", "2l4"
+    r"|(?<=\b(?i:box)\s(?i:[li]))\b"  # "Box l" -> "Box 1"
+    r"|(?<=[ \t])[ \t]+|(?<=\t)"  # runs of spaces/tabs other than a single space
+    r"|(?<=\n)\n\n+)"  # three or more newlines
+)
+
+
+def _normalize_repl(m: re.Match) -> str:
+    c = m.group()[0]
+    if c in " \t":
+        return " "
+    if c == "\n":
+        return "\n\n"
+    return "0" if c in "Oo" else "1"
+
+
 def normalize_extracted_text(text: str) -> str:
-    """Normalize noisy OCR/PDF text for downstream regex parsing."""
+    """Normalize noisy OCR/PDF text for downstream regex parsing.
+
+    Parsers get the result through Document.normalized, which computes it
+    once per document.
+    """
     if not text:
         return ""
-    normalized = text.replace("\u2013", "-").replace("\u2014", "-").replace("\u2212", "-")
-    normalized = normalized.replace("\u00a0", " ")
-    # Common OCR substitutions in numeric context.
-    normalized = re.sub(r"(?<=\d)[Oo](?=\d)", "0", normalized)
-    normalized = re.sub(r"(?<=\bBox\s)[lI](?=\b)", "1", normalized, flags=re.IGNORECASE)
-    normalized = re.sub(r"(?<=\d)[lI](?=\d)", "1", normalized)
-    # Squash repeated whitespace while keeping line boundaries useful.
-    normalized = re.sub(r"[ \t]+", " ", normalized)
-    normalized = re.sub(r"\n{3,}", "\n\n", normalized)
-    return normalized.strip()
+    normalized = text.translate(_NORMALIZE_TRANSLATION)
+    return _NORMALIZE_RE.sub(_normalize_repl, normalized).strip()
 
 
 _AMOUNT_RE = re.compile(r"\(?-?\$?\s*([\d,]+(?:\.\d{2})?)\)?")
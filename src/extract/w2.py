@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
-
-from src.extract.text_utils import extract_amount_after_label, normalize_extracted_text, parse_amount_token
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Callable, Iterator, Sequence
+
+from src.extract.document import AmountToken, Document, as_document, find_amount_tokens
+from src.extract.text_utils import extract_amount_after_label, parse_amount_token
 from src.models import W2Data
 
 _log = logging.getLogger(__name__)
@@ -33,111 +40,336 @@ _SS_TOL = 0.005
 _MEDI_RATE = 0.0145
 _MEDI_TOL = 0.003
 
+_AMOUNT_RE = re.compile(r"\d[\d,]*\.\d{2}")
+_SAME_LINE_GAP_RE = re.compile(r"[ \t]+")
+_BOX12_LINE_RE = re.compile(r"(?m)^[ \t]*([A-Z]{1,2})[ \t]+\d[\d,]*\.\d{2}")
+# "X" or "X X" (doubled copies) on a line by itself.
+_X_LINE_RE = re.compile(r"(?m)^[ \t]*X(?:[ \t]+X)*[ \t]*$")
+
+
+# --- Layout templates ---------------------------------------------------------
+#
+# A firm sees the same handful of payroll layouts (Dayforce, WEBB, IDMS, ADP)
+# over and over.  Each extraction stage below is a cascade of strategies tried
+# in order; a plan records which strategy produced each stage's value for one
+# layout, keyed by a fingerprint of the layout's label skeleton.  The next W-2
+# with the same fingerprint skips the box-12 passes and box-label searches its
+# layout never needed, falling back to the full cascade where the plan misses.
+# Single-value stages (year, names, addresses) always run in priority order so
+# the result never depends on which W-2 taught the plan.
+
+# Label vocabulary that survives from one employee's W-2 to the next within a
+# payroll layout.  Everything else (names, streets, employers) is a placeholder.
+_LAYOUT_WORDS = frozenset({
+    "form", "w-2", "w2", "wage", "wages", "tax", "statement", "copy", "box",
+    "employer", "employer's", "employee", "employee's", "name", "first",
+    "initial", "last", "suff", "address", "zip", "code", "codes", "control",
+    "number", "identification", "ein", "ssn", "social", "security", "medicare",
+    "federal", "income", "withheld", "tips", "other", "comp", "compensation",
+    "allocated", "dependent", "care", "benefits", "nonqualified", "plans",
+    "statutory", "retirement", "plan", "third-party", "sick", "pay", "see",
+    "inst", "instructions", "state", "local", "locality", "id", "department",
+    "treasury", "internal", "revenue", "service", "omb", "void", "gross",
+    "txbl", "soc", "sec", "earnings", "dayforce", "idms", "adp", "depress",
+    "f1", "fed", "filed", "return", "records", "12a", "12b", "12c", "12d",
+})
+_LETTER_RE = re.compile(r"[A-Za-z]")
+_LAYOUT_WORD_RE = re.compile(r"[a-z0-9'\-]+")
+_SKELETON_LINES = 12
+_MAX_TEMPLATES = 256
+_LEARN_CONFIDENCE = 0.8
+_NOTHING = "-"   # plan entry: the full cascade found nothing for this stage
 
-def _extract_box12(text: str) -> dict[str, float]:
-    """Extract all box 12 code/value pairs from W2 text.
+_templates: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_template_counts = {"hits": 0, "misses": 0, "fallbacks": 0, "learned": 0}
+_template_lock = threading.Lock()
 
-    Handles multiple PDF layouts via four passes (first match wins per code):
 
-    Pass A — Dayforce labeled style: "Code DD  6618.00" inline
-    Pass B — WEBB labeled style: "12a Code See inst.\\nD 4686.12" multi-line
-    Pass C — Legacy/test style: "Box 12 D 6000.00" or "12 D 6000.00"
-    Pass D — Real PDF bare style: "D 4686.12" at start of line (no prefix).
-              Uses _BOX12_CODES allowlist to avoid false positives.
-    """
-    result: dict[str, float] = {}
+def _layout_fingerprint(text: str) -> str | None:
+    """Hash of a normalized W-2's label skeleton, or None when there is too little text.
 
-    # Scope search to the box-12 block when markers exist.
-    scope_match = re.search(
-        r"(12[a-d]\b[\s\S]*?)(?=\b14\s+Other\b|\b15\s+State\b|\Z)",
-        text, re.IGNORECASE,
+    The skeleton is the shape of the first lines (how many amounts, whether
+    there is any text) plus every label word of the document in first-seen
+    order; names, streets and the amounts themselves do not enter it.
+    """
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    if len(lines) < 3:
+        return None
+    words = dict.fromkeys(
+        w for w in _LAYOUT_WORD_RE.findall(text.lower()) if w in _LAYOUT_WORDS
     )
-    scope = scope_match.group(1) if scope_match else text
-
+    skeleton = " ".join(
+        f"{len(_AMOUNT_RE.findall(l))}{'a' if _LETTER_RE.search(l) else ''}"
+        for l in lines[:_SKELETON_LINES]
+    )
+    skeleton += "\n|" + " ".join(words)
+    return hashlib.sha1(skeleton.encode("utf-8")).hexdigest()[:16]
+
+
+class _Run:
+    """Strategy choices for one parse: the plan being followed, if any, and what was used."""
+
+    def __init__(self, plan: dict[str, Any] | None = None) -> None:
+        self.plan = plan or {}
+        self.used: dict[str, Any] = {}
+        self.fallbacks = 0
+
+    def planned(self, stage: str) -> Any:
+        return self.plan.get(stage)
+
+    def first(self, stage: str, strategies: Sequence[tuple[str, Callable[[], Any]]]) -> Any:
+        """Value of the first strategy, in priority order, that yields one.
+
+        Strategies ranked above the planned one still run first, so a plan
+        never changes the result; it only flags a fallback when the planned
+        strategy comes up empty and a lower-ranked one is needed.
+        """
+        planned = self.plan.get(stage)
+        for name, strategy in strategies:
+            value = strategy()
+            if value is not None:
+                self.used[stage] = name
+                return value
+            if name == planned:
+                self.fallbacks += 1
+        self.used[stage] = _NOTHING
+        return None
+
+
+def _lookup_template(fingerprint: str | None) -> dict[str, Any] | None:
+    with _template_lock:
+        plan = _templates.get(fingerprint) if fingerprint else None
+        if plan is None:
+            _template_counts["misses"] += 1
+            return None
+        _templates.move_to_end(fingerprint)
+        _template_counts["hits"] += 1
+        return plan
+
+
+def _learn_template(fingerprint: str | None, run: _Run, confidence: float) -> None:
+    with _template_lock:
+        _template_counts["fallbacks"] += run.fallbacks
+        if not fingerprint or confidence < _LEARN_CONFIDENCE:
+            return
+        if run.plan and not run.fallbacks:
+            return
+        # New layout, or a known one whose plan needed the cascade: (re)learn it.
+        _templates[fingerprint] = dict(run.used)
+        _templates.move_to_end(fingerprint)
+        _template_counts["learned"] += 1
+        while len(_templates) > _MAX_TEMPLATES:
+            _templates.popitem(last=False)
+
+
+def w2_template_stats() -> dict[str, int]:
+    """Layout-template counters since start-up (or the last clear_w2_templates())."""
+    with _template_lock:
+        return {**_template_counts, "templates": len(_templates)}
+
+
+def clear_w2_templates() -> None:
+    with _template_lock:
+        _templates.clear()
+        for key in _template_counts:
+            _template_counts[key] = 0
+
+
+# Box-12 passes as (name, pattern, full_text, allowlist_only); every
+# pattern captures (code, amount) and the first match wins per code.
+_BOX12_PASSES: tuple[tuple[str, re.Pattern[str], bool, bool], ...] = (
     # Pass A — Dayforce inline style: "Code DD  6618.00"
     # Run on the full text (not just scope) because OCR of image W2s can place
     # box-12 code/value pairs on the same line as "15 State" headers, pushing
     # them outside the scope boundary.
-    for m in re.finditer(
+    ("A", re.compile(
         r"\bCode\s+([A-Z]{1,2})\s+(\(?-?\$?[\d,]+(?:\.\d{2})?\)?)",
-        text, re.IGNORECASE,
-    ):
-        code = m.group(1).upper()
-        val = parse_amount_token(m.group(2))
-        if val is not None and code not in result:
-            result[code] = val
-
+        re.IGNORECASE,
+    ), True, False),
     # Pass B — WEBB labeled style: "12x Code [optional text]\n DD  9664.46"
     # Optional single-char noise group handles PDF vertical-bar artifacts like
     # "W | 500.00" (column separator read as "|") from pdfplumber.
-    for m in re.finditer(
+    ("B", re.compile(
         r"12[a-d]\s+(?:Code|See\s+inst[^\n]*)[\s]*\n\s*([A-Z]{1,2})(?:[ \t]+[|/\\][ \t]+)?[ \t]+(\(?-?\$?[\d,]+(?:\.\d{2})?\)?)",
-        scope, re.IGNORECASE,
-    ):
-        code = m.group(1).upper()
-        val = parse_amount_token(m.group(2))
-        if val is not None and code not in result:
-            result[code] = val
-
+        re.IGNORECASE,
+    ), False, False),
     # Pass C — legacy/test style: "12 D 6000.00" or "Box 12 D 6000.00"
-    for m in re.finditer(
+    ("C", re.compile(
         r"(?:Box\s+)?12\s+([A-Z]{1,2})\s+(\(?-?\$?[\d,]+(?:\.\d{2})?\)?)",
-        scope, re.IGNORECASE,
-    ):
-        code = m.group(1).upper()
-        val = parse_amount_token(m.group(2))
-        if val is not None and code not in result:
-            result[code] = val
-
+        re.IGNORECASE,
+    ), False, False),
     # Pass D — real PDF bare style: "D 4686.12" or "DD 9664.46" at the start of
     # a line (no "Code" or "12x" prefix).  Only fires for known IRS box-12 codes.
     # Handles optional "$" prefix (e.g. IDMS payroll: "S $17,575.00").
-    for m in re.finditer(
+    ("D", re.compile(
         r"(?m)^[ \t]*([A-Z]{1,2})[ \t]+\$?(\d[\d,]*\.\d{2})",
-        scope,
-    ):
-        code = m.group(1).upper()
-        if code not in _BOX12_CODES:
-            continue
-        val = parse_amount_token(m.group(2))
-        if val is not None and code not in result:
-            result[code] = val
-
+    ), False, True),
     # Pass E — same-line generic: "12x [any label] CODE $amount" on one line.
     # Handles IDMS style ("12a - Depress F1 for codes S $17,575.00") and ADP
     # same-line variants.  Greedy [^\n]* means the LAST standalone code token
     # before an amount is captured (backtracking finds the rightmost match).
     # _BOX12_CODES allowlist prevents false positives from label words.
-    for m in re.finditer(
+    ("E", re.compile(
         r"(?m)^[ \t]*12[a-d]\b[^\n]* \b([A-Z]{1,2})\b[ \t]+\$?(\d[\d,]*\.\d{2})[ \t]*$",
-        scope,
-    ):
-        code = m.group(1).upper()
-        if code not in _BOX12_CODES:
-            continue
-        val = parse_amount_token(m.group(2))
-        if val is not None and code not in result:
-            result[code] = val
-
+    ), False, True),
     # Pass F — generic next-line: "12x [any label]\n CODE $amount".
     # Handles payroll systems whose box-12 label doesn't use "Code" or "See inst"
     # (e.g. IDMS "12a - Depress F1 for codes\nS $17,575.00").
     # _BOX12_CODES allowlist prevents false positives.
-    for m in re.finditer(
+    ("F", re.compile(
         r"12[a-d]\b[^\n]*\n\s*([A-Z]{1,2})[ \t]+\$?(\d[\d,]*\.\d{2})",
-        scope, re.IGNORECASE,
-    ):
-        code = m.group(1).upper()
-        if code not in _BOX12_CODES:
+        re.IGNORECASE,
+    ), False, True),
+)
+
+
+def _run_box12_passes(
+    text: str, scope: str, names: Sequence[str] | None = None,
+) -> tuple[dict[str, float], tuple[str, ...]]:
+    """(code -> amount, names of the passes that contributed) for the given passes."""
+    result: dict[str, float] = {}
+    contributed: list[str] = []
+    for name, pattern, full_text, allowlist_only in _BOX12_PASSES:
+        if names is not None and name not in names:
             continue
-        val = parse_amount_token(m.group(2))
-        if val is not None and code not in result:
-            result[code] = val
+        before = len(result)
+        for m in pattern.finditer(text if full_text else scope):
+            code = m.group(1).upper()
+            if allowlist_only and code not in _BOX12_CODES:
+                continue
+            val = parse_amount_token(m.group(2))
+            if val is not None and code not in result:
+                result[code] = val
+        if len(result) > before:
+            contributed.append(name)
+    return result, tuple(contributed)
+
+
+def _box12_probe_codes(text: str, scope: str, skip: Sequence[str] = ()) -> set[str]:
+    """Codes the cheap "Code X" (A) and bare-line (D) passes see, minus passes in skip."""
+    codes: set[str] = set()
+    for name, pattern, full_text, _ in _BOX12_PASSES:
+        if name in ("A", "D") and name not in skip:
+            codes.update(code.upper() for code, _ in pattern.findall(text if full_text else scope))
+    return codes & _BOX12_CODES
+
+
+def _extract_box12(text: str, run: _Run | None = None) -> dict[str, float]:
+    """Extract all box 12 code/value pairs from W2 text.
+
+    Handles multiple PDF layouts via six passes (first match wins per code):
+
+    Pass A — Dayforce labeled style: "Code DD  6618.00" inline
+    Pass B — WEBB labeled style: "12a Code See inst.\\nD 4686.12" multi-line
+    Pass C — Legacy/test style: "Box 12 D 6000.00" or "12 D 6000.00"
+    Pass D — Real PDF bare style: "D 4686.12" at start of line (no prefix).
+              Uses _BOX12_CODES allowlist to avoid false positives.
+    Pass E — Same-line generic: "12a <any label> S $17,575.00"
+    Pass F — Next-line generic: "12a <any label>\\nS $17,575.00"
+
+    With a layout plan only the passes that contributed for that layout run,
+    in the same order; all six run if those miss a code the probes can see.
+    """
+    run = run or _Run()
 
+    # Scope search to the box-12 block when markers exist.
+    scope_match = re.search(
+        r"(12[a-d]\b[\s\S]*?)(?=\b14\s+Other\b|\b15\s+State\b|\Z)",
+        text, re.IGNORECASE,
+    )
+    scope = scope_match.group(1) if scope_match else text
+
+    planned = run.planned("box12")
+    if planned:
+        result, contributed = _run_box12_passes(text, scope, planned)
+        # Every code the cheap "Code X" / bare-line probes can see must be
+        # covered, otherwise this document strays from its layout's plan.
+        if result and _box12_probe_codes(text, scope, skip=planned) <= result.keys():
+            run.used["box12"] = contributed
+            return result
+        run.fallbacks += 1
+    result, contributed = _run_box12_passes(text, scope)
+    run.used["box12"] = contributed
     return result
 
 
-def _detect_box13(text: str) -> bool:
+class _W2Index:
+    """Amount and line-offset index of one normalized W-2 text, built on first use.
+
+    Positional heuristics query it instead of re-scanning the text, so a
+    multi-copy PDF (2–4 copies per page) costs one pass per index, and
+    proximity checks are bisects over sorted line offsets.
+    """
+
+    def __init__(self, text: str, amounts: list[AmountToken] | None = None) -> None:
+        self.text = text
+        if amounts is not None:
+            self.amounts = amounts      # already tokenized by the Document
+
+    @cached_property
+    def amounts(self) -> list[AmountToken]:
+        """Every "1,234.56"-style amount in text order."""
+        return find_amount_tokens(self.text)
+
+    def adjacent(self, i: int) -> bool:
+        """Whether amounts i and i+1 are separated only by spaces/tabs on one line."""
+        a, b = self.amounts[i], self.amounts[i + 1]
+        return _SAME_LINE_GAP_RE.fullmatch(self.text, a.end, b.start) is not None
+
+    @cached_property
+    def pairs(self) -> list[tuple[float, float]]:
+        """Unique "{amount} {amount}" same-line pairs, scanning left to right without overlap."""
+        pairs: dict[tuple[float, float], None] = {}
+        amounts, i = self.amounts, 0
+        while i < len(amounts) - 1:
+            if self.adjacent(i):
+                pairs.setdefault((amounts[i].value, amounts[i + 1].value))
+                i += 2
+            else:
+                i += 1
+        return list(pairs)
+
+    def values_after(self, token: str) -> Iterator[float]:
+        """Values paired on the right of each (non-overlapping) occurrence of an amount token."""
+        amounts, i = self.amounts, 0
+        while i < len(amounts) - 1:
+            if amounts[i].token.endswith(token) and self.adjacent(i):
+                yield amounts[i + 1].value
+                i += 2
+            else:
+                i += 1
+
+    def line_offsets(self, pattern: re.Pattern[str], accept: Callable[[re.Match[str]], bool] | None = None) -> list[int]:
+        """Sorted start offsets of the lines a "(?m)^..." pattern matches."""
+        return [m.start() for m in pattern.finditer(self.text) if accept is None or accept(m)]
+
+
+def _any_within(offsets: list[int], targets: list[int], distance: int) -> bool:
+    """Whether any offset lies strictly within distance of a target; targets are sorted."""
+    for offset in offsets:
+        i = bisect_left(targets, offset)
+        if i < len(targets) and targets[i] - offset < distance:
+            return True
+        if i and offset - targets[i - 1] < distance:
+            return True
+    return False
+
+
+def _box13_labeled(text: str) -> bool | None:
+    if re.search(r"Retirement[\s\S]{0,30}plan[\s\S]{0,60}?\bX\b", text, re.IGNORECASE):
+        return True
+    return None
+
+
+def _box13_near_box12(index: _W2Index) -> bool | None:
+    box12_lines = index.line_offsets(_BOX12_LINE_RE, lambda m: m.group(1) in _BOX12_CODES)
+    if not box12_lines:
+        return None
+    x_lines = index.line_offsets(_X_LINE_RE)
+    return True if _any_within(x_lines, box12_lines, 300) else None
+
+
+def _detect_box13(text: str, run: _Run | None = None, index: _W2Index | None = None) -> bool:
     """Detect whether the box-13 retirement plan checkbox is checked.
 
     Two strategies:
@@ -146,32 +378,13 @@ def _detect_box13(text: str) -> bool:
        pdfplumber extracts only the X mark — no checkbox label — so proximity
        to box-12 code/value pairs is used as the locating heuristic.
     """
-    # Labeled format
-    if re.search(r"Retirement[\s\S]{0,30}plan[\s\S]{0,60}?\bX\b", text, re.IGNORECASE):
-        return True
+    return bool((run or _Run()).first("box13", (
+        ("labeled", lambda: _box13_labeled(text)),
+        ("proximity", lambda: _box13_near_box12(index or _W2Index(text))),
+    )))
 
-    # Real PDF format: standalone X near box-12 entries.
-    box12_positions = [
-        m.start()
-        for m in re.finditer(r"(?m)^[ \t]*[A-Z]{1,2}[ \t]+\d[\d,]*\.\d{2}", text)
-        if m.group(0).strip().split()[0].upper() in _BOX12_CODES
-    ]
-    if not box12_positions:
-        return False
 
-    # Allow "X" or "X X" (doubled copies) on a line by themselves.
-    x_positions = [
-        m.start()
-        for m in re.finditer(r"(?m)^[ \t]*X(?:[ \t]+X)*[ \t]*$", text)
-    ]
-    for xp in x_positions:
-        for bp in box12_positions:
-            if abs(xp - bp) < 300:
-                return True
-    return False
-
-
-def _fill_boxes_positional(data: W2Data, text: str) -> None:
+def _fill_boxes_positional(data: W2Data, index: _W2Index) -> None:
     """Positional fallback extraction for boxes 1–6.
 
     Real W2 PDFs (Dayforce, WEBB) omit box labels from the pdfplumber text
@@ -194,7 +407,7 @@ def _fill_boxes_positional(data: W2Data, text: str) -> None:
     # --- Dayforce summary line: "W-2 Wages {B1} {B3} {B5}" ---
     ww = re.search(
         r"W-2\s+Wages[ \t]+(\d[\d,]*\.\d{2})[ \t]+(\d[\d,]*\.\d{2})[ \t]+(\d[\d,]*\.\d{2})",
-        text,
+        index.text,
     )
     if ww:
         # Always trust the Dayforce summary line — it overrides any label-based
@@ -208,17 +421,8 @@ def _fill_boxes_positional(data: W2Data, text: str) -> None:
         data.box4_ss_tax = None
         data.box6_medicare_tax = None
 
-    # --- Collect all unique {amount} {amount} pairs (same line only) ---
-    all_pairs: list[tuple[float, float]] = []
-    seen_pairs: set[tuple[float, float]] = set()
-    for m in re.finditer(r"(\d[\d,]*\.\d{2})[ \t]+(\d[\d,]*\.\d{2})", text):
-        v1 = parse_amount_token(m.group(1))
-        v2 = parse_amount_token(m.group(2))
-        if v1 is not None and v2 is not None:
-            pair = (v1, v2)
-            if pair not in seen_pairs:
-                seen_pairs.add(pair)
-                all_pairs.append(pair)
+    # --- All unique {amount} {amount} pairs (same line only) ---
+    all_pairs = index.pairs
 
     # --- Identify B3/B4 via SS tax rate (~6.2 %) ---
     b3_pair: tuple[float, float] | None = None
@@ -267,12 +471,8 @@ def _fill_boxes_positional(data: W2Data, text: str) -> None:
     elif data.box1_wages is not None and data.box2_fed_withholding is None:
         # B1 already known (e.g. from Dayforce summary); find B2 as the amount
         # paired with B1 on the same line, skipping SS/Medicare wage values.
-        b1_str = f"{data.box1_wages:.2f}"
         skip_vals = {data.box3_ss_wages, data.box5_medicare_wages} - {None}
-        for m in re.finditer(
-            rf"{re.escape(b1_str)}[ \t]+(\d[\d,]*\.\d{{2}})", text
-        ):
-            candidate = parse_amount_token(m.group(1))
+        for candidate in index.values_after(f"{data.box1_wages:.2f}"):
             if candidate not in skip_vals:
                 data.box2_fed_withholding = candidate
                 break
@@ -339,15 +539,24 @@ def _street_before(lines: list[str], csz_idx: int) -> str | None:
     return None
 
 
-def _extract_employer_address(
-    text: str,
-) -> tuple[str | None, str | None, str | None, str | None]:
+_Address = tuple[str | None, str | None, str | None, str | None]
+
+
+def _extract_employer_address(text: str, run: _Run | None = None) -> _Address:
     """Extract employer (street, city, state, zip) from W2 text.
 
     Pass A — Labeled multi-line block: box 'c' header then name / street / CSZ.
     Pass B — Inline labeled field: 'Employer's address: ...'
     Pass C — Positional: search the ~300 chars surrounding the EIN.
     """
+    return (run or _Run()).first("employer_address", (
+        ("block", lambda: _employer_address_block(text)),
+        ("label", lambda: _address_after_label("Employer", text)),
+        ("ein", lambda: _employer_address_near_ein(text)),
+    )) or (None, None, None, None)
+
+
+def _employer_address_block(text: str) -> _Address | None:
     # Pass A — "c Employer's name, address..." block (labeled/synthetic PDFs).
     # Captures up to 6 lines so multi-line employer names (e.g. IDMS) don't push
     # the street/CSZ outside the search window.
@@ -360,22 +569,28 @@ def _extract_employer_address(
         idx, city, state, zip_ = _find_csz(candidates)
         if state:
             return _street_before(candidates, idx), city, state, zip_
+    return None
+
 
-    # Pass B — Explicit address label
+def _address_after_label(party: str, text: str) -> _Address | None:
+    """Explicit 'Employer's address: ...' / 'Employee's address: ...' label."""
     addr_m = re.search(
-        r"Employer(?:'s)?\s+(?:address|street)[^\n:]*:\s*(.+)",
+        party + r"(?:'s)?\s+(?:address|street)[^\n:]*:\s*(.+)",
         text, re.IGNORECASE,
     )
-    if addr_m:
-        street = addr_m.group(1).strip() or None
-        rest_lines = [
-            l.strip()
-            for l in text[addr_m.end(): addr_m.end() + 200].split("\n")
-            if l.strip()
-        ]
-        city, state, zip_ = _parse_csz(rest_lines[0]) if rest_lines else (None, None, None)
-        return street, city, state, zip_
+    if not addr_m:
+        return None
+    street = addr_m.group(1).strip() or None
+    rest_lines = [
+        l.strip()
+        for l in text[addr_m.end(): addr_m.end() + 200].split("\n")
+        if l.strip()
+    ]
+    city, state, zip_ = _parse_csz(rest_lines[0]) if rest_lines else (None, None, None)
+    return street, city, state, zip_
+
 
+def _employer_address_near_ein(text: str) -> _Address | None:
     # Pass C — Positional: use EIN as anchor for the employer block
     ein_m = re.search(r"\b\d{2}-\d{7}\b", text)
     if ein_m:
@@ -388,35 +603,28 @@ def _extract_employer_address(
         idx, city, state, zip_ = _find_csz(scope_lines)
         if state:
             return _street_before(scope_lines, idx), city, state, zip_
-
-    return None, None, None, None
+    return None
 
 
 def _extract_employee_address(
     text: str,
     employee_name: str | None,
-) -> tuple[str | None, str | None, str | None, str | None]:
+    run: _Run | None = None,
+) -> _Address:
     """Extract employee (street, city, state, zip) from W2 text.
 
     Pass A — Labeled field: 'Employee's address: ...'
     Pass B — Positional: lines immediately after the employee name.
     Pass C — Pattern: name \\n street \\n CSZ across the whole text.
     """
-    # Pass A — Explicit label
-    addr_m = re.search(
-        r"Employee(?:'s)?\s+(?:address|street)[^\n:]*:\s*(.+)",
-        text, re.IGNORECASE,
-    )
-    if addr_m:
-        street = addr_m.group(1).strip() or None
-        rest_lines = [
-            l.strip()
-            for l in text[addr_m.end(): addr_m.end() + 200].split("\n")
-            if l.strip()
-        ]
-        city, state, zip_ = _parse_csz(rest_lines[0]) if rest_lines else (None, None, None)
-        return street, city, state, zip_
+    return (run or _Run()).first("employee_address", (
+        ("label", lambda: _address_after_label("Employee", text)),
+        ("after_name", lambda: _employee_address_after_name(text, employee_name)),
+        ("pattern", lambda: _employee_address_pattern(text)),
+    )) or (None, None, None, None)
 
+
+def _employee_address_after_name(text: str, employee_name: str | None) -> _Address | None:
     # Pass B — Positional: search after employee name
     if employee_name:
         name_m = re.search(re.escape(employee_name.strip()), text, re.IGNORECASE)
@@ -429,7 +637,10 @@ def _extract_employee_address(
             idx, city, state, zip_ = _find_csz(lines)
             if state:
                 return _street_before(lines, idx), city, state, zip_
+    return None
 
+
+def _employee_address_pattern(text: str) -> _Address | None:
     # Pass C — Pattern: name immediately followed by street then CSZ
     pm = re.search(
         r"\n[A-Z][A-Za-z]+(?:[ \t]+[A-Z]\.?)?[ \t]+[A-Z][A-Za-z]+"
@@ -440,17 +651,23 @@ def _extract_employee_address(
         city, state, zip_ = _parse_csz(pm.group(2))
         if state:
             return _dedupe_doubled(pm.group(1)).strip(), city, state, zip_
-
-    return None, None, None, None
+    return None
 
 
-def _extract_employer_name(text: str) -> str | None:
+def _extract_employer_name(text: str, run: _Run | None = None) -> str | None:
     """Extract employer name from W2 text.
 
     Tries label-based patterns first (labeled/synthetic PDFs), then falls back
     to a positional search for the first line containing a company-type suffix
     (Inc, LLC, LLP, Corp, Company) after the first dollar amount.
     """
+    return (run or _Run()).first("employer_name", (
+        ("label", lambda: _employer_name_label(text)),
+        ("suffix", lambda: _employer_name_suffix(text)),
+    ))
+
+
+def _employer_name_label(text: str) -> str | None:
     # Label-based (labeled PDFs)
     m = re.search(
         r"(?:c\s+)?Employer(?:'s)?\s+name[^\n]*\n\s*(.+?)(?:\n|$)",
@@ -474,7 +691,10 @@ def _extract_employer_name(text: str) -> str | None:
                     candidate = ln
                     break
         return candidate[:120]
+    return None
+
 
+def _employer_name_suffix(text: str) -> str | None:
     # Positional: first line with a company suffix after the first dollar amount.
     # [^\n\d]*? ensures no digits appear before the suffix (filters numeric lines).
     first_amount = re.search(r"\d[\d,]+\.\d{2}", text)
@@ -502,13 +722,22 @@ def _extract_employer_name(text: str) -> str | None:
     return None
 
 
-def _extract_employee_name(text: str) -> str | None:
+def _extract_employee_name(text: str, run: _Run | None = None) -> str | None:
     """Extract employee name from W2 text.
 
     Tries label-based first, then a positional pattern: a "First [Initial] Last"
     name on a line immediately followed by a digit (start of a street address).
     This targets the cleanest copy in multi-copy PDFs (e.g. Dayforce page 2).
     """
+    # An empty labeled name ("") ends the cascade like a found one.
+    return (run or _Run()).first("employee_name", (
+        ("label", lambda: _employee_name_label(text)),
+        ("doubled", lambda: _employee_name_positional(text, doubled=True)),
+        ("single", lambda: _employee_name_positional(text, doubled=False)),
+    )) or None
+
+
+def _employee_name_label(text: str) -> str | None:
     # Label-based — handles "e Employee's first name..." and ADP "e/f Employee's name..."
     m = re.search(
         r"e(?:/f)?\s+Employee(?:'s)?\s+(?:first\s+name|name)[^\n]*\n\s*(.+?)(?:\n|$)",
@@ -527,31 +756,51 @@ def _extract_employee_name(text: str) -> str | None:
                     name_raw = ln
                     break
         name_raw = re.sub(r"\b\d{5}(?:-\d{4})?\b", "", name_raw)
-        return re.sub(r"\s{2,}", " ", name_raw).strip()[:80] or None
+        return re.sub(r"\s{2,}", " ", name_raw).strip()[:80]
+    return None
 
-    # Positional (doubled copy): real W2 PDFs render two side-by-side copies, so the
-    # name line looks like "BRITTANY T WEBB BRITTANY T WEBB\n6311 ...".
-    # Use a backreference to capture the first copy only.
-    pm = re.search(
-        r"\n([A-Z][A-Za-z]+[ \t]+(?:[A-Z]\.?[ \t]+)?[A-Z][A-Za-z]+)[ \t]+\1\n\d",
-        text,
-    )
-    if pm:
-        return pm.group(1).strip()[:80]
 
-    # Positional (single copy): "FirstName [Initial] LastName\n<digit>".
-    # Handles mixed-case ("Ryan W Keel") and all-caps ("BRITTANY T WEBB").
-    pm = re.search(
-        r"\n([A-Z][A-Za-z]+[ \t]+(?:[A-Z]\.?[ \t]+)?[A-Z][A-Za-z]+)\n\d",
-        text,
+def _employee_name_positional(text: str, doubled: bool) -> str | None:
+    if doubled:
+        # Positional (doubled copy): real W2 PDFs render two side-by-side copies, so the
+        # name line looks like "BRITTANY T WEBB BRITTANY T WEBB\n6311 ...".
+        # Use a backreference to capture the first copy only.
+        pattern = r"\n([A-Z][A-Za-z]+[ \t]+(?:[A-Z]\.?[ \t]+)?[A-Z][A-Za-z]+)[ \t]+\1\n\d"
+    else:
+        # Positional (single copy): "FirstName [Initial] LastName\n<digit>".
+        # Handles mixed-case ("Ryan W Keel") and all-caps ("BRITTANY T WEBB").
+        pattern = r"\n([A-Z][A-Za-z]+[ \t]+(?:[A-Z]\.?[ \t]+)?[A-Z][A-Za-z]+)\n\d"
+    pm = re.search(pattern, text)
+    return pm.group(1).strip()[:80] if pm else None
+
+
+_YEAR = r"(?<![/$(\d])(20\d{2})(?![.\d])"
+
+# (strategy, alternative patterns) in priority order; see _extract_year().
+_YEAR_STRATEGIES: tuple[tuple[str, tuple[re.Pattern[str], ...]], ...] = tuple(
+    (name, tuple(re.compile(p, re.IGNORECASE) for p in patterns))
+    for name, patterns in (
+        # 1. Full form title (year appears to the right on the same line).
+        ("title", (r"Form\s+W-?\s*2\s+Wage\s+and\s+Tax\s+Statement[^\n]{0,40}" + _YEAR,)),
+        # 2. Shorter "W-2" / "W2" label with year nearby (either side, same line).
+        ("w2_label", (r"W-?\s*2\b[^\n]{0,40}" + _YEAR, _YEAR + r"[^\n]{0,40}\bW-?\s*2\b")),
+        # 3. Standalone year on its own line (Dayforce prints "2024" alone).
+        ("own_line", (r"(?m)^\s*(20\d{2})\s*$",)),
+        # 4. First clean year token anywhere in the text.
+        ("anywhere", (_YEAR,)),
     )
-    if pm:
-        return pm.group(1).strip()[:80]
+)
 
+
+def _year_from(patterns: tuple[re.Pattern[str], ...], text: str) -> int | None:
+    for pattern in patterns:
+        m = pattern.search(text)
+        if m:
+            return int(m.group(1))
     return None
 
 
-def _extract_year(text: str) -> int | None:
+def _extract_year(text: str, run: _Run | None = None) -> int | None:
     """Extract the tax year from W2 text using a priority-based strategy.
 
     A valid tax-year token is NOT preceded by / $ ( or a digit, and NOT
@@ -563,42 +812,150 @@ def _extract_year(text: str) -> int | None:
     3. Standalone year on its own line          — Dayforce / real-PDF layout.
     4. First clean year token in the text       — last resort.
     """
-    _YEAR = r"(?<![/$(\d])(20\d{2})(?![.\d])"
+    return (run or _Run()).first("year", tuple(
+        (name, lambda patterns=patterns: _year_from(patterns, text))
+        for name, patterns in _YEAR_STRATEGIES
+    ))
+
+
+# Wage / tax boxes 1–6, label-based.  Patterns require the full field-name
+# keyword after the box number so that column-header lines like
+# "Federal Box 1 Soc. Sec. Box 3 & 7 Medicare Box 5" do not produce false matches.
+_BOX_LABELS: tuple[tuple[str, str], ...] = (
+    ("box1_wages", r"(?:(?:Box\s*[1Il]|1\.?)\s+Wages(?:,?\s*tips)?)"),
+    ("box2_fed_withholding",
+     r"(?:2\.?\s*Federa[l1](?:\s+income\s+tax)?\s+with(?:held|holding)?|"
+     r"Box\s*2\s+Federa[l1](?:\s+income\s+tax)?\s+with(?:held|holding)?)"),
+    ("box3_ss_wages", r"(?:3\.?\s*Social\s+security\s+wages|Box\s*3\s+Social)"),
+    ("box4_ss_tax", r"(?:4\.?\s*Social\s+security\s+tax|Box\s*4\s+Social)"),
+    ("box5_medicare_wages", r"(?:5\.?\s*Medicare\s+wages|Box\s*5\s+Medicare)"),
+    ("box6_medicare_tax", r"(?:6\.?\s*Medicare\s+tax|Box\s*6\s+Medicare)"),
+)
+
+
+def _labeled_box(field_name: str, pattern: str, text: str) -> float | None:
+    val = extract_amount_after_label(pattern, text)
+    # Discard negative values from label extraction before the positional fallback
+    # so that OCR artifacts like "-214175.64" (a "-" prefix before a value) turn
+    # into None and correctly trigger the fallback rather than blocking it.
+    if val is not None and val < 0 and field_name in _NON_NEGATIVE_FIELDS:
+        _log.warning("w2: negative value %s for %s — discarding (likely parse error)", val, field_name)
+        return None
+    return val
+
+
+# --- Multi-copy documents -----------------------------------------------------
+#
+# Employer W-2 PDFs repeat the form as Copies B, C and 2 (up to four per
+# page).  The text is cut into copies, the best-looking copy is parsed on its
+# own, and the remaining copies are only checked for its key amounts.  The
+# whole text is parsed instead whenever that shortcut could lose data.
+
+_COPY_CAPTION_RE = re.compile(r"(?im)^[ \t]*Copy[ \t]+(?:[A-D]|[12])\b[^\n]*$")
+_KEY_FIELDS = (
+    "employer_name", "employer_ein", "employee_name",
+    "box1_wages", "box2_fed_withholding", "box3_ss_wages",
+    "box4_ss_tax", "box5_medicare_wages", "box6_medicare_tax",
+)
+_KEY_AMOUNT_FIELDS = _KEY_FIELDS[3:]
 
-    # 1. Full form title (year appears to the right on the same line).
-    m = re.search(
-        r"Form\s+W-?\s*2\s+Wage\s+and\s+Tax\s+Statement[^\n]{0,40}" + _YEAR,
-        text, re.IGNORECASE,
-    )
-    if m:
-        return int(m.group(1))
 
-    # 2. Shorter "W-2" / "W2" label with year nearby (either side, same line).
-    m = re.search(r"W-?\s*2\b[^\n]{0,40}" + _YEAR, text, re.IGNORECASE)
-    if not m:
-        m = re.search(_YEAR + r"[^\n]{0,40}\bW-?\s*2\b", text, re.IGNORECASE)
-    if m:
-        return int(m.group(1))
+def _amount_set(text: str) -> set[str]:
+    return {m.group(0).replace(",", "") for m in _AMOUNT_RE.finditer(text)}
 
-    # 3. Standalone year on its own line (Dayforce prints "2024" alone).
-    m = re.search(r"(?m)^\s*(20\d{2})\s*$", text)
-    if m:
-        return int(m.group(1))
 
-    # 4. First clean year token anywhere in the text.
-    m = re.search(_YEAR, text)
-    if m:
-        return int(m.group(1))
+def _split_copies(text: str) -> list[str]:
+    """Cut a normalized W-2 text into form copies; a single-copy text comes back whole.
 
+    Copies are delimited by their "Copy B/C/1/2 ..." captions when there are
+    at least two, otherwise by the most repeated line holding two or more
+    amounts (e.g. Dayforce's "Tampa FL 33607 168600.00 10453.20").
+    """
+    captions = list(_COPY_CAPTION_RE.finditer(text))
+    if len(captions) >= 2:
+        if _AMOUNT_RE.search(text, 0, captions[0].start()):
+            cuts = [m.end() for m in captions[:-1]]     # captions close each copy
+        else:
+            cuts = [m.start() for m in captions[1:]]    # captions open each copy
+    else:
+        repeats: dict[str, list[int]] = {}
+        start = 0
+        for line in text.split("\n"):
+            if line.count(".") >= 2 and len(_AMOUNT_RE.findall(line)) >= 2:
+                repeats.setdefault(line.strip(), []).append(start)
+            start += len(line) + 1
+        anchors = max(repeats.values(), key=len, default=[])
+        cuts = anchors[1:]
+    bounds = [0, *cuts, len(text)]
+    copies = [text[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+    return [c for c in copies if c]
+
+
+def _copy_quality(copy: str, amounts: set[str]) -> tuple[int, int]:
+    """Distinct amounts first, then fewer OCR fragment lines ("Jo", "h")."""
+    fragments = sum(1 for l in copy.split("\n") if 0 < len(l.strip()) <= 2)
+    return len(amounts), -fragments
+
+
+def _copy_consistency(data: W2Data, amount_sets: list[set[str]], best: int) -> float | None:
+    """Share of the other copies repeating data's key amounts, or None if data can't stand alone."""
+    if data.year is None or any(getattr(data, f) in (None, "") for f in _KEY_FIELDS):
+        return None
+    key_amounts = {f"{getattr(data, f):.2f}" for f in _KEY_AMOUNT_FIELDS}
+    best_amounts = amount_sets[best]
+    verified = 0
+    for i, amounts in enumerate(amount_sets):
+        if i == best:
+            continue
+        if key_amounts <= amounts:
+            if not amounts <= best_amounts:
+                return None     # a duplicate copy carries amounts the best one lacks
+            verified += 1
+    return verified / (len(amount_sets) - 1) if verified else None
+
+
+def _parse_best_copy(copies: list[str]) -> W2Data | None:
+    """Parse the best copy that the others confirm, or None when the whole text must be parsed.
+
+    The two best-looking copies are tried, so one damaged copy cannot force
+    the full parse.  Copies that do not repeat the key amounts lower
+    confidence by up to 15%.
+    """
+    amount_sets = [_amount_set(c) for c in copies]
+    order = sorted(
+        range(len(copies)), key=lambda i: _copy_quality(copies[i], amount_sets[i]), reverse=True,
+    )
+    for best in order[:2]:
+        data = _parse_w2_copy(copies[best])
+        consistency = _copy_consistency(data, amount_sets, best)
+        if consistency is not None:
+            data.confidence = round(data.confidence * (0.85 + 0.15 * consistency), 2)
+            return data
     return None
 
 
-def parse_w2_text(text: str, fallback_year: int | None = None) -> W2Data:
+def parse_w2_text(text: str | Document, fallback_year: int | None = None) -> W2Data:
+    doc = as_document(text)
+    text = doc.normalized
+    copies = _split_copies(text)
+    data = _parse_best_copy(copies) if len(copies) > 1 else None
+    if data is None:
+        data = _parse_w2_copy(text, fallback_year, doc.amount_tokens)
+    return data
+
+
+def _parse_w2_copy(
+    text: str,
+    fallback_year: int | None = None,
+    amounts: list[AmountToken] | None = None,
+) -> W2Data:
     data = W2Data()
-    text = normalize_extracted_text(text)
+    fingerprint = _layout_fingerprint(text)
+    run = _Run(_lookup_template(fingerprint))
+    index = _W2Index(text, amounts)
 
     # --- Year ---
-    data.year = _extract_year(text)
+    data.year = _extract_year(text, run)
     if data.year is None and fallback_year is not None:
         data.year = fallback_year
 
@@ -608,49 +965,22 @@ def parse_w2_text(text: str, fallback_year: int | None = None) -> W2Data:
         data.employer_ein = ein_match.group(1)
 
     # --- Employer name ---
-    data.employer_name = _extract_employer_name(text)
+    data.employer_name = _extract_employer_name(text, run)
 
     # --- Employee name ---
-    data.employee_name = _extract_employee_name(text)
+    data.employee_name = _extract_employee_name(text, run)
 
     # --- Wage / tax boxes 1–6 (label-based first) ---
-    # Patterns require the full field-name keyword after the box number so that
-    # column-header lines like "Federal Box 1 Soc. Sec. Box 3 & 7 Medicare Box 5"
-    # do not produce false matches.
-    data.box1_wages = extract_amount_after_label(
-        r"(?:(?:Box\s*[1Il]|1\.?)\s+Wages(?:,?\s*tips)?)",
-        text,
-    )
-    data.box2_fed_withholding = extract_amount_after_label(
-        r"(?:2\.?\s*Federa[l1](?:\s+income\s+tax)?\s+with(?:held|holding)?|"
-        r"Box\s*2\s+Federa[l1](?:\s+income\s+tax)?\s+with(?:held|holding)?)",
-        text,
-    )
-    data.box3_ss_wages = extract_amount_after_label(
-        r"(?:3\.?\s*Social\s+security\s+wages|Box\s*3\s+Social)",
-        text,
-    )
-    data.box4_ss_tax = extract_amount_after_label(
-        r"(?:4\.?\s*Social\s+security\s+tax|Box\s*4\s+Social)",
-        text,
-    )
-    data.box5_medicare_wages = extract_amount_after_label(
-        r"(?:5\.?\s*Medicare\s+wages|Box\s*5\s+Medicare)",
-        text,
-    )
-    data.box6_medicare_tax = extract_amount_after_label(
-        r"(?:6\.?\s*Medicare\s+tax|Box\s*6\s+Medicare)",
-        text,
-    )
-
-    # Discard negative values from label extraction before the positional fallback
-    # so that OCR artifacts like "-214175.64" (a "-" prefix before a value) turn
-    # into None and correctly trigger the fallback rather than blocking it.
-    for field_name in _NON_NEGATIVE_FIELDS:
-        val = getattr(data, field_name)
-        if val is not None and val < 0:
-            _log.warning("w2: negative value %s for %s — discarding (likely parse error)", val, field_name)
-            setattr(data, field_name, None)
+    # A layout plan lists the boxes its layout labels; the others go straight
+    # to the positional fallback and are label-searched only if that misses.
+    labeled = run.planned("labels")
+    skipped: list[tuple[str, str]] = []
+    for field_name, pattern in _BOX_LABELS:
+        if labeled is not None and field_name not in labeled:
+            skipped.append((field_name, pattern))
+            continue
+        setattr(data, field_name, _labeled_box(field_name, pattern, text))
+    run.used["labels"] = tuple(f for f, _ in _BOX_LABELS if getattr(data, f) is not None)
 
     # Positional fallback when any box 1–6 field is still missing.
     if any(v is None for v in [
@@ -658,13 +988,20 @@ def parse_w2_text(text: str, fallback_year: int | None = None) -> W2Data:
         data.box3_ss_wages, data.box4_ss_tax,
         data.box5_medicare_wages, data.box6_medicare_tax,
     ]):
-        _fill_boxes_positional(data, text)
+        _fill_boxes_positional(data, index)
+    for field_name, pattern in skipped:
+        if getattr(data, field_name) is None:
+            val = _labeled_box(field_name, pattern, text)
+            if val is not None:
+                setattr(data, field_name, val)
+                run.used["labels"] += (field_name,)
+                run.fallbacks += 1
 
     # --- Box 12 ---
-    data.box12 = _extract_box12(text)
+    data.box12 = _extract_box12(text, run)
 
     # --- Box 13 ---
-    data.box13_retirement_plan = _detect_box13(text)
+    data.box13_retirement_plan = _detect_box13(text, run, index)
 
     # --- State boxes 15–17 ---
     # require_decimal=True prevents matching bare box numbers (e.g. "17" or "13") when
@@ -694,7 +1031,7 @@ def parse_w2_text(text: str, fallback_year: int | None = None) -> W2Data:
         data.employer_city,
         data.employer_state,
         data.employer_zip,
-    ) = _extract_employer_address(text)
+    ) = _extract_employer_address(text, run)
 
     # --- Employee address ---
     (
@@ -702,7 +1039,7 @@ def parse_w2_text(text: str, fallback_year: int | None = None) -> W2Data:
         data.employee_city,
         data.employee_state,
         data.employee_zip,
-    ) = _extract_employee_address(text, data.employee_name)
+    ) = _extract_employee_address(text, data.employee_name, run)
 
     # --- Confidence scoring (9 key fields) ---
     populated = sum(
@@ -721,4 +1058,5 @@ def parse_w2_text(text: str, fallback_year: int | None = None) -> W2Data:
     )
     critical_bonus = 0.1 if data.box1_wages is not None else 0.0
     data.confidence = round(min(1.0, populated / 9 + critical_bonus), 2)
+    _learn_template(fingerprint, run, data.confidence)
     return data
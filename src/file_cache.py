@@ -0,0 +1,167 @@
+"""
+Bounded, thread-safe cache of parsed workpaper files.
+
+Entries are keyed by (absolute path, loader) and revalidated on every lookup
+with a single stat(): a changed mtime, size or inode means the file is parsed
+again. The cache is an LRU bounded both by entry count and by an approximate
+byte budget (the on-disk size of each cached file), so a long-running
+dashboard holds at most one parsed copy per file and never grows without
+limit.
+
+With by_identity=True entries are keyed by (device, inode, loader) instead,
+so an entry follows its file through a rename or a move within the same
+filesystem; the extracted-document cache relies on this to survive
+--organize moving files between classification and extraction. Volumes that
+report no inode numbers fall back to path keys.
+
+Loads run outside the global lock under a per-key lock, so concurrent
+requests for the same stale file parse it once while other files are served
+in parallel.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+
+@dataclass
+class _Entry:
+    stamp: tuple[int, int, int]
+    value: Any
+    cost: int
+
+
+class FileCache:
+    def __init__(
+        self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, by_identity: bool = False
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.by_identity = by_identity
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, path: Path, loader: Callable[[Path], Any]) -> Any:
+        """Return loader(path), cached until the file changes. None if the file is missing."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._drop((os.path.abspath(path), loader))
+            return None
+        key = self._key(path, loader, st)
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+        with self._lock:
+            value = self._lookup(key, stamp)
+            if value is not _MISSING:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Another thread may have loaded it while we waited.
+                value = self._lookup(key, stamp)
+                if value is not _MISSING:
+                    return value
+                self.misses += 1
+                if key in self._entries:
+                    self.stale += 1
+            try:
+                value = loader(path)
+            except BaseException:
+                with self._lock:
+                    if key not in self._entries:
+                        self._key_locks.pop(key, None)
+                raise
+            with self._lock:
+                self._store(key, _Entry(stamp, value, st.st_size))
+        return value
+
+    def peek(self, path: Path, loader: Callable[[Path], Any]) -> Any:
+        """The cached, current loader(path), or None; never loads."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            value = self._lookup(self._key(path, loader, st), (st.st_mtime_ns, st.st_size, st.st_ino))
+        return None if value is _MISSING else value
+
+    def put(self, path: Path, loader: Callable[[Path], Any], value: Any) -> None:
+        """Store value as loader(path) for the file's current version, e.g. one loaded elsewhere."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._store(self._key(path, loader, st), _Entry((st.st_mtime_ns, st.st_size, st.st_ino), value, st.st_size))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+            }
+
+    def _key(self, path: Path, loader: Callable[[Path], Any], st: os.stat_result) -> Hashable:
+        # Some FAT, network and Windows volumes report inode 0 for every file.
+        if self.by_identity and st.st_ino:
+            return (st.st_dev, st.st_ino, loader)
+        return (os.path.abspath(path), loader)
+
+    # -- internals; callers hold self._lock --------------------------------
+
+    def _lookup(self, key: Hashable, stamp: tuple[int, int, int]) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry.stamp != stamp:
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        self._drop(key, keep_lock=True)
+        if entry.cost > self.max_bytes:
+            self._key_locks.pop(key, None)
+            return
+        self._entries[key] = entry
+        self._bytes += entry.cost
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            old_key = next(iter(self._entries))
+            self._drop(old_key)
+            self.evictions += 1
+
+    def _drop(self, key: Hashable, keep_lock: bool = False) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.cost
+        if not keep_lock:
+            lock = self._key_locks.get(key)
+            if lock is not None and not lock.locked():
+                del self._key_locks[key]
+
+
+_MISSING = object()
@@ -3,50 +3,33 @@ from __future__ import annotations
 import argparse
 import csv
 import json
-from dataclasses import asdict
+import os
+import re
+from dataclasses import asdict, dataclass
+from itertools import repeat
 from pathlib import Path
+from typing import Optional
 
 from src.checklist import generate_checklist
-from src.classify import classify_document, classify_document_structured
+from src.classify import classify_file
 from src.config import AppConfig
-from src.extract.brokerage_1099 import parse_brokerage_1099_text
-from src.extract.brokerage_1099_csv import parse_brokerage_1099_csv
-from src.extract.brokerage_1099_xml import parse_brokerage_1099_xml
-from src.extract.form_1099b_trades import (
-    build_trade_exceptions,
-    parse_1099b_trades_text,
-    summarize_trade_reconciliation,
-    trade_to_analytics_row,
-    trade_to_tax_row,
-)
-from src.extract.form_1098 import parse_1098_text
-from src.extract.form_1099_nec import parse_1099_nec_text
-from src.extract.form_1099_r import parse_1099_r_text
-from src.extract.form_1099_g import parse_1099_g_text
-from src.extract.form_1099_misc import parse_1099_misc_text
-from src.extract.form_1098_t import parse_1098_t_text
-from src.extract.form_1099_q import parse_1099_q_text
-from src.extract.form_1099_sa import parse_1099_sa_text
-from src.extract.ssa_1099 import parse_ssa_1099_text
-from src.extract.schedule_c import parse_schedule_c_text
-from src.extract.azure_schedule_c import AZURE_CONFIDENCE_THRESHOLD as _sched_c_AZURE_THRESH, parse_schedule_c_azure
-from src.extract.azure_1099_g import AZURE_CONFIDENCE_THRESHOLD as _1099g_AZURE_THRESH, parse_1099_g_azure
-from src.extract.azure_1099_misc import AZURE_CONFIDENCE_THRESHOLD as _1099misc_AZURE_THRESH, parse_1099_misc_azure
-from src.extract.azure_1098_t import AZURE_CONFIDENCE_THRESHOLD as _1098t_AZURE_THRESH, parse_1098_t_azure
-from src.extract.azure_1099_q import AZURE_CONFIDENCE_THRESHOLD as _1099q_AZURE_THRESH, parse_1099_q_azure
-from src.extract.azure_1099_sa import AZURE_CONFIDENCE_THRESHOLD as _1099sa_AZURE_THRESH, parse_1099_sa_azure
-from src.extract.azure_w2 import AZURE_CONFIDENCE_THRESHOLD, parse_w2_azure
-from src.extract.azure_1099 import AZURE_CONFIDENCE_THRESHOLD as _1099_AZURE_THRESH, parse_brokerage_1099_azure
-from src.extract.azure_1098 import AZURE_CONFIDENCE_THRESHOLD as _1098_AZURE_THRESH, parse_1098_azure
-from src.extract.generic_pdf import get_document_text
-from src.extract.w2 import parse_w2_text
+from src.dashboard import write_client_summary
+from src.extract.document import Document
+from src.extract.generic_pdf import cache_document, cached_document
+from src.extract.registry import DocTypeHandler, ParseInput, Parsed, get_handler
 from src.compare import build_metrics, generate_comparison_markdown, load_extract
 from src.models import DocumentRecord, ExtractionResult
-from src.organize import OwnerContext, organize_client_documents
+from src.organize import OwnerContext, organize_client_documents, recover_organization
 from src.questions import generate_questions
 from src.scanner import discover_clients, index_client_files
 from src.tax_calculator import calculate_tax, write_tax_estimate
 
+# Firm-wide summary written by --recompute-estimates
+_FIRM_SUMMARY_COLUMNS = [
+    "client", "filing_status", "tax_year", "total_income", "agi", "deduction_type",
+    "taxable_income", "total_tax", "total_payments", "refund_or_owed",
+]
+
 
 def maybe_redact(text: str, enabled: bool) -> str:
     if not enabled:
@@ -61,11 +44,14 @@ def maybe_redact(text: str, enabled: bool) -> str:
 
 
 
-def maybe_generate_prior_year_comparison(client_dir: Path, out_dir: Path, config: AppConfig) -> None:
+def maybe_generate_prior_year_comparison(
+    client_dir: Path, out_dir: Path, config: AppConfig, current_extract: dict | None = None
+) -> None:
     if not config.compare_prior_year or not config.prior_year_root:
         return
     prior_client_dir = config.prior_year_root / client_dir.name
-    current_extract = load_extract(out_dir / "Data_Extract.json")
+    if current_extract is None:
+        current_extract = load_extract(out_dir / "Data_Extract.json")
     prior_extract = load_extract(prior_client_dir / "_workpapers" / "Data_Extract.json")
     if not current_extract or not prior_extract:
         return
@@ -81,6 +67,13 @@ def _write_1099b_trade_outputs(client_dir: Path, out_dir: Path, config: AppConfi
 
     import csv
 
+    from src.extract.form_1099b_trades import (
+        build_trade_exceptions,
+        summarize_trade_reconciliation,
+        trade_to_analytics_row,
+        trade_to_tax_row,
+    )
+
     tax_rows = [trade_to_tax_row(client_dir.name, config.tax_year, t) for t in extraction.brokerage_1099_trades]
     analytics_rows = [trade_to_analytics_row(client_dir.name, config.tax_year, t) for t in extraction.brokerage_1099_trades]
 
@@ -125,6 +118,113 @@ def _write_1099b_trade_outputs(client_dir: Path, out_dir: Path, config: AppConfi
         writer.writerows(exceptions)
 
 
+# Concurrent Azure Document Intelligence requests per client
+_AZURE_CONCURRENCY = 4
+
+
+@dataclass
+class _StagedFile:
+    """One client file between the local parse and the Document_Index row."""
+
+    row: dict
+    doc_type: str = "error"
+    confidence: float = 0.0
+    detected_year: Optional[int] = None
+    notes: Optional[list[str]] = None
+    # Extracted text; None for structured CSV/XML files
+    doc: Optional[Document] = None
+    input: Optional[ParseInput] = None
+    parsed: Optional[Parsed] = None
+    # Exception type name when processing the file failed
+    error: Optional[str] = None
+
+
+def _parse_locally(
+    row: dict, config: AppConfig, extracted: Optional[tuple[Document, list[str]]] = None
+) -> _StagedFile:
+    """Extract, classify and locally parse one file; runs in a worker process."""
+    path = Path(row["file_path"])
+    staged = _StagedFile(row)
+    try:
+        classified = classify_file(path, config.enable_ocr, extracted)
+        staged.doc_type, staged.confidence, staged.detected_year, staged.doc, staged.notes = classified
+        handler = get_handler(classified.doc_type)
+        if handler is not None:
+            doc = classified.doc if classified.doc is not None else Document("")
+            staged.input = ParseInput(path, row["sha256"], doc, config.tax_year)
+            staged.parsed = handler.parse(staged.input)
+    except Exception as exc:
+        staged.error = type(exc).__name__
+    return staged
+
+
+def _parse_files_locally(rows: list[dict], config: AppConfig) -> list[_StagedFile]:
+    """
+    _parse_locally() over rows, in order; workers=1 runs in-process without a
+    pool. Workers get the parent's cached extractions (e.g. from --organize)
+    and the parent caches what they extract.
+    """
+    max_workers = min(config.workers or os.cpu_count() or 1, len(rows))
+    if max_workers <= 1:
+        return [_parse_locally(row, config) for row in rows]
+    from concurrent.futures import ProcessPoolExecutor
+
+    extracted = [cached_document(Path(row["file_path"]), config.enable_ocr) for row in rows]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        staged = list(pool.map(_parse_locally, rows, repeat(config), extracted))
+    for row, item, hit in zip(rows, staged, extracted):
+        if hit is None and item.doc is not None:
+            cache_document(Path(row["file_path"]), config.enable_ocr, item.doc, item.notes)
+    return staged
+
+
+def _wants_azure(item: _StagedFile, handler: Optional[DocTypeHandler], config: AppConfig) -> bool:
+    """Whether item goes to Azure; notes a skip for confident local parses."""
+    if handler is None or handler.azure_parse is None or item.parsed.structured or not config.enable_azure:
+        return False
+    confidence = item.parsed.data.confidence
+    if confidence >= handler.escalation_threshold():
+        item.notes.append(f"azure:skipped:high_local_confidence:{confidence:.2f}")
+        return False
+    return bool(config.azure_endpoint and config.azure_api_key)
+
+
+def _escalate_to_azure(staged: list[_StagedFile], config: AppConfig) -> None:
+    """
+    Send every low-confidence local parse to its Azure parser in one
+    concurrent batch, keeping Azure's result when it is at least as confident.
+    """
+    jobs = []
+    for item in staged:
+        handler = get_handler(item.doc_type)
+        if item.error is None and _wants_azure(item, handler, config):
+            jobs.append((item, handler))
+    if not jobs:
+        return
+    from concurrent.futures import ThreadPoolExecutor
+
+    def call(job: tuple[_StagedFile, DocTypeHandler]):
+        item, handler = job
+        try:
+            return handler.azure_parse(item.input.path, config.azure_endpoint, config.azure_api_key)
+        except Exception as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=min(_AZURE_CONCURRENCY, len(jobs))) as pool:
+        for (item, _handler), azure_parsed in zip(jobs, pool.map(call, jobs)):
+            if isinstance(azure_parsed, Exception):
+                item.error = type(azure_parsed).__name__
+                continue
+            local_conf = item.parsed.data.confidence
+            if azure_parsed is not None and azure_parsed.confidence >= local_conf:
+                item.parsed.data = azure_parsed
+                item.notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
+            else:
+                item.notes.append(
+                    f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
+                )
+
+
 def process_client(client_dir: Path, config: AppConfig) -> None:
     out_dir = client_dir / "_workpapers"
     out_dir.mkdir(exist_ok=True)
@@ -138,6 +238,8 @@ def process_client(client_dir: Path, config: AppConfig) -> None:
                 spouse_aliases=config.spouse_aliases,
             ),
             dry_run=config.organize_dry_run,
+            enable_ocr=config.enable_ocr,
+            workers=config.workers,
         )
         with (out_dir / "Organization_Log.csv").open("w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=["source", "destination", "doc_type", "owner"])
@@ -147,289 +249,59 @@ def process_client(client_dir: Path, config: AppConfig) -> None:
     extraction = ExtractionResult()
     records: list[DocumentRecord] = []
 
-    for row in index_client_files(client_dir):
-        path = Path(row["file_path"])
-        try:
-            structured = classify_document_structured(path)
-            if structured is not None:
-                doc_type, confidence = structured
-                detected_year = None
-                text = ""
-                notes: list[str] = [f"structured:{path.suffix.lower()[1:]}"]
-            else:
-                text, notes = get_document_text(path, config.enable_ocr)
-                doc_type, confidence, detected_year = classify_document(path, text)
-
-            key_fields = {}
-            issuer = None
-            if doc_type == "w2":
-                parsed = parse_w2_text(text, fallback_year=config.tax_year)
-                if (
-                    config.enable_azure
-                    and parsed.confidence < AZURE_CONFIDENCE_THRESHOLD
-                    and config.azure_endpoint
-                    and config.azure_api_key
-                ):
-                    local_conf = parsed.confidence
-                    azure_parsed = parse_w2_azure(path, config.azure_endpoint, config.azure_api_key)
-                    if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                        parsed = azure_parsed
-                        notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                    else:
-                        notes.append(
-                            f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                        )
-                elif config.enable_azure and parsed.confidence >= AZURE_CONFIDENCE_THRESHOLD:
-                    notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                extraction.w2.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.employer_name
-            elif doc_type == "brokerage_1099":
-                ext = path.suffix.lower()
-                if ext == ".csv":
-                    parsed, trades = parse_brokerage_1099_csv(
-                        path.read_text(encoding="utf-8", errors="replace"),
-                        source_file=path.name,
-                        source_sha256=row["sha256"],
-                    )
-                    detected_year = parsed.year
-                    extraction.brokerage_1099.append(parsed)
-                    extraction.brokerage_1099_trades.extend(trades)
-                elif ext == ".xml":
-                    parsed, trades = parse_brokerage_1099_xml(
-                        path.read_text(encoding="utf-8", errors="replace"),
-                        source_file=path.name,
-                        source_sha256=row["sha256"],
-                    )
-                    detected_year = parsed.year
-                    extraction.brokerage_1099.append(parsed)
-                    extraction.brokerage_1099_trades.extend(trades)
-                else:
-                    parsed = parse_brokerage_1099_text(text)
-                    if (
-                        config.enable_azure
-                        and parsed.confidence < _1099_AZURE_THRESH
-                        and config.azure_endpoint
-                        and config.azure_api_key
-                    ):
-                        local_conf = parsed.confidence
-                        azure_parsed = parse_brokerage_1099_azure(path, config.azure_endpoint, config.azure_api_key)
-                        if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                            parsed = azure_parsed
-                            notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                        else:
-                            notes.append(
-                                f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                            )
-                    elif config.enable_azure and parsed.confidence >= _1099_AZURE_THRESH:
-                        notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                    extraction.brokerage_1099.append(parsed)
-                    trades, trade_diag = parse_1099b_trades_text(text, parsed.broker_name, path.name, row["sha256"])
-                    extraction.brokerage_1099_trades.extend(trades)
-                key_fields = asdict(parsed)
-                key_fields["trade_count"] = len(trades)
-                if ext not in (".csv", ".xml"):
-                    key_fields["trade_candidates"] = trade_diag.row_candidates
-                issuer = parsed.broker_name
-            elif doc_type == "form_1098":
-                parsed = parse_1098_text(text)
-                if (
-                    config.enable_azure
-                    and parsed.confidence < _1098_AZURE_THRESH
-                    and config.azure_endpoint
-                    and config.azure_api_key
-                ):
-                    local_conf = parsed.confidence
-                    azure_parsed = parse_1098_azure(path, config.azure_endpoint, config.azure_api_key)
-                    if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                        parsed = azure_parsed
-                        notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                    else:
-                        notes.append(
-                            f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                        )
-                elif config.enable_azure and parsed.confidence >= _1098_AZURE_THRESH:
-                    notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                extraction.form_1098.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.lender_name
-            elif doc_type == "form_1099_nec":
-                parsed = parse_1099_nec_text(text)
-                extraction.form_1099_nec.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.payer_name
-            elif doc_type == "form_1099_r":
-                parsed = parse_1099_r_text(text)
-                extraction.form_1099_r.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.payer_name
-            elif doc_type == "form_1099_g":
-                parsed = parse_1099_g_text(text)
-                if (
-                    config.enable_azure
-                    and parsed.confidence < _1099g_AZURE_THRESH
-                    and config.azure_endpoint
-                    and config.azure_api_key
-                ):
-                    local_conf = parsed.confidence
-                    azure_parsed = parse_1099_g_azure(path, config.azure_endpoint, config.azure_api_key)
-                    if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                        parsed = azure_parsed
-                        notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                    else:
-                        notes.append(
-                            f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                        )
-                elif config.enable_azure and parsed.confidence >= _1099g_AZURE_THRESH:
-                    notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                extraction.form_1099_g.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.payer_name
-            elif doc_type == "form_1099_misc":
-                parsed = parse_1099_misc_text(text)
-                if (
-                    config.enable_azure
-                    and parsed.confidence < _1099misc_AZURE_THRESH
-                    and config.azure_endpoint
-                    and config.azure_api_key
-                ):
-                    local_conf = parsed.confidence
-                    azure_parsed = parse_1099_misc_azure(path, config.azure_endpoint, config.azure_api_key)
-                    if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                        parsed = azure_parsed
-                        notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                    else:
-                        notes.append(
-                            f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                        )
-                elif config.enable_azure and parsed.confidence >= _1099misc_AZURE_THRESH:
-                    notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                extraction.form_1099_misc.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.payer_name
-            elif doc_type == "form_1098_t":
-                parsed = parse_1098_t_text(text)
-                if (
-                    config.enable_azure
-                    and parsed.confidence < _1098t_AZURE_THRESH
-                    and config.azure_endpoint
-                    and config.azure_api_key
-                ):
-                    local_conf = parsed.confidence
-                    azure_parsed = parse_1098_t_azure(path, config.azure_endpoint, config.azure_api_key)
-                    if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                        parsed = azure_parsed
-                        notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                    else:
-                        notes.append(
-                            f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                        )
-                elif config.enable_azure and parsed.confidence >= _1098t_AZURE_THRESH:
-                    notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                extraction.form_1098_t.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.filer_name
-            elif doc_type == "form_1099_q":
-                parsed = parse_1099_q_text(text)
-                if (
-                    config.enable_azure
-                    and parsed.confidence < _1099q_AZURE_THRESH
-                    and config.azure_endpoint
-                    and config.azure_api_key
-                ):
-                    local_conf = parsed.confidence
-                    azure_parsed = parse_1099_q_azure(path, config.azure_endpoint, config.azure_api_key)
-                    if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                        parsed = azure_parsed
-                        notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                    else:
-                        notes.append(
-                            f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                        )
-                elif config.enable_azure and parsed.confidence >= _1099q_AZURE_THRESH:
-                    notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                extraction.form_1099_q.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.payer_name
-            elif doc_type == "form_1099_sa":
-                parsed = parse_1099_sa_text(text)
-                if (
-                    config.enable_azure
-                    and parsed.confidence < _1099sa_AZURE_THRESH
-                    and config.azure_endpoint
-                    and config.azure_api_key
-                ):
-                    local_conf = parsed.confidence
-                    azure_parsed = parse_1099_sa_azure(path, config.azure_endpoint, config.azure_api_key)
-                    if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                        parsed = azure_parsed
-                        notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                    else:
-                        notes.append(
-                            f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                        )
-                elif config.enable_azure and parsed.confidence >= _1099sa_AZURE_THRESH:
-                    notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                extraction.form_1099_sa.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.payer_name
-            elif doc_type == "ssa_1099":
-                parsed = parse_ssa_1099_text(text)
-                extraction.ssa_1099.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = "Social Security Administration"
-            elif doc_type == "schedule_c":
-                parsed = parse_schedule_c_text(text)
-                if (
-                    config.enable_azure
-                    and parsed.confidence < _sched_c_AZURE_THRESH
-                    and config.azure_endpoint
-                    and config.azure_api_key
-                ):
-                    local_conf = parsed.confidence
-                    azure_parsed = parse_schedule_c_azure(path, config.azure_endpoint, config.azure_api_key)
-                    if azure_parsed is not None and azure_parsed.confidence >= local_conf:
-                        parsed = azure_parsed
-                        notes.append(f"azure:used:local_confidence_was:{local_conf:.2f}")
-                    else:
-                        notes.append(
-                            f"azure:{'unavailable' if azure_parsed is None else 'skipped_lower_confidence'}:local_confidence:{local_conf:.2f}"
-                        )
-                elif config.enable_azure and parsed.confidence >= _sched_c_AZURE_THRESH:
-                    notes.append(f"azure:skipped:high_local_confidence:{parsed.confidence:.2f}")
-                extraction.schedule_c.append(parsed)
-                key_fields = asdict(parsed)
-                issuer = parsed.line_c_business_name or parsed.proprietor_name
-            else:
-                extraction.unknown.append({"file_name": path.name, "reason": "Unclassified"})
-
-            records.append(
-                DocumentRecord(
-                    client=client_dir.name,
-                    file_path=str(path),
-                    file_name=path.name,
-                    sha256=row["sha256"],
-                    doc_type=doc_type,
-                    confidence=confidence,
-                    detected_year=detected_year,
-                    issuer=issuer,
-                    key_fields=key_fields,
-                    extraction_notes=notes,
-                )
-            )
-        except Exception as exc:
+    staged = _parse_files_locally(index_client_files(client_dir), config)
+    _escalate_to_azure(staged, config)
+    for item in staged:
+        path = Path(item.row["file_path"])
+        handler = get_handler(item.doc_type) if item.error is None else None
+        if handler is not None and handler.finish is not None and not item.parsed.structured:
+            try:
+                handler.finish(item.input, item.parsed)
+            except Exception as exc:
+                item.error = type(exc).__name__
+        if item.error is not None:
             records.append(
                 DocumentRecord(
                     client=client_dir.name,
                     file_path=str(path),
                     file_name=path.name,
-                    sha256=row["sha256"],
+                    sha256=item.row["sha256"],
                     doc_type="error",
                     confidence=0.0,
-                    extraction_notes=[f"processing_error:{type(exc).__name__}"],
+                    extraction_notes=[f"processing_error:{item.error}"],
                 )
             )
-
+            continue
+
+        key_fields = {}
+        issuer = None
+        detected_year = item.detected_year
+        if handler is None:
+            extraction.unknown.append({"file_name": path.name, "reason": "Unclassified"})
+        else:
+            parsed = item.parsed
+            getattr(extraction, handler.slot).append(parsed.data)
+            for slot, items in parsed.related.items():
+                getattr(extraction, slot).extend(items)
+            key_fields = {**asdict(parsed.data), **parsed.key_fields}
+            issuer = handler.issuer(parsed.data)
+            if parsed.year is not None:
+                detected_year = parsed.year
+
+        records.append(
+            DocumentRecord(
+                client=client_dir.name,
+                file_path=str(path),
+                file_name=path.name,
+                sha256=item.row["sha256"],
+                doc_type=item.doc_type,
+                confidence=item.confidence,
+                detected_year=detected_year,
+                issuer=issuer,
+                key_fields=key_fields,
+                extraction_notes=item.notes,
+            )
+        )
     with (out_dir / "Document_Index.csv").open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(
             f,
@@ -442,16 +314,18 @@ def process_client(client_dir: Path, config: AppConfig) -> None:
             row_out["extraction_notes"] = ";".join(row_out["extraction_notes"])
             writer.writerow(row_out)
 
+    extract_data = extraction.to_dict()
     with (out_dir / "Data_Extract.json").open("w", encoding="utf-8") as f:
-        json.dump(extraction.to_dict(), f, indent=2, sort_keys=True)
+        json.dump(extract_data, f, indent=2, sort_keys=True)
 
     checklist = maybe_redact(generate_checklist(client_dir.name, extraction), config.redact)
     questions = maybe_redact(generate_questions(client_dir.name, extraction), config.redact)
 
     (out_dir / "Return_Prep_Checklist.md").write_text(checklist, encoding="utf-8")
     (out_dir / "Questions_For_Client.md").write_text(questions, encoding="utf-8")
+    write_client_summary(client_dir, [rec.doc_type for rec in records], extraction, questions)
     _write_1099b_trade_outputs(client_dir, out_dir, config, extraction)
-    maybe_generate_prior_year_comparison(client_dir, out_dir, config)
+    maybe_generate_prior_year_comparison(client_dir, out_dir, config, extract_data)
 
     estimate = calculate_tax(
         extraction,
@@ -464,6 +338,99 @@ def process_client(client_dir: Path, config: AppConfig) -> None:
     write_tax_estimate(out_dir, estimate, client=client_dir.name)
 
 
+def _other_clients_rows(path: Path, config: AppConfig) -> list[dict]:
+    """
+    With --client, the rows of an existing firm-wide CSV that belong to other
+    clients, so a one-client run updates only its own rows; empty otherwise.
+    """
+    if not config.client_filter or not path.exists():
+        return []
+    with path.open(newline="", encoding="utf-8") as f:
+        return [row for row in csv.DictReader(f) if row["client"].lower() != config.client_filter.lower()]
+
+
+def recompute_tax_estimates(clients: list[Path], config: AppConfig) -> int:
+    """
+    Rebuild Tax_Estimate.json/.md for every client from its existing
+    Data_Extract.json in one vectorized pass (no document re-extraction), and
+    write Firm_Tax_Summary.csv under the root (with --client, only that
+    client's row is replaced). Returns the number of clients.
+    """
+    from src.tax_scenarios import calculate_tax_batch
+
+    names: list[str] = []
+    out_dirs: list[Path] = []
+    extractions: list[ExtractionResult] = []
+    for client_dir in clients:
+        out_dir = client_dir / "_workpapers"
+        data = load_extract(out_dir / "Data_Extract.json")
+        if not data:
+            continue
+        data.pop("brokerage_1099_trades", None)  # not a calculate_tax input
+        names.append(client_dir.name)
+        out_dirs.append(out_dir)
+        extractions.append(ExtractionResult.from_dict(data))
+
+    estimates = calculate_tax_batch(
+        extractions,
+        filing_status=config.filing_status,
+        num_children=config.num_children,
+        estimated_payments=config.estimated_payments,
+        foreign_tax_credit=config.foreign_tax_credit,
+        tax_year=config.tax_year,
+    )
+
+    summary = config.root / "Firm_Tax_Summary.csv"
+    rows = _other_clients_rows(summary, config)
+    for name, out_dir, est in zip(names, out_dirs, estimates):
+        write_tax_estimate(out_dir, est, client=name)
+        rows.append({"client": name, **{col: getattr(est, col) for col in _FIRM_SUMMARY_COLUMNS[1:]}})
+    rows.sort(key=lambda r: r["client"])
+    with summary.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=_FIRM_SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(estimates)
+
+
+def write_multi_year_reports(clients: list[Path], config: AppConfig) -> int:
+    """
+    Compare every client's current Data_Extract.json with the configured
+    prior-year roots: writes _workpapers/Multi_Year_Comparison.md per client
+    and Firm_Anomalies.csv under the root (with --client, only that client's
+    rows are replaced). Returns the number of anomalies.
+    """
+    from src.multi_year import collect_history, find_anomalies, generate_history_markdown, write_anomaly_table
+
+    roots = {year: root for year, root in config.history_roots}
+    roots[config.tax_year] = config.root
+    history = collect_history([c.name for c in clients], roots)
+    anomalies = find_anomalies(
+        history,
+        pct_threshold=config.anomaly_pct_threshold,
+        z_threshold=config.anomaly_z_threshold,
+    )
+    for i, client_dir in enumerate(clients):
+        if not history.has_extract[i, -1]:
+            continue
+        report = generate_history_markdown(client_dir.name, history, anomalies)
+        (client_dir / "_workpapers" / "Multi_Year_Comparison.md").write_text(report, encoding="utf-8")
+    table = config.root / "Firm_Anomalies.csv"
+    write_anomaly_table(table, anomalies, keep_rows=_other_clients_rows(table, config))
+    return len(anomalies)
+
+
+def parse_history_root(value: str) -> tuple[int, Path]:
+    """--history-root value: "YEAR=PATH", or a PATH whose folder name ends in the year."""
+    year_text, sep, path_text = value.partition("=")
+    if sep and year_text.strip().isdigit():
+        return int(year_text), Path(path_text)
+    match = re.search(r"(\d{4})$", Path(value).name)
+    if not match:
+        raise argparse.ArgumentTypeError(f"cannot tell the tax year of {value!r}; use YEAR=PATH")
+    return int(match.group(1)), Path(value)
+
+
 def parse_args() -> AppConfig:
     p = argparse.ArgumentParser(description="Local-only tax return workpaper generator")
     p.add_argument("--root", required=True, help="Root folder with client subfolders")
@@ -474,11 +441,23 @@ def parse_args() -> AppConfig:
     p.add_argument("--verbose", action="store_true")
     p.add_argument("--organize", action="store_true", help="Auto-organize source docs into standardized owner/form subfolders")
     p.add_argument("--organize-dry-run", action="store_true", help="Preview organization plan without moving files")
+    p.add_argument("--organize-rollback", action="store_true",
+                   help="Undo an interrupted --organize run (files back to their original folders) and exit")
     p.add_argument("--taxpayer-name", help="Taxpayer full name for owner tagging during organization")
     p.add_argument("--spouse-name", help="Spouse full name for owner tagging during organization")
     p.add_argument("--spouse-alias", action="append", default=[], help="Spouse alias/former name, repeatable")
     p.add_argument("--compare-prior-year", action="store_true", help="Generate prior-year comparison report when prior-year outputs are available")
     p.add_argument("--prior-year-root", help="Root folder containing prior-year client directories")
+    p.add_argument("--history-root", action="append", default=[], type=parse_history_root,
+                   help="Prior-year root for the multi-year comparison, repeatable: YEAR=PATH, or a "
+                        "PATH ending in the year (e.g. C:\\TaxClients\\2022)")
+    p.add_argument("--anomaly-pct", type=float, default=20.0,
+                   help="Multi-year comparison: flag changes of at least this percent. Default: 20")
+    p.add_argument("--anomaly-z", type=float, default=3.0,
+                   help="Multi-year comparison: flag values this many standard deviations from prior years. Default: 3")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Worker processes for extracting and parsing a client's documents "
+                        "(0: one per CPU). Default: 1")
     p.add_argument("--enable-azure", action="store_true", help="Enable Azure Document Intelligence for low-confidence W-2s (opt-in)")
     p.add_argument("--azure-endpoint", help="Azure Document Intelligence endpoint URL (default: AZURE_FORM_RECOGNIZER_ENDPOINT env var)")
     p.add_argument("--azure-api-key", help="Azure Document Intelligence API key (default: AZURE_FORM_RECOGNIZER_KEY env var)")
@@ -491,6 +470,15 @@ def parse_args() -> AppConfig:
                    help="Total federal estimated tax payments made (Form 1040-ES). Default: 0")
     p.add_argument("--foreign-tax-credit", type=float, default=0.0,
                    help="Foreign tax credit amount (Form 1116). Default: 0")
+    p.add_argument("--recompute-estimates", action="store_true",
+                   help="Only recompute Tax_Estimate files from existing Data_Extract.json outputs "
+                        "(all clients in one batch) and write Firm_Tax_Summary.csv under --root")
+    p.add_argument("--watch", action="store_true",
+                   help="Keep running and reprocess each client shortly after its documents change")
+    p.add_argument("--watch-debounce", type=float, default=2.0,
+                   help="Watch mode: seconds a client must be quiet before it is reprocessed. Default: 2")
+    p.add_argument("--watch-poll", action="store_true",
+                   help="Watch mode: poll for changes instead of using inotify")
     args = p.parse_args()
 
     import os
@@ -506,11 +494,13 @@ def parse_args() -> AppConfig:
         verbose=args.verbose,
         organize=args.organize,
         organize_dry_run=args.organize_dry_run,
+        organize_rollback=args.organize_rollback,
         taxpayer_name=args.taxpayer_name,
         spouse_name=args.spouse_name,
         spouse_aliases=tuple(args.spouse_alias),
         compare_prior_year=args.compare_prior_year,
         prior_year_root=Path(args.prior_year_root) if args.prior_year_root else None,
+        workers=args.workers,
         enable_azure=args.enable_azure,
         azure_endpoint=azure_endpoint,
         azure_api_key=azure_api_key,
@@ -518,16 +508,54 @@ def parse_args() -> AppConfig:
         num_children=args.num_children,
         estimated_payments=args.estimated_payments,
         foreign_tax_credit=args.foreign_tax_credit,
+        recompute_estimates=args.recompute_estimates,
+        history_roots=tuple(args.history_root),
+        anomaly_pct_threshold=args.anomaly_pct,
+        anomaly_z_threshold=args.anomaly_z,
+        watch=args.watch,
+        watch_debounce=args.watch_debounce,
+        watch_polling=args.watch_poll,
     )
 
 
 def main() -> None:
     config = parse_args()
+    if config.watch:
+        from src.watch import watch
+
+        try:
+            watch(config, debounce=config.watch_debounce, force_polling=config.watch_polling)
+        except KeyboardInterrupt:
+            pass
+        return
     clients = discover_clients(config.root, config.client_filter)
+    if config.organize_rollback:
+        for client_dir in clients:
+            if recover_organization(client_dir, rollback=True) and config.verbose:
+                print(f"Rolled back interrupted organize in {client_dir}")
+        return
+    if config.recompute_estimates:
+        count = recompute_tax_estimates(clients, config)
+        if config.verbose:
+            print(f"Recomputed {count} tax estimates")
+        return
     for client_dir in clients:
         process_client(client_dir, config)
         if config.verbose:
             print(f"Processed {client_dir}")
+    if config.verbose:
+        from src.extract.w2 import w2_template_stats
+
+        stats = w2_template_stats()
+        if stats["hits"] or stats["misses"]:
+            print(
+                f"W-2 layout templates: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['fallbacks']} fallbacks, {stats['templates']} layouts learned"
+            )
+    if config.history_roots:
+        count = write_multi_year_reports(clients, config)
+        if config.verbose:
+            print(f"Multi-year comparison: {count} anomalies")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, fields
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 
@@ -570,6 +571,11 @@ class ScheduleCData:
     extraction_source: str = "local"  # "local" | "azure"
 
 
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> frozenset:
+    return frozenset(f.name for f in fields(cls))
+
+
 @dataclass
 class ExtractionResult:
     w2: List[W2Data] = field(default_factory=list)
@@ -604,3 +610,33 @@ class ExtractionResult:
             "schedule_c": [asdict(item) for item in self.schedule_c],
             "unknown": self.unknown,
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExtractionResult":
+        """Rebuild from to_dict() output (e.g. a saved Data_Extract.json); unknown keys are ignored."""
+        result = cls(unknown=list(data.get("unknown") or []))
+        for key, item_cls in EXTRACT_ITEM_TYPES.items():
+            names = _field_names(item_cls)
+            getattr(result, key).extend(
+                item_cls(**{k: v for k, v in item.items() if k in names})
+                for item in data.get(key) or []
+            )
+        return result
+
+
+# Data_Extract.json list key -> item dataclass (every list except "unknown").
+EXTRACT_ITEM_TYPES: Dict[str, type] = {
+    "w2": W2Data,
+    "brokerage_1099": Brokerage1099Data,
+    "brokerage_1099_trades": Brokerage1099Trade,
+    "form_1098": Form1098Data,
+    "form_1099_nec": Form1099NECData,
+    "form_1099_r": Form1099RData,
+    "form_1099_g": Form1099GData,
+    "form_1099_misc": Form1099MISCData,
+    "form_1098_t": Form1098TData,
+    "form_1099_q": Form1099QData,
+    "form_1099_sa": Form1099SAData,
+    "ssa_1099": FormSSA1099Data,
+    "schedule_c": ScheduleCData,
+}
@@ -0,0 +1,246 @@
+"""
+Longitudinal (multi-year) comparison of extracted client data.
+
+Every numeric field of every document type in the Data_Extract.json schema is
+summed per client and year into one metric (e.g. "w2.box1_wages"); numeric
+dict fields such as b_summary and box12 become one metric per key
+("brokerage_1099.b_summary.wash_sales"). collect_history() reads each year's
+extract once per client and keeps only those sums, as a
+clients x metrics x years array; find_anomalies() then flags the current year
+in one vectorized pass:
+
+  - pct_change  change vs the previous year of at least pct_threshold %
+  - zscore      current value at least z_threshold sample standard deviations
+                from the mean of the prior years (needs two or more priors)
+  - new         no value last year although the client had an extract
+  - dropped     a value last year but none this year
+
+A change smaller than min_change dollars is never flagged.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import re
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.models import EXTRACT_ITEM_TYPES
+
+# Row-level detail that the brokerage_1099 summaries already aggregate.
+_SKIPPED_SECTIONS = frozenset({"brokerage_1099_trades"})
+_SKIPPED_FIELDS = frozenset({"confidence", "year"})
+
+ANOMALY_COLUMNS = ["client", "metric", "year", "value", "prior_year", "prior", "pct_change", "zscore", "reason"]
+
+
+@lru_cache(maxsize=None)
+def _numeric_fields(item_cls: type) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """(float fields, dict fields) of an extract dataclass; annotations are strings here."""
+    scalar, nested = [], []
+    for f in fields(item_cls):
+        if f.name in _SKIPPED_FIELDS:
+            continue
+        annotation = str(f.type)
+        if annotation.startswith("Dict") and "float" in annotation:
+            nested.append(f.name)
+        elif re.fullmatch(r"(Optional\[)?float\]?", annotation):
+            scalar.append(f.name)
+    return tuple(scalar), tuple(nested)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def extract_metrics(extract: Dict[str, Any]) -> Dict[str, float]:
+    """Per-metric totals for one Data_Extract.json; metrics with no numeric value are absent."""
+    totals: Dict[str, float] = {}
+    for section, item_cls in EXTRACT_ITEM_TYPES.items():
+        items = extract.get(section)
+        if section in _SKIPPED_SECTIONS or not isinstance(items, list):
+            continue
+        scalar, nested = _numeric_fields(item_cls)
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            for name in scalar:
+                value = item.get(name)
+                if _is_number(value):
+                    key = f"{section}.{name}"
+                    totals[key] = totals.get(key, 0.0) + float(value)
+            for name in nested:
+                mapping = item.get(name)
+                if not isinstance(mapping, dict):
+                    continue
+                for sub, value in mapping.items():
+                    if _is_number(value):
+                        key = f"{section}.{name}.{sub}"
+                        totals[key] = totals.get(key, 0.0) + float(value)
+    return totals
+
+
+@dataclass
+class MetricHistory:
+    clients: List[str]
+    years: List[int]             # ascending; the last one is the current year
+    metrics: List[str]           # sorted
+    values: np.ndarray           # (clients, metrics, years); NaN = no value
+    has_extract: np.ndarray      # (clients, years) bool
+
+    def series(self, client: str) -> Dict[str, List[Optional[float]]]:
+        """metric -> values by year for one client, metrics with no value at all omitted."""
+        i = self.clients.index(client)
+        out: Dict[str, List[Optional[float]]] = {}
+        for j, metric in enumerate(self.metrics):
+            row = self.values[i, j]
+            if not np.isnan(row).all():
+                out[metric] = [None if np.isnan(v) else float(v) for v in row]
+        return out
+
+
+@dataclass
+class Anomaly:
+    client: str
+    metric: str
+    year: int
+    value: Optional[float]
+    prior_year: int
+    prior: Optional[float]
+    pct_change: Optional[float]
+    zscore: Optional[float]
+    reason: str
+
+    def describe(self) -> str:
+        if self.reason == "new":
+            return f"**{self.metric}** is new this year ({self.value:,.2f}); nothing reported for {self.prior_year}."
+        if self.reason == "dropped":
+            return f"**{self.metric}** was {self.prior:,.2f} in {self.prior_year} but is missing this year."
+        if self.reason == "zscore":
+            return f"**{self.metric}** ({self.value:,.2f}) is {self.zscore:+.1f} standard deviations from prior years."
+        return f"Large year-over-year change in **{self.metric}** ({self.pct_change:+.1f}%)."
+
+
+def load_extract_metrics(path: Path) -> Optional[Dict[str, float]]:
+    """extract_metrics() of a Data_Extract.json, or None if it is missing or unreadable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return extract_metrics(data) if isinstance(data, dict) else None
+
+
+def collect_history(clients: Iterable[str], roots: Dict[int, Path]) -> MetricHistory:
+    """
+    Metric history for clients from {tax_year: root} (the current year's root
+    included). Each root's <client>/_workpapers/Data_Extract.json is read once.
+    """
+    clients = list(clients)
+    years = sorted(roots)
+    per_client: List[List[Optional[Dict[str, float]]]] = [
+        [load_extract_metrics(roots[y] / c / "_workpapers" / "Data_Extract.json") for y in years]
+        for c in clients
+    ]
+    metrics = sorted({m for row in per_client for d in row if d for m in d})
+    col = {m: j for j, m in enumerate(metrics)}
+    values = np.full((len(clients), len(metrics), len(years)), np.nan)
+    has_extract = np.zeros((len(clients), len(years)), dtype=bool)
+    for i, row in enumerate(per_client):
+        for k, d in enumerate(row):
+            if d is None:
+                continue
+            has_extract[i, k] = True
+            for metric, value in d.items():
+                values[i, col[metric], k] = value
+    return MetricHistory(clients, years, metrics, values, has_extract)
+
+
+def find_anomalies(
+    history: MetricHistory,
+    pct_threshold: float = 20.0,
+    z_threshold: float = 3.0,
+    min_change: float = 100.0,
+) -> List[Anomaly]:
+    """Current-year anomalies for every client and metric, ordered by client then metric."""
+    if len(history.years) < 2 or not history.metrics:
+        return []
+    v = history.values
+    cur, prev, priors = v[:, :, -1], v[:, :, -2], v[:, :, :-1]
+    has_cur = history.has_extract[:, -1][:, None]
+    has_prev = history.has_extract[:, -2][:, None]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = cur - prev
+        pct = np.where(prev != 0, delta / np.abs(prev) * 100.0, np.nan)
+        n_priors = (~np.isnan(priors)).sum(axis=2)
+        enough = n_priors >= 2
+        masked = np.where(enough[:, :, None], priors, 0.0)    # avoid empty-slice warnings
+        mean = np.where(enough, np.nanmean(masked, axis=2), np.nan)
+        std = np.where(enough, np.nanstd(masked, axis=2, ddof=1), np.nan)
+        z = np.where(std > 0, (cur - mean) / std, np.nan)
+        reasons = [
+            # (name, mask) in priority order; each cell reports its first hit
+            ("dropped", has_cur & np.isnan(cur) & (np.abs(prev) >= min_change)),
+            ("new", has_prev & np.isnan(prev) & (np.abs(cur) >= min_change)),
+            ("pct_change", (np.abs(pct) >= pct_threshold) & (np.abs(delta) >= min_change)),
+            ("zscore", (np.abs(z) >= z_threshold) & (np.abs(cur - mean) >= min_change)),
+        ]
+    label = np.full(cur.shape, "", dtype=object)
+    for name, mask in reversed(reasons):
+        label[mask] = name
+
+    def _opt(x: float) -> Optional[float]:
+        return None if np.isnan(x) else round(float(x), 4)
+
+    year, prior_year = history.years[-1], history.years[-2]
+    out: List[Anomaly] = []
+    for i, j in zip(*np.nonzero(label != "")):
+        out.append(Anomaly(
+            client=history.clients[i],
+            metric=history.metrics[j],
+            year=year,
+            value=_opt(cur[i, j]),
+            prior_year=prior_year,
+            prior=_opt(prev[i, j]),
+            pct_change=_opt(pct[i, j]),
+            zscore=_opt(z[i, j]),
+            reason=label[i, j],
+        ))
+    return out
+
+
+def generate_history_markdown(client: str, history: MetricHistory, anomalies: List[Anomaly]) -> str:
+    years = history.years
+    lines = [
+        f"# Multi-Year Comparison - {client}",
+        "",
+        f"Years: {', '.join(str(y) for y in years)}",
+        "",
+        "| Metric | " + " | ".join(str(y) for y in years) + " |",
+        "|---|" + "---:|" * len(years),
+    ]
+    for metric, row in history.series(client).items():
+        cells = ["N/A" if v is None else f"{v:,.2f}" for v in row]
+        lines.append(f"| {metric} | " + " | ".join(cells) + " |")
+
+    lines += ["", "## Review flags"]
+    mine = [a for a in anomalies if a.client == client]
+    for a in mine:
+        lines.append(f"- {a.describe()} Verify source docs and return entries.")
+    if not mine:
+        lines.append("- No anomalies detected across the compared years.")
+    return "\n".join(lines)
+
+
+def write_anomaly_table(path: Path, anomalies: List[Anomaly], keep_rows: Iterable[dict] = ()) -> None:
+    """Write anomalies, plus keep_rows (other clients' rows of an earlier table) merged in by client."""
+    rows = list(keep_rows) + [{col: getattr(a, col) for col in ANOMALY_COLUMNS} for a in anomalies]
+    rows.sort(key=lambda r: r["client"])
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=ANOMALY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
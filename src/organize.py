@@ -1,12 +1,32 @@
+"""
+Sorting a client's intake documents into owner/form folders.
+
+organize_client_documents() runs in two phases. plan_organization() lists
+the client folder once and works out every destination in memory, including
+the _1, _2, ... suffixes for names already taken. apply_organization() then
+writes the plan to a journal in _workpapers/, hardlinks every file into its
+destination, unlinks the sources, and deletes the journal. The original
+names stay valid until every new name exists. A crash leaves the journal
+behind. The next organize run finishes the interrupted one, and
+recover_organization(rollback=True) undoes it instead. Each step of both
+is derived from what is on disk, so recovery can itself be interrupted and
+rerun.
+"""
 from __future__ import annotations
 
+import errno
+import json
+import os
 import shutil
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Optional
 
-from src.classify import classify_document
+from src.classify import ClassifiedFile, classify_file
 from src.config import SUPPORTED_EXTENSIONS
+from src.extract.generic_pdf import cache_document
 
 
 @dataclass(frozen=True)
@@ -20,19 +40,23 @@ def _normalize_token(value: str) -> str:
     return "".join(ch for ch in value.lower() if ch.isalnum())
 
 
-def detect_owner_from_name(file_name: str, context: OwnerContext) -> str:
-    normalized = _normalize_token(file_name)
-
+@lru_cache(maxsize=64)
+def _owner_tokens(context: OwnerContext) -> tuple[frozenset[str], frozenset[str]]:
     def name_tokens(full_name: Optional[str]) -> list[str]:
         if not full_name:
             return []
         parts = [p for p in full_name.replace("_", " ").split() if p]
         return [_normalize_token(p) for p in parts] + [_normalize_token(full_name)]
 
-    taxpayer_tokens = set(name_tokens(context.taxpayer_name))
     spouse_tokens = set(name_tokens(context.spouse_name))
     for alias in context.spouse_aliases:
         spouse_tokens.update(name_tokens(alias))
+    return frozenset(name_tokens(context.taxpayer_name)), frozenset(spouse_tokens)
+
+
+def detect_owner_from_name(file_name: str, context: OwnerContext) -> str:
+    normalized = _normalize_token(file_name)
+    taxpayer_tokens, spouse_tokens = _owner_tokens(context)
 
     has_taxpayer = any(token and token in normalized for token in taxpayer_tokens)
     has_spouse = any(token and token in normalized for token in spouse_tokens)
@@ -46,14 +70,28 @@ def detect_owner_from_name(file_name: str, context: OwnerContext) -> str:
     return "Unsorted"
 
 
-def _iter_input_files(client_dir: Path) -> Iterable[Path]:
-    skip_roots = {"_workpapers", "01_Taxpayer", "02_Spouse", "03_Joint", "04_Unsorted"}
-    for path in client_dir.rglob("*"):
-        if not path.is_file() or path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            continue
-        if any(part in skip_roots for part in path.parts):
-            continue
-        yield path
+_SKIP_ROOTS = {"_workpapers", "01_Taxpayer", "02_Spouse", "03_Joint", "04_Unsorted"}
+
+_JOURNAL_NAME = "Organization_Journal.json"
+
+
+def _list_client_files(client_dir: Path) -> tuple[list[Path], set[str]]:
+    """
+    One walk of client_dir: the files to organize (supported types outside
+    the owner folders and _workpapers), and the normcase'd path of every
+    file, for collision checks.
+    """
+    inputs: list[Path] = []
+    existing: set[str] = set()
+    for dirpath, _dirnames, filenames in os.walk(client_dir):
+        rel_parts = Path(dirpath).relative_to(client_dir).parts
+        is_input_dir = not any(part in _SKIP_ROOTS for part in rel_parts)
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            existing.add(os.path.normcase(path))
+            if is_input_dir and os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                inputs.append(Path(path))
+    return sorted(inputs), existing
 
 
 def _doc_bucket(doc_type: str) -> str:
@@ -61,6 +99,16 @@ def _doc_bucket(doc_type: str) -> str:
         "w2": "W2",
         "brokerage_1099": "Brokerage_1099",
         "form_1098": "Form_1098",
+        "form_1098_t": "Form_1098_T",
+        "form_1099_nec": "Form_1099_NEC",
+        "form_1099_r": "Form_1099_R",
+        "form_1099_g": "Form_1099_G",
+        "form_1099_misc": "Form_1099_MISC",
+        "form_1099_q": "Form_1099_Q",
+        "form_1099_sa": "Form_1099_SA",
+        "ssa_1099": "SSA_1099",
+        "schedule_c": "Schedule_C",
+        "prior_year_return": "Prior_Year_Return",
     }.get(doc_type, "Other")
 
 
@@ -72,27 +120,170 @@ def _owner_bucket(owner: str) -> str:
     }.get(owner, "04_Unsorted")
 
 
-def organize_client_documents(client_dir: Path, context: OwnerContext, dry_run: bool = False) -> list[dict[str, str]]:
+def _classify(path: Path, enable_ocr: bool) -> Optional[ClassifiedFile]:
+    try:
+        return classify_file(path, enable_ocr)
+    except Exception:
+        return None
+
+
+def _classify_files(files: list[Path], enable_ocr: bool, workers: int) -> list[str]:
+    """
+    Doc type of each file from its extracted text, in order. The extractions
+    land in the shared document cache, so the process_client() run that
+    follows does not extract the files again. workers=1 classifies in-process
+    without a pool; 0 means one worker per CPU.
+    """
+    max_workers = min(workers or os.cpu_count() or 1, len(files))
+    if max_workers <= 1:
+        results = [_classify(path, enable_ocr) for path in files]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_classify, files, repeat(enable_ocr)))
+        for path, result in zip(files, results):
+            if result is not None and result.doc is not None:
+                cache_document(path, enable_ocr, result.doc, result.notes)
+    return [result.doc_type if result is not None else "unknown" for result in results]
+
+
+def plan_organization(
+    client_dir: Path,
+    context: OwnerContext,
+    enable_ocr: bool = False,
+    workers: int = 1,
+) -> list[dict[str, str]]:
+    """Where each intake file goes, as Organization_Log rows; touches nothing on disk."""
+    files, taken = _list_client_files(client_dir)
     operations: list[dict[str, str]] = []
-    for file_path in sorted(_iter_input_files(client_dir)):
-        doc_type, _, _ = classify_document(file_path, "")
+    for file_path, doc_type in zip(files, _classify_files(files, enable_ocr, workers)):
         owner = detect_owner_from_name(file_path.name, context)
         destination_dir = client_dir / _owner_bucket(owner) / _doc_bucket(doc_type)
-        destination_dir.mkdir(parents=True, exist_ok=True)
         destination = destination_dir / file_path.name
-
-        if destination.exists() and destination.resolve() != file_path.resolve():
+        if os.path.normcase(destination) in taken:
             stem, suffix = file_path.stem, file_path.suffix
             i = 1
-            while True:
-                candidate = destination_dir / f"{stem}_{i}{suffix}"
-                if not candidate.exists():
-                    destination = candidate
-                    break
+            while os.path.normcase(destination_dir / f"{stem}_{i}{suffix}") in taken:
                 i += 1
-
+            destination = destination_dir / f"{stem}_{i}{suffix}"
+        taken.add(os.path.normcase(destination))
         operations.append({"source": str(file_path), "destination": str(destination), "doc_type": doc_type, "owner": owner})
-        if not dry_run and destination.resolve() != file_path.resolve():
-            shutil.move(str(file_path), str(destination))
+    return operations
+
+
+def _journal_path(client_dir: Path) -> Path:
+    return client_dir / "_workpapers" / _JOURNAL_NAME
+
+
+# os.link() errors meaning the volume cannot hardlink this file (FAT/exFAT,
+# some network shares, cross-device); Windows reports FAT as EINVAL.
+_NO_HARDLINK_ERRNOS = frozenset(
+    getattr(errno, name) for name in ("EPERM", "EXDEV", "EMLINK", "EINVAL", "ENOSYS", "ENOTSUP", "EOPNOTSUPP")
+    if hasattr(errno, name)
+)
+
+
+def _link_or_move(source: Path, destination: Path) -> None:
+    try:
+        os.link(source, destination)
+    except OSError as exc:
+        # Anything else, notably an existing destination, must not be
+        # retried as a move: shutil.move() would overwrite it.
+        if exc.errno not in _NO_HARDLINK_ERRNOS:
+            raise
+        # No hardlinks here: move in one step.
+        shutil.move(str(source), str(destination))
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _roll_forward(moves: list[tuple[Path, Path]]) -> None:
+    for directory in {destination.parent for _, destination in moves}:
+        directory.mkdir(parents=True, exist_ok=True)
+    for source, destination in moves:
+        if os.path.lexists(source) and not os.path.lexists(destination):
+            _link_or_move(source, destination)
+    for source, destination in moves:
+        if os.path.lexists(source) and _same_file(source, destination):
+            os.unlink(source)
+
+
+def _roll_back(moves: list[tuple[Path, Path]]) -> None:
+    for source, destination in moves:
+        if os.path.lexists(destination) and not os.path.lexists(source):
+            source.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_move(destination, source)
+    for source, destination in moves:
+        if os.path.lexists(destination) and _same_file(source, destination):
+            os.unlink(destination)
+
+
+def _read_journal(client_dir: Path) -> Optional[list[tuple[Path, Path]]]:
+    try:
+        entries = json.loads(_journal_path(client_dir).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    return [(client_dir / src, client_dir / dst) for src, dst in entries]
+
+
+def _write_journal(client_dir: Path, moves: list[tuple[Path, Path]]) -> None:
+    path = _journal_path(client_dir)
+    path.parent.mkdir(exist_ok=True)
+    entries = [[str(src.relative_to(client_dir)), str(dst.relative_to(client_dir))] for src, dst in moves]
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(entries, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def apply_organization(client_dir: Path, operations: list[dict[str, str]]) -> None:
+    """Carry out a plan_organization() plan under a journal."""
+    moves = [
+        (Path(op["source"]), Path(op["destination"]))
+        for op in operations
+        if os.path.normcase(op["source"]) != os.path.normcase(op["destination"])
+    ]
+    if not moves:
+        return
+    _write_journal(client_dir, moves)
+    _roll_forward(moves)
+    _journal_path(client_dir).unlink()
+
+
+def recover_organization(client_dir: Path, rollback: bool = False) -> bool:
+    """
+    Finish an organize run that was interrupted, or with rollback=True put
+    every file back where it was. False when there was nothing to recover.
+    """
+    moves = _read_journal(client_dir)
+    if moves is None:
+        return False
+    if rollback:
+        _roll_back(moves)
+    else:
+        _roll_forward(moves)
+    _journal_path(client_dir).unlink()
+    return True
+
 
+def organize_client_documents(
+    client_dir: Path,
+    context: OwnerContext,
+    dry_run: bool = False,
+    enable_ocr: bool = False,
+    workers: int = 1,
+) -> list[dict[str, str]]:
+    if not dry_run:
+        recover_organization(client_dir)
+    operations = plan_organization(client_dir, context, enable_ocr, workers)
+    if not dry_run:
+        apply_organization(client_dir, operations)
     return operations
@@ -0,0 +1,291 @@
+"""
+Marginal-rate and breakpoint analysis for tax planning.
+
+analyze_marginal_rates() treats total federal tax as a function of one income
+dimension (e.g. "extra long-term gains" or "extra wages") for one client and
+walks it from one breakpoint to the next. Every threshold the estimator
+applies — ordinary brackets, LTCG 0/15% band tops, SS taxability tiers, NIIT,
+QBI limits, SE wage base, CTC phase-out, credit limits — is tracked as an
+intermediate quantity that is linear in the dimension between breakpoints, so
+the next crossing is solved directly instead of found by sampling.
+
+Evaluation runs on the vectorized engine in tax_scenarios, so every figure
+matches calculate_tax() for the same inputs. Positions are in whole cents.
+Inside the Child Tax Credit phase-out window tax also steps by $50 at every
+$1,000 of AGI; only the window's start and end are reported as breakpoints.
+
+    a = analyze_marginal_rates(extraction, "long_term_cap_gains", filing_status="mfj", tax_year=2024)
+    a.marginal_rate      # rate on the next dollar of LTCG
+    a.headroom()         # [(labels, dollars until that breakpoint), ...]
+    a.curve              # [{"delta", "income", "total_tax"}, ...] for charting
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models import ExtractionResult
+from src.tax_calculator import TaxEstimate, _get_table
+from src.tax_scenarios import (
+    _FILING_STATUSES,
+    _INCOME_FIELDS,
+    _compute,
+    _document_totals,
+    _status_index,
+)
+
+# Analysable dimensions -> weights on the income fields. Qualified dividends
+# are also ordinary dividends, so that dimension moves both.
+DIMENSIONS: Dict[str, Dict[str, float]] = {
+    **{name: {name: 1.0} for name in _INCOME_FIELDS if name != "qualified_dividends"},
+    "qualified_dividends": {"ordinary_dividends": 1.0, "qualified_dividends": 1.0},
+}
+
+_CENT = 0.01
+_MAX_BREAKPOINTS = 500
+
+
+@dataclass
+class Breakpoint:
+    delta: float                 # change in the dimension from today's amount
+    income: float                # dimension amount at the breakpoint
+    labels: List[str]
+    rate_before: float
+    rate_after: float
+    step: float                  # jump in tax at the breakpoint itself (CTC phase-out), else 0
+    total_tax: float
+
+
+@dataclass
+class MarginalAnalysis:
+    dimension: str
+    tax_year: int
+    filing_status: str
+    base_income: float           # today's amount of the dimension
+    base_total_tax: float
+    marginal_rate: float         # rate on the next dollar from today
+    breakpoints: List[Breakpoint] = field(default_factory=list)
+    curve: List[Dict[str, float]] = field(default_factory=list)
+
+    def headroom(self) -> List[Tuple[List[str], float]]:
+        """Dollars of additional income until each upcoming breakpoint."""
+        return [(bp.labels, bp.delta) for bp in self.breakpoints if bp.delta > 0]
+
+    def to_dict(self) -> Dict:
+        return {
+            "dimension": self.dimension,
+            "tax_year": self.tax_year,
+            "filing_status": self.filing_status,
+            "base_income": self.base_income,
+            "base_total_tax": self.base_total_tax,
+            "marginal_rate": self.marginal_rate,
+            "breakpoints": [bp.__dict__ for bp in self.breakpoints],
+            "curve": self.curve,
+        }
+
+
+class _Evaluator:
+    """Runs the vector engine for one client at arbitrary offsets along a dimension."""
+
+    def __init__(self, result: ExtractionResult, dimension: str, fs: str, num_children: int,
+                 estimated_payments: float, foreign_tax_credit: float, tax_year: int):
+        self.base = TaxEstimate(filing_status=fs, tax_year=tax_year)
+        self.totals = _document_totals(result, self.base, [])
+        self.weights = DIMENSIONS[dimension]
+        self.fs_index = _FILING_STATUSES.index(fs)
+        self.table = _get_table(tax_year, fs)
+        self.num_children = num_children
+        self.estimated_payments = estimated_payments
+        self.foreign_tax_credit = foreign_tax_credit
+        self.tax_year = tax_year
+
+    def __call__(self, xs: np.ndarray) -> Dict[str, np.ndarray]:
+        n = len(xs)
+        inputs = {name: np.full(n, value) for name, value in self.totals.items()}
+        for name in _INCOME_FIELDS:
+            inputs[name] = getattr(self.base, name) + xs * self.weights.get(name, 0.0)
+        cols = _compute(
+            inputs,
+            np.full(n, self.fs_index, dtype=np.intp),
+            np.full(n, float(self.num_children)),
+            np.full(n, float(self.estimated_payments)),
+            np.full(n, float(self.foreign_tax_credit)),
+            self.tax_year,
+        )
+        cols["rents"] = inputs["rents"]
+        return cols
+
+    def monitored(self, cols: Dict[str, np.ndarray]) -> List[Tuple[str, np.ndarray, float]]:
+        """(label, quantity, threshold) for every kink/step the estimator can hit."""
+        t = self.table
+        agi = cols["agi"]
+        ordinary = cols["ordinary_income_for_brackets"]
+        stacked = ordinary + cols["preferred_income"]
+        preferred_max = cols["qualified_dividends"] + np.maximum(0.0, cols["long_term_cap_gains"])
+        agi_before_ss = cols["total_income"] - cols["ss_benefits_taxable"] - cols["se_tax_deduction"] \
+            - cols["other_adjustments"]
+        ss = cols["ss_benefits_gross"]
+        combined = agi_before_ss + ss * 0.50
+        net_inv = (cols["taxable_interest"] + cols["ordinary_dividends"] + cols["long_term_cap_gains"]
+                   + cols["short_term_cap_gains"] + cols["rents"])
+        sched_c = cols["schedule_c_net"]
+        taxable_before_qbi = np.maximum(0.0, agi - cols["deduction_used"])
+        qbi_room = taxable_before_qbi - preferred_max
+        before_credits = cols["total_tax_before_credits"]
+
+        mons: List[Tuple[str, np.ndarray, float]] = [
+            ("Long-term gains cross zero", cols["long_term_cap_gains"], 0.0),
+            ("Schedule C crosses zero", sched_c, 0.0),
+            ("SE earnings reach the Social Security wage base", sched_c * 0.9235, t.se_ss_wage_base),
+            ("AGI reaches zero", cols["total_income"] - cols["se_tax_deduction"] - cols["other_adjustments"], 0.0),
+            ("Taxable income reaches zero", agi - cols["deduction_used"] - cols["qbi_deduction"], 0.0),
+            ("QBI deduction limited by taxable income", sched_c * 0.20 - np.maximum(0.0, qbi_room) * 0.20, 0.0),
+            ("QBI taxable-income limit reaches zero", qbi_room, 0.0),
+            ("Preferred income limited by taxable income", preferred_max - cols["taxable_income"], 0.0),
+            (f"Ordinary income fills the LTCG 0% band (${t.ltcg_zero_top:,.0f})", ordinary, t.ltcg_zero_top),
+            (f"Ordinary income fills the LTCG 15% band (${t.ltcg_fifteen_top:,.0f})", ordinary, t.ltcg_fifteen_top),
+            (f"Taxable income reaches the top of the LTCG 0% band (${t.ltcg_zero_top:,.0f})",
+             stacked, t.ltcg_zero_top),
+            (f"Taxable income reaches the top of the LTCG 15% band (${t.ltcg_fifteen_top:,.0f})",
+             stacked, t.ltcg_fifteen_top),
+            (f"AGI reaches the NIIT threshold (${t.niit_threshold:,.0f})", agi, t.niit_threshold),
+            ("NIIT base switches between investment income and excess AGI",
+             net_inv - (agi - t.niit_threshold), 0.0),
+            ("Net investment income crosses zero", net_inv, 0.0),
+            ("Foreign tax credit limited by tax",
+             cols["foreign_tax_credit"] - np.maximum(0.0, before_credits - cols["child_tax_credit"]), 0.0),
+            ("Total tax reaches zero", before_credits - cols["total_credits"], 0.0),
+        ]
+        for floor, rate in zip(t.floors[1:], t.rates[1:]):
+            mons.append((f"Ordinary income enters the {rate:.0%} bracket (${floor:,.0f})", ordinary, floor))
+
+        if self.fs_index != _FILING_STATUSES.index("mfs"):
+            mons += [
+                (f"SS benefits start to become taxable (combined income ${t.ss_low:,.0f})", combined, t.ss_low),
+                (f"SS taxability moves to the 85% tier (combined income ${t.ss_high:,.0f})", combined, t.ss_high),
+                ("Taxable SS reaches 50% of benefits", (combined - t.ss_low) * 0.50 - ss * 0.50, 0.0),
+                ("Taxable SS reaches 85% of benefits",
+                 (t.ss_high - t.ss_low) * 0.50 + (combined - t.ss_high) * 0.85 - ss * 0.85, 0.0),
+            ]
+
+        if self.num_children > 0:
+            ctc_max = self.num_children * t.ctc_per_child
+            # -$50 at each full $1,000 of AGI over the threshold until the credit is gone
+            first_step = t.ctc_phase_out + 1_000
+            fully_out = t.ctc_phase_out + math.ceil(ctc_max / 50.0) * 1_000
+            mons += [
+                (f"Child Tax Credit starts phasing out (AGI ${first_step:,.0f})", agi, first_step),
+                (f"Child Tax Credit fully phased out (AGI ${fully_out:,.0f})", agi, fully_out),
+                ("Child Tax Credit limited by tax",
+                 np.maximum(0.0, ctc_max - np.floor_divide(np.maximum(0.0, agi - t.ctc_phase_out), 1_000) * 50.0)
+                 - before_credits, 0.0),
+            ]
+        return mons
+
+
+def _to_cent_at_or_after(x: float) -> float:
+    cents = x * 100
+    nearest = round(cents)
+    if abs(cents - nearest) < 1e-6:
+        return nearest / 100
+    return math.ceil(cents) / 100
+
+
+def analyze_marginal_rates(
+    result: ExtractionResult,
+    dimension: str,
+    filing_status: str = "single",
+    num_children: int = 0,
+    estimated_payments: float = 0.0,
+    foreign_tax_credit: float = 0.0,
+    tax_year: int = 2025,
+    lower: Optional[float] = None,
+    upper: float = 500_000.0,
+) -> MarginalAnalysis:
+    """
+    Breakpoints of total tax along one income dimension (see DIMENSIONS).
+
+    lower/upper bound the change in the dimension; lower defaults to removing
+    all of today's (positive) amount.
+    """
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown dimension {dimension!r}; expected one of {', '.join(sorted(DIMENSIONS))}")
+    fs = _FILING_STATUSES[_status_index(filing_status)]
+    evaluate = _Evaluator(result, dimension, fs, num_children, estimated_payments, foreign_tax_credit, tax_year)
+    base_income = float(getattr(evaluate.base, dimension))
+    if lower is None:
+        lower = -max(0.0, base_income)
+    if upper <= lower:
+        raise ValueError("upper must be greater than lower")
+
+    # Walk the segments: within one, every monitored quantity is linear in x,
+    # so its crossing is solved from its value and slope at the segment start.
+    points: List[Tuple[float, List[str]]] = []
+    x = _to_cent_at_or_after(lower)
+    while len(points) < _MAX_BREAKPOINTS:
+        cols = evaluate(np.array([x, x + _CENT]))
+        best, labels = upper, []
+        for label, q, threshold in evaluate.monitored(cols):
+            slope = (q[1] - q[0]) / _CENT
+            if abs(slope) < 1e-9:
+                continue
+            crossing = x + (threshold - q[0]) / slope
+            if crossing <= x + _CENT / 2:
+                continue
+            crossing = _to_cent_at_or_after(crossing)
+            if crossing < best - _CENT / 2:
+                best, labels = crossing, [label]
+            elif abs(crossing - best) <= _CENT / 2 and label not in labels:
+                labels.append(label)
+        if best >= upper:
+            break
+        points.append((best, labels))
+        x = best
+
+    # One vector evaluation for the curve and the rates either side of each point.
+    # A crossing lies within the cent before its point, so the rate before it
+    # is measured one cent further back and any remainder is a step.
+    xs = np.array([lower] + [p for p, _ in points] + [upper, 0.0])
+    probes = evaluate(np.concatenate([xs, xs + _CENT, xs - _CENT, xs - 2 * _CENT]))["total_tax"]
+    n = len(xs)
+    tax, tax_up, tax_down, tax_down2 = (probes[i * n:(i + 1) * n] for i in range(4))
+    rate_after = np.round((tax_up - tax) / _CENT, 4)
+    rate_before = np.round((tax_down - tax_down2) / _CENT, 4)
+    steps = np.round(tax - tax_down - rate_before * _CENT, 2)
+
+    analysis = MarginalAnalysis(
+        dimension=dimension,
+        tax_year=tax_year,
+        filing_status=fs,
+        base_income=base_income,
+        base_total_tax=float(tax[-1]),
+        marginal_rate=float(rate_after[-1]),
+    )
+    keep = [0]
+    for i, (delta, labels) in enumerate(points, start=1):
+        # Thresholds the client's figures cross without effect (e.g. SS tiers
+        # with no benefits) leave the rate unchanged: not a breakpoint.
+        if rate_before[i] == rate_after[i] and steps[i] == 0:
+            continue
+        keep.append(i)
+        analysis.breakpoints.append(Breakpoint(
+            delta=delta,
+            income=round(base_income + delta, 2),
+            labels=labels,
+            rate_before=float(rate_before[i]),
+            rate_after=float(rate_after[i]),
+            step=float(steps[i]) + 0.0,   # no "-0.0"
+            total_tax=round(float(tax[i]), 2),
+        ))
+    keep.append(n - 2)
+    if lower < 0.0 < upper:
+        keep.append(n - 1)   # today's position
+    analysis.curve = sorted(
+        ({"delta": float(xs[i]), "income": round(base_income + float(xs[i]), 2),
+          "total_tax": round(float(tax[i]), 2)} for i in keep),
+        key=lambda point: point["delta"],
+    )
+    return analysis
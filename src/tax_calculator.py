@@ -6,7 +6,8 @@ This is an estimate only — a licensed tax professional must review all returns
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field, asdict
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -145,6 +146,89 @@ _FILING_STATUS_LABELS = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Compiled tax tables
+# ---------------------------------------------------------------------------
+#
+# _CONSTANTS stays the source of truth. At import it is flattened into one
+# immutable record per (year, filing status) so calculate_tax reads plain
+# attributes instead of walking nested dicts, and bracket tax is a bisect
+# plus one multiply-add using the cumulative tax at each bracket floor.
+
+@dataclass(frozen=True)
+class _TaxTable:
+    __slots__ = (
+        "tax_year", "filing_status", "floors", "rates", "floor_tax",
+        "standard_deduction", "ltcg_zero_top", "ltcg_fifteen_top", "salt_cap",
+        "ctc_phase_out", "ctc_per_child", "niit_threshold", "se_ss_wage_base",
+        "ss_low", "ss_high",
+    )
+    tax_year: int
+    filing_status: str
+    floors: Tuple[float, ...]        # bracket floors, ascending, floors[0] == 0
+    rates: Tuple[float, ...]
+    floor_tax: Tuple[float, ...]     # tax on income exactly at each floor
+    standard_deduction: float
+    ltcg_zero_top: float
+    ltcg_fifteen_top: float
+    salt_cap: float
+    ctc_phase_out: float
+    ctc_per_child: float
+    niit_threshold: float
+    se_ss_wage_base: float
+    ss_low: float
+    ss_high: float
+
+    def bracket_tax(self, income: float) -> float:
+        """Same result as _compute_bracket_tax(income, brackets) for this status."""
+        i = bisect_left(self.floors, income) - 1   # highest floor strictly below income
+        if i < 0:
+            return 0.0
+        return self.floor_tax[i] + (income - self.floors[i]) * self.rates[i]
+
+
+def _compile_table(year: int, fs: str, c: Dict) -> _TaxTable:
+    brackets = c["brackets"][fs]
+    floors = tuple(float(t) for t, _ in brackets)
+    rates = tuple(r for _, r in brackets)
+    # Accumulate in bracket order, as _compute_bracket_tax does, so results match exactly
+    floor_tax = [0.0]
+    for i in range(1, len(brackets)):
+        floor_tax.append(floor_tax[-1] + (brackets[i][0] - brackets[i - 1][0]) * rates[i - 1])
+    zero_top, fifteen_top = c["ltcg_thresholds"][fs]
+    ss_low, ss_high = _SS_THRESHOLDS.get(fs, (25_000.0, 34_000.0))
+    return _TaxTable(
+        tax_year=year,
+        filing_status=fs,
+        floors=floors,
+        rates=rates,
+        floor_tax=tuple(floor_tax),
+        standard_deduction=c["standard_deductions"][fs],
+        ltcg_zero_top=zero_top,
+        ltcg_fifteen_top=fifteen_top,
+        salt_cap=c["salt_cap"][fs],
+        ctc_phase_out=c["ctc_phase_out"][fs],
+        ctc_per_child=c["ctc_per_child"],
+        niit_threshold=c["niit_threshold"][fs],
+        se_ss_wage_base=c["se_ss_wage_base"],
+        ss_low=ss_low,
+        ss_high=ss_high,
+    )
+
+
+_TABLES: Dict[Tuple[int, str], _TaxTable] = {
+    (year, fs): _compile_table(year, fs, c)
+    for year, c in _CONSTANTS.items()
+    for fs in c["standard_deductions"]
+}
+
+
+def _get_table(year: int, filing_status: str) -> _TaxTable:
+    """Compiled table for (year, filing status); unknown years fall back to 2025 like _get_constants."""
+    table = _TABLES.get((year, filing_status))
+    return table if table is not None else _TABLES[(2025, filing_status)]
+
+
 # ---------------------------------------------------------------------------
 # Result dataclass
 # ---------------------------------------------------------------------------
@@ -295,34 +379,8 @@ def _compute_se_tax(net_se_income: float, ss_wage_base: float) -> Tuple[float, f
     return se_tax, se_tax * 0.50
 
 
-# ---------------------------------------------------------------------------
-# Main calculation function
-# ---------------------------------------------------------------------------
-
-def calculate_tax(
-    result: ExtractionResult,
-    filing_status: str = "single",
-    num_children: int = 0,
-    estimated_payments: float = 0.0,
-    foreign_tax_credit: float = 0.0,
-    tax_year: int = 2025,
-) -> TaxEstimate:
-    """
-    Compute a federal income tax estimate from extracted document data.
-    Returns a TaxEstimate with all intermediate line items.
-    """
-    fs = filing_status.lower().strip()
-    if fs not in _CONSTANTS[2025]["standard_deductions"]:
-        fs = "single"
-
-    c = _get_constants(tax_year)
-    est = TaxEstimate(filing_status=fs, tax_year=tax_year)
-    notes: List[str] = []
-
-    # -------------------------------------------------------------------
-    # 1. Aggregate income from all extracted documents
-    # -------------------------------------------------------------------
-
+def _aggregate_documents(result: ExtractionResult, est: TaxEstimate, notes: List[str]) -> None:
+    """Sum income and withholding from every extracted document into est."""
     for w2 in result.w2:
         est.w2_wages += w2.box1_wages or 0.0
         est.w2_withholding += w2.box2_fed_withholding or 0.0
@@ -378,10 +436,40 @@ def calculate_tax(
         est.other_income += (m.box1_rents or 0.0) + (m.box2_royalties or 0.0) + (m.box3_other_income or 0.0)
         est.other_withholding += m.box4_fed_withholding or 0.0
 
+
+# ---------------------------------------------------------------------------
+# Main calculation function
+# ---------------------------------------------------------------------------
+
+def calculate_tax(
+    result: ExtractionResult,
+    filing_status: str = "single",
+    num_children: int = 0,
+    estimated_payments: float = 0.0,
+    foreign_tax_credit: float = 0.0,
+    tax_year: int = 2025,
+) -> TaxEstimate:
+    """
+    Compute a federal income tax estimate from extracted document data.
+    Returns a TaxEstimate with all intermediate line items.
+    """
+    fs = filing_status.lower().strip()
+    if fs not in _CONSTANTS[2025]["standard_deductions"]:
+        fs = "single"
+
+    t = _get_table(tax_year, fs)
+    est = TaxEstimate(filing_status=fs, tax_year=tax_year)
+    notes: List[str] = []
+
+    # -------------------------------------------------------------------
+    # 1. Aggregate income from all extracted documents
+    # -------------------------------------------------------------------
+    _aggregate_documents(result, est, notes)
+
     # -------------------------------------------------------------------
     # 2. SE tax (needed before AGI for the half-SE deduction)
     # -------------------------------------------------------------------
-    se_tax, se_deduction = _compute_se_tax(est.schedule_c_net, c["se_ss_wage_base"])
+    se_tax, se_deduction = _compute_se_tax(est.schedule_c_net, t.se_ss_wage_base)
     est.se_tax = se_tax
     est.se_tax_deduction = se_deduction
 
@@ -403,13 +491,6 @@ def calculate_tax(
     )
     est.ss_benefits_taxable = _compute_ss_taxable(agi_before_ss, est.ss_benefits_gross, fs)
 
-    if est.ss_benefits_gross > 0:
-        pct = (est.ss_benefits_taxable / est.ss_benefits_gross * 100) if est.ss_benefits_gross else 0
-        notes.append(
-            f"Social Security: ${est.ss_benefits_gross:,.0f} gross; "
-            f"${est.ss_benefits_taxable:,.0f} ({pct:.0f}%) estimated as taxable."
-        )
-
     # -------------------------------------------------------------------
     # 4. Total income and AGI
     # -------------------------------------------------------------------
@@ -430,29 +511,19 @@ def calculate_tax(
     # -------------------------------------------------------------------
     # 5. Deductions (standard vs. itemized)
     # -------------------------------------------------------------------
-    std_ded = c["standard_deductions"][fs]
+    std_ded = t.standard_deduction
     est.standard_deduction = std_ded
 
     mortgage_interest = sum(f.mortgage_interest_received or 0.0 for f in result.form_1098)
     real_estate_taxes = sum(f.real_estate_taxes or 0.0 for f in result.form_1098)
     state_taxes = sum(w2.box17_state_tax or 0.0 for w2 in result.w2)
     salt_raw = state_taxes + real_estate_taxes
-    salt = min(salt_raw, c["salt_cap"][fs])
+    salt = min(salt_raw, t.salt_cap)
     est.itemized_deduction = mortgage_interest + salt
 
     if est.itemized_deduction > std_ded:
         est.deduction_used = est.itemized_deduction
         est.deduction_type = "itemized"
-        notes.append(
-            f"Using itemized deductions (${est.itemized_deduction:,.0f}) vs. "
-            f"standard deduction (${std_ded:,.0f}). "
-            "Add charitable contributions and other items to verify."
-        )
-        if salt_raw > c["salt_cap"][fs]:
-            notes.append(
-                f"SALT capped at ${c['salt_cap'][fs]:,.0f} "
-                f"(actual SALT was ${salt_raw:,.0f})."
-            )
     else:
         est.deduction_used = std_ded
         est.deduction_type = "standard"
@@ -463,32 +534,27 @@ def calculate_tax(
         # Limited to 20% of (taxable income minus preferred income)
         qbi_limit = max(0.0, taxable_before_qbi - (est.qualified_dividends + max(0.0, est.long_term_cap_gains))) * 0.20
         est.qbi_deduction = min(est.schedule_c_net * 0.20, qbi_limit)
-        notes.append(
-            f"Section 199A QBI deduction estimated at ${est.qbi_deduction:,.0f} "
-            "(simplified 20% of business income, subject to taxable income limit). "
-            "May be further limited by W-2 wages, UBIA, or SSTB rules."
-        )
 
     est.taxable_income = max(0.0, est.agi - est.deduction_used - est.qbi_deduction)
 
     # -------------------------------------------------------------------
     # 6. Tax computation
     # -------------------------------------------------------------------
-    ltcg_thresholds = c["ltcg_thresholds"][fs]
     net_ltcg = max(0.0, est.long_term_cap_gains)
     est.preferred_income = min(est.qualified_dividends + net_ltcg, est.taxable_income)
     est.ordinary_income_for_brackets = max(0.0, est.taxable_income - est.preferred_income)
 
-    est.regular_tax = _compute_bracket_tax(est.ordinary_income_for_brackets, c["brackets"][fs])
+    est.regular_tax = t.bracket_tax(est.ordinary_income_for_brackets)
     est.ltcg_tax = _compute_ltcg_tax(
         est.ordinary_income_for_brackets,
         est.preferred_income,
-        ltcg_thresholds[0],
-        ltcg_thresholds[1],
+        t.ltcg_zero_top,
+        t.ltcg_fifteen_top,
     )
 
     # Net Investment Income Tax (3.8%)
-    niit_threshold = c["niit_threshold"][fs]
+    niit_threshold = t.niit_threshold
+    niit_base = 0.0
     if est.agi > niit_threshold:
         net_inv_income = (
             est.taxable_interest
@@ -499,8 +565,6 @@ def calculate_tax(
         )
         niit_base = min(max(0.0, net_inv_income), est.agi - niit_threshold)
         est.niit = niit_base * 0.038
-        if est.niit > 0:
-            notes.append(f"Net Investment Income Tax: ${est.niit:,.0f} (3.8% on ${niit_base:,.0f}).")
 
     est.total_tax_before_credits = est.regular_tax + est.ltcg_tax + est.niit + est.se_tax
 
@@ -508,8 +572,8 @@ def calculate_tax(
     # 7. Credits
     # -------------------------------------------------------------------
     if num_children > 0:
-        ctc_max = num_children * c["ctc_per_child"]
-        phase_out_start = c["ctc_phase_out"][fs]
+        ctc_max = num_children * t.ctc_per_child
+        phase_out_start = t.ctc_phase_out
         excess = max(0.0, est.agi - phase_out_start)
         phase_out = (excess // 1_000) * 50.0
         est.child_tax_credit = min(max(0.0, ctc_max - phase_out), est.total_tax_before_credits)
@@ -531,18 +595,61 @@ def calculate_tax(
     # -------------------------------------------------------------------
     # 9. Final notes
     # -------------------------------------------------------------------
+    _append_computed_notes(est, notes, salt_raw, t.salt_cap, niit_base)
+    est.notes = notes
+    return est
+
+
+def _append_computed_notes(
+    est: TaxEstimate,
+    notes: List[str],
+    salt_raw: float,
+    salt_cap: float,
+    niit_base: float,
+) -> None:
+    """
+    Add the notes that describe computed figures, then the leading disclaimer.
+    Shared with the batch recompute (tax_scenarios) so both write identical notes.
+    """
+    if est.ss_benefits_gross > 0:
+        pct = (est.ss_benefits_taxable / est.ss_benefits_gross * 100) if est.ss_benefits_gross else 0
+        notes.append(
+            f"Social Security: ${est.ss_benefits_gross:,.0f} gross; "
+            f"${est.ss_benefits_taxable:,.0f} ({pct:.0f}%) estimated as taxable."
+        )
+
+    if est.deduction_type == "itemized":
+        notes.append(
+            f"Using itemized deductions (${est.itemized_deduction:,.0f}) vs. "
+            f"standard deduction (${est.standard_deduction:,.0f}). "
+            "Add charitable contributions and other items to verify."
+        )
+        if salt_raw > salt_cap:
+            notes.append(
+                f"SALT capped at ${salt_cap:,.0f} "
+                f"(actual SALT was ${salt_raw:,.0f})."
+            )
+
+    if est.schedule_c_net > 0:
+        notes.append(
+            f"Section 199A QBI deduction estimated at ${est.qbi_deduction:,.0f} "
+            "(simplified 20% of business income, subject to taxable income limit). "
+            "May be further limited by W-2 wages, UBIA, or SSTB rules."
+        )
+
+    if est.niit > 0:
+        notes.append(f"Net Investment Income Tax: ${est.niit:,.0f} (3.8% on ${niit_base:,.0f}).")
+
     if est.refund_or_owed >= 0:
         notes.append(f"Estimated REFUND: ${est.refund_or_owed:,.0f}.")
     else:
         notes.append(f"Estimated AMOUNT OWED: ${abs(est.refund_or_owed):,.0f}.")
 
     notes.insert(0, (
-        f"ESTIMATE ONLY for tax year {tax_year} "
-        f"({_FILING_STATUS_LABELS.get(fs, fs)}). "
+        f"ESTIMATE ONLY for tax year {est.tax_year} "
+        f"({_FILING_STATUS_LABELS.get(est.filing_status, est.filing_status)}). "
         "Based on extracted document data — a licensed tax professional must verify all figures before filing."
     ))
-    est.notes = notes
-    return est
 
 
 # ---------------------------------------------------------------------------
@@ -638,7 +745,9 @@ def write_tax_estimate(
     client: str = "",
 ) -> None:
     """Write Tax_Estimate.json and Tax_Estimate.md to out_dir."""
-    data = asdict(est)
+    # TaxEstimate is flat (floats/strs plus a list of str notes), so a shallow
+    # dict serializes identically to asdict() without its per-field deepcopy.
+    data = {f.name: getattr(est, f.name) for f in fields(est)}
     (out_dir / "Tax_Estimate.json").write_text(
         json.dumps(data, indent=2, sort_keys=True), encoding="utf-8"
     )
@@ -777,16 +886,16 @@ def calculate_tax_from_docs(
 
     # Recalculate itemized with charitable contributions included
     if charitable_cash + charitable_noncash > 0:
-        c = _get_constants(tax_year)
         fs = est.filing_status
+        t = _get_table(tax_year, fs)
         mortgage_interest = sum(
             f.mortgage_interest_received or 0.0 for f in result.form_1098
         )
         real_estate_taxes = sum(f.real_estate_taxes or 0.0 for f in result.form_1098)
         state_taxes = sum(w2.box17_state_tax or 0.0 for w2 in result.w2)
-        salt = min(state_taxes + real_estate_taxes, c["salt_cap"][fs])
+        salt = min(state_taxes + real_estate_taxes, t.salt_cap)
         itemized = mortgage_interest + salt + charitable_cash + charitable_noncash
-        std_ded = c["standard_deductions"][fs]
+        std_ded = t.standard_deduction
         if itemized > est.deduction_used or itemized > std_ded:
             # Recompute with new itemized total — call calculate_tax again
             # Simpler: just patch itemized deduction and recalculate downstream
@@ -0,0 +1,420 @@
+"""
+Vectorized what-if scenarios on top of the federal tax estimator.
+
+run_scenarios() aggregates one ExtractionResult exactly as calculate_tax()
+does, then evaluates every scenario in a grid at once: each step of the
+scalar computation (SE tax, SS taxability, deductions, QBI, bracket tax,
+LTCG stacking, NIIT, credits) is a NumPy operation over one array element
+per scenario. Operations are applied in the same order as the scalar path,
+so each row matches calculate_tax() for the equivalent inputs.
+
+    grid = scenario_grid(filing_status=["mfj", "mfs"], num_children=[0, 3],
+                         w2_wages=[0.0, -20_000.0])   # -20k = extra 401(k)
+    table = run_scenarios(extraction, grid, tax_year=2024)
+    table.rows()   # one dict per scenario
+
+calculate_tax_batch() runs the same columns the other way round, one row per
+client, to recompute a whole firm's estimates after a constants change.
+"""
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.models import ExtractionResult
+from src.tax_calculator import (
+    _CONSTANTS,
+    TaxEstimate,
+    _TaxTable,
+    _aggregate_documents,
+    _append_computed_notes,
+    _get_table,
+)
+
+_FILING_STATUSES = ("single", "mfj", "mfs", "hoh", "qss")
+
+# TaxEstimate income fields a scenario may shift by a dollar amount
+_INCOME_FIELDS = (
+    "w2_wages",
+    "taxable_interest",
+    "ordinary_dividends",
+    "qualified_dividends",
+    "short_term_cap_gains",
+    "long_term_cap_gains",
+    "ira_pension_taxable",
+    "ss_benefits_gross",
+    "schedule_c_net",
+    "unemployment_comp",
+    "other_income",
+)
+
+# Per-client document totals _compute needs besides the income fields
+_DOCUMENT_FIELDS = (
+    "mortgage_interest",
+    "real_estate_taxes",
+    "state_taxes",
+    "rents",
+    "w2_withholding",
+    "other_withholding",
+    "other_adjustments",
+)
+
+# Computed TaxEstimate fields copied back from the columns by calculate_tax_batch()
+_ESTIMATE_FIELDS = (
+    "ss_benefits_taxable", "total_income", "se_tax_deduction", "agi",
+    "standard_deduction", "itemized_deduction", "deduction_used", "qbi_deduction",
+    "taxable_income", "ordinary_income_for_brackets", "preferred_income",
+    "regular_tax", "ltcg_tax", "niit", "se_tax", "total_tax_before_credits",
+    "child_tax_credit", "foreign_tax_credit", "total_credits", "total_tax",
+    "total_payments", "refund_or_owed",
+)
+
+
+@dataclass
+class Scenario:
+    """
+    One what-if: overrides for calculate_tax() arguments (None = keep the base
+    value) plus dollar deltas added to the document-derived income amounts.
+    """
+    label: str = ""
+    filing_status: Optional[str] = None
+    num_children: Optional[int] = None
+    estimated_payments: Optional[float] = None
+    foreign_tax_credit: Optional[float] = None
+
+    w2_wages: float = 0.0
+    taxable_interest: float = 0.0
+    ordinary_dividends: float = 0.0
+    qualified_dividends: float = 0.0
+    short_term_cap_gains: float = 0.0
+    long_term_cap_gains: float = 0.0
+    ira_pension_taxable: float = 0.0
+    ss_benefits_gross: float = 0.0
+    schedule_c_net: float = 0.0
+    unemployment_comp: float = 0.0
+    other_income: float = 0.0
+
+
+@dataclass
+class ScenarioTable:
+    """Results of run_scenarios(): one array element per scenario in each column."""
+    scenarios: List[Scenario]
+    tax_year: int
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    def rows(self) -> List[Dict]:
+        names = list(self.columns)
+        as_lists = [self.columns[n].tolist() for n in names]
+        return [
+            {"label": s.label, **dict(zip(names, values))}
+            for s, values in zip(self.scenarios, zip(*as_lists))
+        ]
+
+
+def scenario_grid(**axes) -> List[Scenario]:
+    """
+    Cartesian product of Scenario field values, e.g.
+    scenario_grid(filing_status=["mfj", "mfs"], num_children=[0, 1, 2]).
+    Labels are built from the varying fields.
+    """
+    valid = {f.name for f in fields(Scenario)} - {"label"}
+    unknown = set(axes) - valid
+    if unknown:
+        raise ValueError(f"Unknown scenario field(s): {', '.join(sorted(unknown))}")
+    names = list(axes)
+    grid = []
+    for combo in itertools.product(*(axes[n] for n in names)):
+        kwargs = dict(zip(names, combo))
+        label = ", ".join(f"{n}={v}" for n, v in kwargs.items())
+        grid.append(Scenario(label=label, **kwargs))
+    return grid
+
+
+def _per_status(tables: List[_TaxTable], attr: str, fs_idx: np.ndarray) -> np.ndarray:
+    return np.array([getattr(t, attr) for t in tables], dtype=float)[fs_idx]
+
+
+def _bracket_tax(income: np.ndarray, fs_idx: np.ndarray, tables: List[_TaxTable]) -> np.ndarray:
+    # Vector form of _TaxTable.bracket_tax: the bisect is a count of floors below income.
+    floors = np.array([t.floors for t in tables])[fs_idx]
+    floor_tax = np.array([t.floor_tax for t in tables])[fs_idx]
+    rates = np.array([t.rates for t in tables])[fs_idx]
+    i = (floors < income[:, None]).sum(axis=1) - 1
+    rows = np.arange(len(income))
+    j = np.maximum(i, 0)
+    tax = floor_tax[rows, j] + (income - floors[rows, j]) * rates[rows, j]
+    return np.where(i >= 0, tax, 0.0)
+
+
+def _ltcg_tax(ordinary: np.ndarray, preferred: np.ndarray,
+              zero_top: np.ndarray, fifteen_top: np.ndarray) -> np.ndarray:
+    # Vector form of _compute_ltcg_tax: stack preferred income on ordinary income.
+    zero_used = np.minimum(preferred, np.maximum(0.0, zero_top - ordinary))
+    remaining = preferred - zero_used
+    base = ordinary + zero_used
+    fifteen_used = np.minimum(remaining, np.maximum(0.0, fifteen_top - base))
+    tax = fifteen_used * 0.15 + (remaining - fifteen_used) * 0.20
+    return np.where((preferred > 0) & (remaining > 0), tax, 0.0)
+
+
+def _ss_taxable(agi_before_ss: np.ndarray, ss_gross: np.ndarray, fs_idx: np.ndarray,
+                tables: List[_TaxTable]) -> np.ndarray:
+    # Vector form of _compute_ss_taxable
+    low = _per_status(tables, "ss_low", fs_idx)
+    high = _per_status(tables, "ss_high", fs_idx)
+    combined = agi_before_ss + ss_gross * 0.50
+    mid = np.minimum(ss_gross * 0.50, (combined - low) * 0.50)
+    top = np.minimum(ss_gross * 0.85, (high - low) * 0.50 + (combined - high) * 0.85)
+    taxable = np.where(combined <= low, 0.0, np.where(combined <= high, mid, top))
+    taxable = np.where(fs_idx == _FILING_STATUSES.index("mfs"), ss_gross * 0.85, taxable)
+    return np.where(ss_gross > 0, taxable, 0.0)
+
+
+def _se_tax(net_se_income: np.ndarray, ss_wage_base: float) -> np.ndarray:
+    # Vector form of _compute_se_tax (deduction is half, taken by the caller)
+    se_wages = net_se_income * 0.9235
+    se_tax = np.minimum(se_wages, ss_wage_base) * 0.124 + se_wages * 0.029
+    return np.where(net_se_income > 0, se_tax, 0.0)
+
+
+def _compute(
+    inputs: Dict[str, np.ndarray],
+    fs_idx: np.ndarray,
+    children: np.ndarray,
+    est_payments: np.ndarray,
+    ftc_claimed: np.ndarray,
+    tax_year: int,
+) -> Dict[str, np.ndarray]:
+    """
+    Steps 2-8 of calculate_tax() with one array element per row. inputs holds
+    the _INCOME_FIELDS amounts plus the document totals in _DOCUMENT_FIELDS.
+    """
+    tables = [_get_table(tax_year, fs) for fs in _FILING_STATUSES]
+    cols: Dict[str, np.ndarray] = {name: inputs[name] for name in _INCOME_FIELDS}
+    other_adjustments = inputs["other_adjustments"]
+
+    # SE tax and the half-SE adjustment
+    cols["se_tax"] = _se_tax(cols["schedule_c_net"], tables[0].se_ss_wage_base)
+    cols["se_tax_deduction"] = cols["se_tax"] * 0.50
+
+    agi_before_ss = (
+        cols["w2_wages"]
+        + cols["taxable_interest"]
+        + cols["ordinary_dividends"]
+        + cols["short_term_cap_gains"]
+        + cols["long_term_cap_gains"]
+        + cols["ira_pension_taxable"]
+        + cols["schedule_c_net"]
+        + cols["unemployment_comp"]
+        + cols["other_income"]
+        - cols["se_tax_deduction"]
+        - other_adjustments
+    )
+    cols["ss_benefits_taxable"] = _ss_taxable(agi_before_ss, cols["ss_benefits_gross"], fs_idx, tables)
+
+    cols["total_income"] = (
+        cols["w2_wages"]
+        + cols["taxable_interest"]
+        + cols["ordinary_dividends"]
+        + cols["short_term_cap_gains"]
+        + cols["long_term_cap_gains"]
+        + cols["ira_pension_taxable"]
+        + cols["ss_benefits_taxable"]
+        + cols["schedule_c_net"]
+        + cols["unemployment_comp"]
+        + cols["other_income"]
+    )
+    cols["other_adjustments"] = other_adjustments
+    agi = np.maximum(0.0, cols["total_income"] - cols["se_tax_deduction"] - other_adjustments)
+    cols["agi"] = agi
+
+    # Deductions: SALT cap varies by filing status
+    cols["salt_raw"] = inputs["state_taxes"] + inputs["real_estate_taxes"]
+    cols["salt_cap"] = _per_status(tables, "salt_cap", fs_idx)
+    salt = np.minimum(cols["salt_raw"], cols["salt_cap"])
+    cols["standard_deduction"] = _per_status(tables, "standard_deduction", fs_idx)
+    cols["itemized_deduction"] = inputs["mortgage_interest"] + salt
+    itemize = cols["itemized_deduction"] > cols["standard_deduction"]
+    cols["deduction_used"] = np.where(itemize, cols["itemized_deduction"], cols["standard_deduction"])
+    cols["itemized"] = itemize
+
+    sched_c = cols["schedule_c_net"]
+    taxable_before_qbi = np.maximum(0.0, agi - cols["deduction_used"])
+    qbi_limit = np.maximum(
+        0.0, taxable_before_qbi - (cols["qualified_dividends"] + np.maximum(0.0, cols["long_term_cap_gains"]))
+    ) * 0.20
+    cols["qbi_deduction"] = np.where(sched_c > 0, np.minimum(sched_c * 0.20, qbi_limit), 0.0)
+    cols["taxable_income"] = np.maximum(0.0, agi - cols["deduction_used"] - cols["qbi_deduction"])
+
+    # Tax computation
+    net_ltcg = np.maximum(0.0, cols["long_term_cap_gains"])
+    cols["preferred_income"] = np.minimum(cols["qualified_dividends"] + net_ltcg, cols["taxable_income"])
+    cols["ordinary_income_for_brackets"] = np.maximum(0.0, cols["taxable_income"] - cols["preferred_income"])
+    cols["regular_tax"] = _bracket_tax(cols["ordinary_income_for_brackets"], fs_idx, tables)
+    cols["ltcg_tax"] = _ltcg_tax(
+        cols["ordinary_income_for_brackets"],
+        cols["preferred_income"],
+        _per_status(tables, "ltcg_zero_top", fs_idx),
+        _per_status(tables, "ltcg_fifteen_top", fs_idx),
+    )
+
+    niit_threshold = _per_status(tables, "niit_threshold", fs_idx)
+    net_inv_income = (
+        cols["taxable_interest"]
+        + cols["ordinary_dividends"]
+        + cols["long_term_cap_gains"]
+        + cols["short_term_cap_gains"]
+        + inputs["rents"]
+    )
+    niit_applies = agi > niit_threshold
+    cols["niit_base"] = np.where(
+        niit_applies, np.minimum(np.maximum(0.0, net_inv_income), agi - niit_threshold), 0.0
+    )
+    cols["niit"] = np.where(niit_applies, cols["niit_base"] * 0.038, 0.0)
+
+    cols["total_tax_before_credits"] = cols["regular_tax"] + cols["ltcg_tax"] + cols["niit"] + cols["se_tax"]
+    before_credits = cols["total_tax_before_credits"]
+
+    # Credits
+    ctc_max = children * tables[0].ctc_per_child
+    excess = np.maximum(0.0, agi - _per_status(tables, "ctc_phase_out", fs_idx))
+    phase_out = np.floor_divide(excess, 1_000) * 50.0
+    cols["child_tax_credit"] = np.where(
+        children > 0, np.minimum(np.maximum(0.0, ctc_max - phase_out), before_credits), 0.0
+    )
+    cols["foreign_tax_credit"] = np.minimum(
+        ftc_claimed, np.maximum(0.0, before_credits - cols["child_tax_credit"])
+    )
+    cols["total_credits"] = cols["child_tax_credit"] + cols["foreign_tax_credit"]
+    cols["total_tax"] = np.maximum(0.0, before_credits - cols["total_credits"])
+
+    # Payments
+    cols["w2_withholding"] = inputs["w2_withholding"]
+    cols["other_withholding"] = inputs["other_withholding"]
+    cols["estimated_payments"] = est_payments
+    cols["total_payments"] = inputs["w2_withholding"] + inputs["other_withholding"] + est_payments
+    cols["refund_or_owed"] = cols["total_payments"] - cols["total_tax"]
+    return cols
+
+
+def _status_index(filing_status: str) -> int:
+    fs = filing_status.lower().strip()
+    if fs not in _CONSTANTS[2025]["standard_deductions"]:
+        fs = "single"
+    return _FILING_STATUSES.index(fs)
+
+
+def _document_totals(result: ExtractionResult, base: TaxEstimate, notes: List[str]) -> Dict[str, float]:
+    """Aggregate one client's documents into base and return the extra totals _compute needs."""
+    _aggregate_documents(result, base, notes)
+    return {
+        "mortgage_interest": sum(f.mortgage_interest_received or 0.0 for f in result.form_1098),
+        "real_estate_taxes": sum(f.real_estate_taxes or 0.0 for f in result.form_1098),
+        "state_taxes": sum(w2.box17_state_tax or 0.0 for w2 in result.w2),
+        "rents": sum(f.box1_rents or 0.0 for f in result.form_1099_misc),
+        "w2_withholding": base.w2_withholding,
+        "other_withholding": base.other_withholding,
+        "other_adjustments": base.other_adjustments,
+    }
+
+
+def run_scenarios(
+    result: ExtractionResult,
+    scenarios: List[Scenario],
+    filing_status: str = "single",
+    num_children: int = 0,
+    estimated_payments: float = 0.0,
+    foreign_tax_credit: float = 0.0,
+    tax_year: int = 2025,
+) -> ScenarioTable:
+    """
+    Evaluate every scenario against one client's extracted documents.
+    Keyword arguments are the base case, as passed to calculate_tax().
+    Columns are named after the matching TaxEstimate fields, plus the
+    worksheet values salt_raw, salt_cap, itemized and niit_base.
+    """
+    base = TaxEstimate(tax_year=tax_year)
+    totals = _document_totals(result, base, [])
+    n = len(scenarios)
+
+    fs_idx = np.array([_status_index(s.filing_status or filing_status) for s in scenarios], dtype=np.intp)
+
+    def _override(name: str, default: float) -> np.ndarray:
+        return np.array([default if getattr(s, name) is None else getattr(s, name) for s in scenarios],
+                        dtype=float)
+
+    children = _override("num_children", num_children)
+    inputs = {name: np.full(n, value) for name, value in totals.items()}
+    for name in _INCOME_FIELDS:
+        deltas = np.array([getattr(s, name) for s in scenarios], dtype=float)
+        inputs[name] = getattr(base, name) + deltas
+
+    cols = _compute(inputs, fs_idx, children, _override("estimated_payments", estimated_payments),
+                    _override("foreign_tax_credit", foreign_tax_credit), tax_year)
+
+    table = ScenarioTable(scenarios=list(scenarios), tax_year=tax_year)
+    table.columns["filing_status"] = np.array(_FILING_STATUSES)[fs_idx]
+    table.columns["num_children"] = children.astype(int)
+    table.columns.update(cols)
+    return table
+
+
+def calculate_tax_batch(
+    results: List[ExtractionResult],
+    filing_status: str = "single",
+    num_children: int = 0,
+    estimated_payments: float = 0.0,
+    foreign_tax_credit: float = 0.0,
+    tax_year: int = 2025,
+) -> List[TaxEstimate]:
+    """
+    calculate_tax() for many clients at once, with the same arguments for all
+    of them (as in a src.main run). Documents are aggregated per client into
+    one column per input, the math runs once over the whole firm, and each
+    TaxEstimate (notes included) matches what calculate_tax() would return.
+    """
+    fs = _FILING_STATUSES[_status_index(filing_status)]
+    n = len(results)
+    bases: List[TaxEstimate] = []
+    doc_notes: List[List[str]] = []
+    inputs = {name: np.zeros(n) for name in _INCOME_FIELDS + _DOCUMENT_FIELDS}
+    for i, result in enumerate(results):
+        base = TaxEstimate(filing_status=fs, tax_year=tax_year)
+        notes: List[str] = []
+        for name, value in _document_totals(result, base, notes).items():
+            inputs[name][i] = value
+        for name in _INCOME_FIELDS:
+            inputs[name][i] = getattr(base, name)
+        bases.append(base)
+        doc_notes.append(notes)
+
+    cols = _compute(
+        inputs,
+        np.full(n, _FILING_STATUSES.index(fs), dtype=np.intp),
+        np.full(n, float(num_children)),
+        np.full(n, float(estimated_payments)),
+        np.full(n, float(foreign_tax_credit)),
+        tax_year,
+    )
+
+    as_lists = {name: cols[name].tolist() for name in _ESTIMATE_FIELDS + ("salt_raw", "salt_cap", "niit_base")}
+    itemized = cols["itemized"].tolist()
+    estimates = []
+    for i, base in enumerate(bases):
+        for name in _ESTIMATE_FIELDS:
+            setattr(base, name, as_lists[name][i])
+        base.deduction_type = "itemized" if itemized[i] else "standard"
+        # calculate_tax() stores the estimated_payments argument as given
+        base.estimated_payments = estimated_payments
+        notes = doc_notes[i]
+        _append_computed_notes(base, notes, as_lists["salt_raw"][i], as_lists["salt_cap"][i],
+                               as_lists["niit_base"][i])
+        base.notes = notes
+        estimates.append(base)
+    return estimates
@@ -0,0 +1,307 @@
+"""
+Watch mode: keep workpapers current while clients drop documents in.
+
+    python -m src.main --root "C:\\TaxClients\\2024" --year 2024 --watch
+
+Changes under each client folder (outside _workpapers) are collected from
+inotify on Linux, or by polling file sizes and mtimes elsewhere (and when
+inotify is unavailable or out of watches). A burst of events for one client
+is debounced into a single reprocess of that client only: the client is
+processed once it has been quiet for `debounce` seconds, or after
+`max_delay` seconds of continuous activity. process_client() refreshes the
+client's dashboard summary and appends it to the root index, so the
+dashboard is current as soon as a reprocess finishes.
+
+A client whose supported documents are unchanged since its last reprocess
+(e.g. only a temp file or .DS_Store changed) is skipped. With --organize, the
+files a reprocess itself moves into owner/form folders count as unchanged.
+"""
+from __future__ import annotations
+
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from src.config import SUPPORTED_EXTENSIONS, AppConfig
+from src.scanner import iter_supported_files
+
+_WORKPAPERS = "_workpapers"
+
+
+def _client_of(root: Path, path: Path) -> Optional[str]:
+    """Client folder name for a path under root, or None for root files and outputs."""
+    try:
+        parts = path.relative_to(root).parts
+    except ValueError:
+        return None
+    if len(parts) < 1 or parts[0].startswith("_") or _WORKPAPERS in parts:
+        return None
+    if len(parts) == 1 and not (root / parts[0]).is_dir():
+        return None
+    return parts[0]
+
+
+def _client_dirs(root: Path) -> Iterable[Path]:
+    return (p for p in root.iterdir() if p.is_dir() and not p.name.startswith("_"))
+
+
+class PollingWatcher:
+    """Portable fallback: compares (size, mtime) of every supported file each interval."""
+
+    backend = "polling"
+
+    def __init__(self, root: Path, interval: float = 2.0) -> None:
+        self.root = root
+        self.interval = interval
+        self._state: Dict[str, Dict[str, Tuple[int, int]]] = {c.name: self._scan(c) for c in _client_dirs(root)}
+        self._next = time.monotonic() + interval
+
+    @staticmethod
+    def _scan(client_dir: Path) -> Dict[str, Tuple[int, int]]:
+        state: Dict[str, Tuple[int, int]] = {}
+        for dirpath, dirnames, filenames in os.walk(client_dir):
+            dirnames[:] = [d for d in dirnames if d != _WORKPAPERS]
+            for name in filenames:
+                if os.path.splitext(name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                    continue
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                state[full] = (st.st_size, st.st_mtime_ns)
+        return state
+
+    def changes(self, timeout: float) -> Set[str]:
+        wait = self._next - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(0.0, timeout))
+            return set()
+        time.sleep(max(0.0, wait))
+        self._next = time.monotonic() + self.interval
+        changed: Set[str] = set()
+        current = {c.name: c for c in _client_dirs(self.root)}
+        for name in set(self._state) - set(current):
+            del self._state[name]
+        for name, client_dir in current.items():
+            state = self._scan(client_dir)
+            if state != self._state.get(name):
+                changed.add(name)
+                self._state[name] = state
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify via libc, one watch per directory (inotify is not recursive)."""
+
+    backend = "inotify"
+
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_FROM = 0x00000040
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_DELETE = 0x00000200
+    _IN_Q_OVERFLOW = 0x00004000
+    _IN_IGNORED = 0x00008000
+    _IN_ISDIR = 0x40000000
+    _MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, root: Path) -> None:
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._ctypes = ctypes
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: Dict[int, Path] = {}
+        try:
+            self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self._MASK)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            if not path.exists():
+                return  # removed before we got to it
+            raise OSError(err, f"inotify_add_watch failed for {path}: {os.strerror(err)}")
+        self._paths[wd] = path
+
+    def _add_tree(self, top: Path) -> None:
+        self._add_watch(top)
+        for dirpath, dirnames, _ in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d != _WORKPAPERS and not (Path(dirpath) == self.root and d.startswith("_"))]
+            for d in dirnames:
+                self._add_watch(Path(dirpath) / d)
+
+    def changes(self, timeout: float) -> Set[str]:
+        ready, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not ready:
+            return set()
+        changed: Set[str] = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(buf, offset)
+                offset += self._EVENT.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self._IN_Q_OVERFLOW:
+                    # Events were lost: treat every client as changed.
+                    changed.update(c.name for c in _client_dirs(self.root))
+                    continue
+                if mask & self._IN_IGNORED:
+                    self._paths.pop(wd, None)
+                    continue
+                parent = self._paths.get(wd)
+                if parent is None:
+                    continue
+                path = parent / os.fsdecode(name) if name else parent
+                if not mask & self._IN_ISDIR and path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                    continue  # temp files, .DS_Store, notes...
+                if mask & self._IN_ISDIR and mask & (self._IN_CREATE | self._IN_MOVED_TO):
+                    if path.name != _WORKPAPERS and not (parent == self.root and path.name.startswith("_")):
+                        try:
+                            self._add_tree(path)
+                        except OSError:
+                            pass
+                client = _client_of(self.root, path)
+                if client is not None:
+                    changed.add(client)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(root: Path, force_polling: bool = False, poll_interval: float = 2.0):
+    """An inotify watcher where possible, otherwise a PollingWatcher."""
+    if not force_polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, interval=poll_interval)
+
+
+class Debouncer:
+    """Per-client quiet-period tracking; all times are time.monotonic() values."""
+
+    def __init__(self, debounce: float, max_delay: float) -> None:
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._first: Dict[str, float] = {}
+        self._last: Dict[str, float] = {}
+
+    def touch(self, client: str, now: float) -> None:
+        self._first.setdefault(client, now)
+        self._last[client] = now
+
+    def _due(self, client: str) -> float:
+        return min(self._last[client] + self.debounce, self._first[client] + self.max_delay)
+
+    def pop_ready(self, now: float) -> list[str]:
+        ready = sorted(c for c in self._last if self._due(c) <= now)
+        for c in ready:
+            del self._first[c], self._last[c]
+        return ready
+
+    def wait_time(self, now: float, idle: float) -> float:
+        """Seconds until the next client is due, or idle if none is pending."""
+        if not self._last:
+            return idle
+        return max(0.0, min(self._due(c) for c in self._last) - now)
+
+
+def _document_snapshot(client_dir: Path) -> frozenset:
+    snapshot = set()
+    for path in iter_supported_files(client_dir):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        snapshot.add((str(path), st.st_size, st.st_mtime_ns))
+    return frozenset(snapshot)
+
+
+def _versions(snapshot: frozenset) -> list:
+    """(size, mtime) of each document in a snapshot, wherever it is filed."""
+    return sorted((size, mtime) for _, size, mtime in snapshot)
+
+
+def watch(
+    config: AppConfig,
+    debounce: float = 2.0,
+    max_delay: float = 30.0,
+    force_polling: bool = False,
+    poll_interval: float = 2.0,
+    stop: Optional[threading.Event] = None,
+    process: Optional[Callable[[Path, AppConfig], None]] = None,
+) -> None:
+    """Reprocess clients under config.root as their documents change, until stop is set."""
+    if process is None:
+        from src.main import process_client as process
+
+    root = config.root
+    stop = stop or threading.Event()
+    watcher = open_watcher(root, force_polling=force_polling, poll_interval=poll_interval)
+    debouncer = Debouncer(debounce, max_delay)
+    processed: Dict[str, frozenset] = {}
+    if config.verbose:
+        print(f"Watching {root} ({watcher.backend})")
+    try:
+        while not stop.is_set():
+            for client in watcher.changes(debouncer.wait_time(time.monotonic(), idle=0.5)):
+                if config.client_filter and client.lower() != config.client_filter.lower():
+                    continue
+                debouncer.touch(client, time.monotonic())
+            for client in debouncer.pop_ready(time.monotonic()):
+                client_dir = root / client
+                if not client_dir.is_dir():
+                    processed.pop(client, None)
+                    continue
+                # Snapshot before processing, so a document landing mid-run
+                # still differs next time.
+                snapshot = _document_snapshot(client_dir)
+                if processed.get(client) == snapshot:
+                    continue
+                started = time.perf_counter()
+                try:
+                    process(client_dir, config)
+                except Exception as exc:
+                    print(f"{client}: reprocess failed: {type(exc).__name__}: {exc}", file=sys.stderr)
+                    continue
+                if config.organize:
+                    # Organizing moves documents without changing them; if
+                    # that is all that changed during the run, the moves must
+                    # not trigger another reprocess.
+                    after = _document_snapshot(client_dir)
+                    if _versions(after) == _versions(snapshot):
+                        snapshot = after
+                processed[client] = snapshot
+                if config.verbose:
+                    print(f"Reprocessed {client} in {time.perf_counter() - started:.1f}s")
+    finally:
+        watcher.close()
@@ -6,7 +6,15 @@ import io
 import json
 from pathlib import Path
 
-from src.dashboard import build_client_summary, list_client_summaries, load_document_records
+from src.dashboard import (
+    FILTERS,
+    SORT_FIELDS,
+    build_client_summary,
+    iter_document_records,
+    load_document_records,
+    load_key_field_columns,
+    query_client_summaries,
+)
 
 # Fields from parsed dataclasses that are internal/structural and should not be shown as override inputs
 _SKIP_FIELDS = frozenset({
@@ -65,39 +73,62 @@ def _prepare_records(records: list[dict], overrides: dict) -> list[dict]:
     return out
 
 
-def _build_export_csv(records: list[dict], overrides: dict) -> str:
-    """Return a CSV string with base columns + all unique key_fields expanded as columns."""
-    base_cols = ["file_name", "doc_type", "confidence", "detected_year", "issuer", "sha256", "extraction_notes"]
+_EXPORT_BASE_COLS = ["file_name", "doc_type", "confidence", "detected_year", "issuer", "sha256", "extraction_notes"]
+_EXPORT_FLUSH_ROWS = 256
 
-    # Collect all unique key_field names across all records
-    all_kf_keys: list[str] = []
-    seen: set[str] = set()
-    for rec in records:
-        for k in rec.get("key_fields", {}):
-            if k not in seen and k not in _SKIP_FIELDS:
-                seen.add(k)
-                all_kf_keys.append(k)
 
-    fieldnames = base_cols + all_kf_keys + ["preparer_notes"]
+def _export_fieldnames(kf_columns: list[str], leading: tuple[str, ...] = ()) -> tuple[list[str], list[str]]:
+    """(CSV header, key_field columns) with structural fields dropped."""
+    kf_keys = [k for k in kf_columns if k not in _SKIP_FIELDS]
+    return [*leading, *_EXPORT_BASE_COLS, *kf_keys, "preparer_notes"], kf_keys
 
-    buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore", lineterminator="\r\n")
-    writer.writeheader()
 
-    for rec in records:
-        sha = rec.get("sha256", "")
-        doc_overrides = overrides.get(sha, {})
-        field_overrides = doc_overrides.get("fields", {})
-        kf = rec.get("key_fields", {})
+def _export_row(rec: dict, overrides: dict, kf_keys: list[str]) -> dict:
+    doc_overrides = overrides.get(rec.get("sha256", ""), {})
+    field_overrides = doc_overrides.get("fields", {})
+    kf = rec.get("key_fields", {})
+
+    row = {col: rec.get(col, "") for col in _EXPORT_BASE_COLS}
+    for k in kf_keys:
+        val = field_overrides.get(k, kf.get(k, ""))
+        row[k] = "" if val is None else val
+    row["preparer_notes"] = doc_overrides.get("notes", "")
+    return row
+
+
+class _ChunkWriter:
+    """csv.DictWriter target that hands back what was written since the last drain()."""
 
-        row = {col: rec.get(col, "") for col in base_cols}
-        for k in all_kf_keys:
-            val = field_overrides.get(k, kf.get(k, ""))
-            row[k] = "" if val is None else val
-        row["preparer_notes"] = doc_overrides.get("notes", "")
-        writer.writerow(row)
+    def __init__(self, fieldnames: list[str]) -> None:
+        self._buf = io.StringIO()
+        self.writer = csv.DictWriter(self._buf, fieldnames=fieldnames, extrasaction="ignore", lineterminator="\r\n")
 
-    return buf.getvalue()
+    def drain(self) -> str:
+        chunk = self._buf.getvalue()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return chunk
+
+
+def _iter_export_csv(sources, fieldnames: list[str], kf_keys: list[str]):
+    """
+    Yield CSV text for (records, overrides, extra_columns) sources in a few
+    hundred rows per chunk, so only the rows of the current chunk are held.
+    """
+    out = _ChunkWriter(fieldnames)
+    out.writer.writeheader()
+    pending = 1
+    for records, overrides, extra in sources:
+        for rec in records:
+            row = _export_row(rec, overrides, kf_keys)
+            row.update(extra)
+            out.writer.writerow(row)
+            pending += 1
+            if pending >= _EXPORT_FLUSH_ROWS:
+                yield out.drain()
+                pending = 0
+    if pending:
+        yield out.drain()
 
 
 _INDEX_TEMPLATE = """
@@ -111,15 +142,33 @@ _INDEX_TEMPLATE = """
   .pill { display:inline-block; padding:2px 8px; border-radius:999px; background:#eef; margin-right:6px; }
   .tbl-link { font-size: 0.85em; white-space: nowrap; }
   .dash { color: #aaa; }
+  .filters { margin: 12px 0; }
+  .filters label { margin-right: 10px; }
+  th a { color: inherit; }
+  .pager { margin-top: 12px; }
+  .pager a, .pager span { margin-right: 10px; }
 </style></head>
 <body>
   <h1>Tax Workpaper Dashboard</h1>
-  <p>Root: {{ root }}</p>
+  <p>Root: {{ root }} &nbsp;<a class="tbl-link" href="/export.csv">↓ Export all clients (CSV)</a></p>
+  <form class="filters" method="get" action="/">
+    <input type="search" name="q" value="{{ query.q }}" placeholder="Client name">
+    {% for name, label in filter_labels %}
+    <label><input type="checkbox" name="filter" value="{{ name }}" {% if name in query.filters %}checked{% endif %}> {{ label }}</label>
+    {% endfor %}
+    <input type="hidden" name="sort" value="{{ query.sort }}">
+    <input type="hidden" name="order" value="{{ query.order }}">
+    <button type="submit">Apply</button>
+    <span class="dash">{{ page.total }} client{{ '' if page.total == 1 else 's' }}</span>
+  </form>
   <table>
     <tr>
-      <th>Client</th><th>Docs</th><th>Tasks</th><th>Unknown</th><th>Errors</th><th>Extract Summary</th><th>Export</th><th>Overrides</th>
+      {% for key, label in columns %}
+      <th><a href="{{ list_url(sort=key, order='desc' if query.sort == key and query.order == 'asc' else 'asc', page=1) }}">{{ label }}</a>{% if query.sort == key %} {{ '▲' if query.order == 'asc' else '▼' }}{% endif %}</th>
+      {% endfor %}
+      <th>Extract Summary</th><th>Export</th><th>Overrides</th>
     </tr>
-    {% for c in clients %}
+    {% for c in page.clients %}
     <tr>
       <td><a href="/client/{{ c.client }}">{{ c.client }}</a></td>
       <td>{{ c.document_count }}</td>
@@ -144,9 +193,52 @@ _INDEX_TEMPLATE = """
     </tr>
     {% endfor %}
   </table>
+  {% if page.pages > 1 %}
+  <div class="pager">
+    {% if page.page > 1 %}<a href="{{ list_url(page=page.page - 1) }}">← Prev</a>{% endif %}
+    <span>Page {{ page.page }} of {{ page.pages }}</span>
+    {% if page.page < page.pages %}<a href="{{ list_url(page=page.page + 1) }}">Next →</a>{% endif %}
+  </div>
+  {% endif %}
 </body></html>
 """
 
+# Index table columns in display order: (sort key, header)
+_INDEX_COLUMNS = [("client", "Client"), ("docs", "Docs"), ("tasks", "Tasks"), ("unknown", "Unknown"), ("errors", "Errors")]
+_FILTER_LABELS = [("unknown", "Has unknown docs"), ("errors", "Has errors"), ("tasks", "Has tasks"), ("no_outputs", "No workpapers")]
+
+
+def _list_query(args) -> dict:
+    """Normalise client-list query args; invalid sort/filter/page values fall back to defaults."""
+    def _int(name: str, default: int) -> int:
+        try:
+            return int(args.get(name, default))
+        except (TypeError, ValueError):
+            return default
+
+    sort = args.get("sort", "client")
+    return {
+        "q": args.get("q", "").strip(),
+        "filters": [f for f in args.getlist("filter") if f in FILTERS],
+        "sort": sort if sort in SORT_FIELDS else "client",
+        "order": "desc" if args.get("order") == "desc" else "asc",
+        "page": _int("page", 1),
+        "per_page": _int("per_page", 50),
+    }
+
+
+def _query_page(root: Path, query: dict):
+    return query_client_summaries(
+        root,
+        q=query["q"],
+        filters=query["filters"],
+        sort=query["sort"],
+        descending=query["order"] == "desc",
+        page=query["page"],
+        per_page=query["per_page"],
+    )
+
+
 _CLIENT_TEMPLATE = """
 <!doctype html>
 <html><head><title>{{ summary.client }} - Dashboard</title>
@@ -337,7 +429,7 @@ _CLIENT_TEMPLATE = """
 
 def create_app(root: Path):
     try:
-        from flask import Flask, abort, redirect, render_template_string, request, url_for, Response
+        from flask import Flask, abort, jsonify, redirect, render_template_string, request, url_for, Response
     except Exception as exc:  # pragma: no cover
         raise RuntimeError("Flask is required for the web UI. Install with: pip install flask") from exc
 
@@ -345,8 +437,49 @@ def create_app(root: Path):
 
     @app.get("/")
     def index():
-        clients = list_client_summaries(root)
-        return render_template_string(_INDEX_TEMPLATE, clients=clients, root=str(root))
+        query = _list_query(request.args)
+        page = _query_page(root, query)
+
+        def list_url(**changes) -> str:
+            params = {**query, "page": page.page, **changes}
+            params["filter"] = params.pop("filters")
+            if not params["q"]:
+                del params["q"]
+            return url_for("index", **params)
+
+        return render_template_string(
+            _INDEX_TEMPLATE,
+            page=page,
+            query=query,
+            columns=_INDEX_COLUMNS,
+            filter_labels=_FILTER_LABELS,
+            list_url=list_url,
+            root=str(root),
+        )
+
+    @app.get("/api/clients")
+    def api_clients():
+        query = _list_query(request.args)
+        page = _query_page(root, query)
+        return jsonify({
+            "total": page.total,
+            "page": page.page,
+            "per_page": page.per_page,
+            "pages": page.pages,
+            "clients": [
+                {
+                    "client": c.client,
+                    "has_outputs": c.has_outputs,
+                    "document_count": c.document_count,
+                    "unknown_count": c.unknown_count,
+                    "error_count": c.error_count,
+                    "task_count": c.task_count,
+                    "extraction_counts": c.extraction_counts,
+                    "url": url_for("client_detail", client_name=c.client),
+                }
+                for c in page.clients
+            ],
+        })
 
     @app.get("/client/<client_name>")
     def client_detail(client_name: str):
@@ -416,21 +549,51 @@ def create_app(root: Path):
         _save_overrides(wp_dir, overrides)
         return redirect(url_for("client_detail", client_name=client_name, saved="1"))
 
+    @app.get("/debug/cache")
+    def debug_cache():
+        from src.dashboard import _file_cache
+        return jsonify(_file_cache.stats())
+
     @app.get("/client/<client_name>/export.csv")
     def export_csv(client_name: str):
         client_dir = root / client_name
         if not client_dir.exists() or not client_dir.is_dir():
             abort(404)
         wp_dir = client_dir / "_workpapers"
-        raw_records = load_document_records(wp_dir / "Document_Index.csv")
-        overrides = _load_overrides(wp_dir)
-        csv_text = _build_export_csv(raw_records, overrides)
+        index_path = wp_dir / "Document_Index.csv"
+        fieldnames, kf_keys = _export_fieldnames(load_key_field_columns(index_path))
+        records = iter_document_records(index_path) if index_path.exists() else []
         return Response(
-            csv_text,
+            _iter_export_csv([(records, _load_overrides(wp_dir), {})], fieldnames, kf_keys),
             mimetype="text/csv",
             headers={"Content-Disposition": f'attachment; filename="{client_name}_export.csv"'},
         )
 
+    @app.get("/export.csv")
+    def export_all_csv():
+        index_paths = [
+            p / "_workpapers" / "Document_Index.csv"
+            for p in sorted(root.iterdir(), key=lambda p: p.name.lower())
+            if p.is_dir() and not p.name.startswith("_")
+        ]
+        index_paths = [p for p in index_paths if p.exists()]
+        columns: dict[str, None] = {}
+        for p in index_paths:
+            columns.update(dict.fromkeys(load_key_field_columns(p)))
+        fieldnames, kf_keys = _export_fieldnames(list(columns), leading=("client",))
+
+        def sources():
+            # One client's records and overrides are open at a time.
+            for p in index_paths:
+                wp_dir = p.parent
+                yield iter_document_records(p), _load_overrides(wp_dir), {"client": wp_dir.parent.name}
+
+        return Response(
+            _iter_export_csv(sources(), fieldnames, kf_keys),
+            mimetype="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{root.name or "clients"}_all_clients_export.csv"'},
+        )
+
     return app
 
 
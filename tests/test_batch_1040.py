@@ -0,0 +1,120 @@
+import io
+import tempfile
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from portal.database import create_user, init_db
+from preparer.app import create_app
+from preparer.batch_1040 import load_1040_data, main, render_packets
+from preparer.database import init_preparer_db, upsert_parsed_document
+
+PDF_FORMS = str(Path(__file__).resolve().parent.parent / "pdf_forms")
+
+
+def _data(user_id: int) -> dict:
+    return {"_user": {"first_name": f"Client{user_id}", "last_name": "Test"},
+            "lines": [{"key": "line_1a", "value": 50000.0 + user_id},
+                      {"key": "line_2b", "value": 120.0}]}
+
+
+def _season(tmp: str, count: int) -> tuple[str, str]:
+    """portal.db / preparer.db with count clients; all but the last have a parsed W-2."""
+    portal_db, preparer_db = f"{tmp}/portal.db", f"{tmp}/preparer.db"
+    init_db(portal_db)
+    init_preparer_db(preparer_db)
+    for n in range(count):
+        uid = create_user(portal_db, email=f"c{n}@example.com", phone="", password_hash="x",
+                          first_name=f"Client{n}", last_name="Test", dob="", ssn="", address="",
+                          city="", state="", zip_code="", filing_status="single",
+                          two_fa_method="email")
+        if n < count - 1:  # last client has no parsed documents and is skipped
+            upsert_parsed_document(
+                preparer_db, 100 + n, uid, 2024, "W2", "w2.pdf", "", "w2", 0.9, "done", None,
+                {"w2": [{"box1_wages": 1000.0 * (n + 1)}]}, {}, [])
+    return portal_db, preparer_db
+
+
+@unittest.skipUnless(Path(PDF_FORMS, "f1040.pdf").exists(), "pdf_forms not available")
+class TestBatch1040(unittest.TestCase):
+    def test_renders_every_job_in_pool(self):
+        results = list(render_packets(((uid, _data(uid)) for uid in range(1, 6)), PDF_FORMS, max_workers=2))
+        self.assertEqual(sorted(r.user_id for r in results), [1, 2, 3, 4, 5])
+        for r in results:
+            self.assertIsNone(r.error)
+            self.assertTrue(r.pdf_bytes.startswith(b"%PDF"))
+
+    def test_failure_is_reported_not_replaced_by_blank(self):
+        with tempfile.TemporaryDirectory() as empty:
+            [result] = render_packets([(7, _data(7))], empty, max_workers=1)
+        self.assertEqual(result.user_id, 7)
+        self.assertIsNone(result.pdf_bytes)
+        self.assertTrue(result.error)
+
+    def test_cli_writes_one_pdf_per_client_with_parsed_docs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            portal_db, preparer_db = _season(tmp, 3)
+
+            out = io.StringIO()
+            with redirect_stdout(out):
+                rc = main(["--year", "2024", "--out", f"{tmp}/drafts", "--workers", "1",
+                           "--portal-db", portal_db, "--preparer-db", preparer_db,
+                           "--pdf-forms", PDF_FORMS])
+            self.assertEqual(rc, 0)
+            self.assertEqual(sorted(p.name for p in Path(tmp, "drafts").iterdir()),
+                             ["Client0_Test_1_1040_2024.pdf", "Client1_Test_2_1040_2024.pdf"])
+            self.assertIn("Rendered 2/2 packets", out.getvalue())
+
+    def test_download_route_splits_season_into_parts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            portal_db, preparer_db = _season(tmp, 4)
+            app = create_app({"TESTING": True, "PORTAL_DB_PATH": portal_db, "PREPARER_DB_PATH": preparer_db,
+                              "PDF_CACHE_DIR": f"{tmp}/pdf_cache", "BATCH_1040_WORKERS": 1,
+                              "BATCH_1040_PART_SIZE": 2})
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess["preparer_authed"] = True
+
+            names = []
+            for part in (1, 2):
+                response = client.get(f"/preparer/tax-returns/2024/batch?part={part}")
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(f"_part{part}of2.zip", response.headers["Content-Disposition"])
+                with zipfile.ZipFile(io.BytesIO(response.get_data())) as zf:
+                    names += zf.namelist()
+                response.close()
+            self.assertEqual(names, ["Client0_Test_1_1040_2024.pdf", "Client1_Test_2_1040_2024.pdf",
+                                     "Client2_Test_3_1040_2024.pdf"])
+            self.assertEqual(client.get("/preparer/tax-returns/2024/batch?part=3").status_code, 404)
+
+    def test_download_route_reports_client_that_fails_to_load(self):
+        from preparer import views
+
+        def load(portal_db, preparer_db, user_id, year):
+            if user_id == 2:
+                raise ValueError("malformed manual entry")
+            return load_1040_data(portal_db, preparer_db, user_id, year)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            portal_db, preparer_db = _season(tmp, 4)
+            app = create_app({"TESTING": True, "PORTAL_DB_PATH": portal_db, "PREPARER_DB_PATH": preparer_db,
+                              "PDF_CACHE_DIR": f"{tmp}/pdf_cache", "BATCH_1040_WORKERS": 1})
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess["preparer_authed"] = True
+
+            with patch.object(views, "load_1040_data", load):
+                response = client.get("/preparer/tax-returns/2024/batch")
+            self.assertEqual(response.status_code, 200)
+            with zipfile.ZipFile(io.BytesIO(response.get_data())) as zf:
+                self.assertEqual(sorted(zf.namelist()), ["Client0_Test_1_1040_2024.pdf",
+                                                         "Client2_Test_3_1040_2024.pdf", "FAILED.txt"])
+                self.assertEqual(zf.read("FAILED.txt").decode(),
+                                 "Client1_Test_2_1040_2024.pdf: ValueError: malformed manual entry\n")
+            response.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,25 @@
+import json
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
-from src.dashboard import build_client_summary, parse_questions_markdown
+from src import dashboard
+from src.dashboard import (
+    INDEX_FILE, SUMMARY_FILE, build_client_summary, list_client_summaries, parse_questions_markdown,
+    query_client_summaries, write_client_summary,
+)
+from src.models import ExtractionResult, W2Data
+
+
+def _write_outputs(client: Path, doc_types: list[str], questions: str) -> None:
+    wp = client / "_workpapers"
+    wp.mkdir(parents=True, exist_ok=True)
+    header = "client,file_path,file_name,sha256,doc_type,confidence,detected_year,issuer,key_fields,extraction_notes\n"
+    rows = "".join(f"A,/a/{i}.pdf,{i}.pdf,{i},{t},0.9,2024,,{{}},\n" for i, t in enumerate(doc_types))
+    (wp / "Document_Index.csv").write_text(header + rows, encoding="utf-8")
+    (wp / "Data_Extract.json").write_text(json.dumps({"w2": [{}], "trades": [{}] * 50}), encoding="utf-8")
+    (wp / "Questions_For_Client.md").write_text(questions, encoding="utf-8")
 
 
 class TestDashboard(unittest.TestCase):
@@ -40,5 +57,55 @@ class TestDashboard(unittest.TestCase):
             self.assertEqual(summary.extraction_counts.get("w2"), 1)
 
 
+class TestDashboardIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        extraction = ExtractionResult()
+        extraction.w2.append(W2Data())
+        for name in ("Alpha", "Beta"):
+            _write_outputs(self.root / name, ["w2", "unknown"], "# Q\n\n- Send 1098\n")
+            write_client_summary(self.root / name, ["w2", "unknown"], extraction, "# Q\n\n- Send 1098\n")
+        (self.root / "NoOutputs").mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_process_outputs_served_from_index_without_parsing(self):
+        self.assertTrue((self.root / "Alpha" / "_workpapers" / SUMMARY_FILE).exists())
+        self.assertEqual(len((self.root / INDEX_FILE).read_text(encoding="utf-8").splitlines()), 2)
+        with mock.patch.object(dashboard, "build_client_summary", side_effect=AssertionError("parsed")):
+            summaries = list_client_summaries(self.root)
+        self.assertEqual([s.client for s in summaries], ["Alpha", "Beta", "NoOutputs"])
+        alpha = summaries[0]
+        self.assertEqual((alpha.document_count, alpha.unknown_count, alpha.task_count), (2, 1, 1))
+        self.assertEqual(alpha.extraction_counts["w2"], 1)
+        self.assertFalse(summaries[2].has_outputs)
+
+    def test_only_changed_client_is_revalidated(self):
+        _write_outputs(self.root / "Beta", ["w2", "w2", "error"], "# Q\n")
+        with mock.patch.object(dashboard, "build_client_summary", wraps=build_client_summary) as parse:
+            summaries = list_client_summaries(self.root)
+            list_client_summaries(self.root)
+        parse.assert_called_once_with(self.root / "Beta")
+        beta = summaries[1]
+        self.assertEqual((beta.document_count, beta.error_count, beta.task_count), (3, 1, 0))
+
+    def test_query_sorts_pages_and_rejects_unknown_names(self):
+        page = query_client_summaries(self.root, sort="docs", descending=True, per_page=2, page=9)
+        self.assertEqual((page.total, page.pages, page.page), (3, 2, 2))
+        self.assertEqual([s.client for s in page.clients], ["NoOutputs"])
+        with self.assertRaises(ValueError):
+            query_client_summaries(self.root, sort="size")
+        with self.assertRaises(ValueError):
+            query_client_summaries(self.root, filters=["vip"])
+
+    def test_index_is_compacted(self):
+        for _ in range(20):
+            dashboard._append_index(self.root, [json.loads((self.root / "Alpha" / "_workpapers" / SUMMARY_FILE).read_text())])
+        list_client_summaries(self.root)
+        self.assertEqual(len((self.root / INDEX_FILE).read_text(encoding="utf-8").splitlines()), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
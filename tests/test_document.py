@@ -0,0 +1,61 @@
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+
+from src.classify import classify_document
+from src.extract.document import Document
+from src.extract.form_1099_nec import parse_1099_nec_text
+from src.extract.schedule_c import parse_schedule_c_text
+from src.extract.w2 import parse_w2_text
+
+from tests.test_schedule_c import SAMPLE_FILLED_SCHEDULE_C
+
+
+_NEC = (
+    "Form 1099-NEC 2024 Nonemployee Compensation\n"
+    "PAYER'S name: Acme Consulting LLC\n"
+    "PAYER'S TIN 12-3456789\n"
+    "1 Nonemployee compensation $ 12,5O0.00\n"
+)
+
+
+class TestDocumentViews(unittest.TestCase):
+    def test_views_of_normalized_text(self):
+        doc = Document("Form  W-2  2024\n\n\n\nWages 1,2O0.50 and 2023 refund 3.00")
+        self.assertEqual(doc.normalized, "Form W-2 2024\n\nWages 1,200.50 and 2023 refund 3.00")
+        self.assertEqual(doc.lines, ["Form W-2 2024", "", "Wages 1,200.50 and 2023 refund 3.00"])
+        self.assertEqual(doc.lower, doc.normalized.lower())
+        self.assertEqual([(a.value, a.token) for a in doc.amount_tokens], [(1200.5, "1,200.50"), (3.0, "3.00")])
+        self.assertEqual(doc.years, [2024, 2023])
+        self.assertIs(doc.normalized, doc.normalized)
+
+    def test_page_offsets(self):
+        pages = ["  first page\n", "", "second page", "third"]
+        doc = Document("\n".join(pages).strip(), pages)
+        self.assertEqual(doc.page_offsets, [0, 10, 13, 25])
+        self.assertEqual(doc.page_at(0), 1)
+        self.assertEqual(doc.page_at(doc.text.index("second")), 3)
+        self.assertEqual(doc.page_at(len(doc.text) - 1), 4)
+        self.assertEqual(Document("no pages").page_offsets, [0])
+
+
+class TestDocumentConsumers(unittest.TestCase):
+    def test_parsers_accept_document(self):
+        for parse, text in (
+            (parse_1099_nec_text, _NEC),
+            (parse_schedule_c_text, SAMPLE_FILLED_SCHEDULE_C),
+            (parse_w2_text, _NEC),
+        ):
+            self.assertEqual(asdict(parse(Document(text))), asdict(parse(text)), parse.__name__)
+
+    def test_classify_accepts_document(self):
+        path = Path("/tmp/2023 schedule c.pdf")
+        self.assertEqual(
+            classify_document(path, Document(SAMPLE_FILLED_SCHEDULE_C)),
+            classify_document(path, SAMPLE_FILLED_SCHEDULE_C),
+        )
+        self.assertEqual(classify_document(path, Document(SAMPLE_FILLED_SCHEDULE_C))[2], 2024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,8 @@ import unittest
 
 from src.extract.brokerage_1099 import parse_brokerage_1099_text
 from src.extract.form_1098 import parse_1098_text
-from src.extract.w2 import parse_w2_text
+from src.extract.text_utils import normalize_extracted_text
+from src.extract.w2 import _W2Index, _detect_box13, _split_copies, parse_w2_text
 
 
 class TestParsers(unittest.TestCase):
@@ -549,5 +550,107 @@ class TestParsers(unittest.TestCase):
         self.assertIsNotNone(data.employee_name)
 
 
+class TestW2Index(unittest.TestCase):
+    def test_pairs_are_same_line_and_non_overlapping(self):
+        index = _W2Index(
+            "68357.36 6879.62 68357.36 6879.62\n"
+            "1,000.00 2.00 3.00\n"
+            "4.00\n5.00\n"
+            "6.00 x 7.00\n"
+        )
+        self.assertEqual(index.pairs, [(68357.36, 6879.62), (1000.00, 2.00)])
+        self.assertEqual(list(index.values_after("68357.36")), [6879.62, 6879.62])
+
+    def test_box13_proximity_uses_line_offsets(self):
+        near = "D 4686.12\n" + "filler\n" * 10 + "X X\n"
+        far = "D 4686.12\n" + "filler line\n" * 40 + "X\n"
+        self.assertTrue(_detect_box13(near))
+        self.assertFalse(_detect_box13(far))
+        self.assertFalse(_detect_box13("X\n" + "filler\n" * 3))
+
+    def test_parse_w2_four_copy_page(self):
+        """Four stacked copies with noise between them parse like a single copy."""
+        copy = (
+            "68357.36 6879.62 68357.36 6879.62\n"
+            "73043.48 4528.70 73043.48 4528.70\n"
+            "73043.48 1059.13 73043.48 1059.13\n"
+            "The Companies, Inc. The Companies, Inc.\n"
+            "220 Avenue 220 Avenue\n"
+            "Indianapolis, IN 46204 Indianapolis, IN 46204\n"
+            "BRITTANY T WEBB BRITTANY T WEBB\n"
+            "6311 Woodbrook Ln 6311 Woodbrook Ln\n"
+            "Houston, TX 77008 Houston, TX 77008\n"
+            "D 4686.12 D 4686.12\n"
+            "X X\n"
+            "Copy B To Be Filed With Employee's FEDERAL Tax Return 1 2 3\n"
+        )
+        data = parse_w2_text(copy * 4)
+        self.assertEqual(data.box1_wages, 68357.36)
+        self.assertEqual(data.box2_fed_withholding, 6879.62)
+        self.assertEqual(data.box4_ss_tax, 4528.70)
+        self.assertEqual(data.box6_medicare_tax, 1059.13)
+        self.assertEqual(data.box12, {"D": 4686.12})
+        self.assertTrue(data.box13_retirement_plan)
+
+
+_IRS_COPY = (
+    "b Employer identification number (EIN)\n12-1234567\n"
+    "c Employer's name, address, and ZIP code\nCompany ABC\n444 Example Road\nColumbus OH 43218\n"
+    "1 Wages, tips, other compensation 50000.00\n2 Federal income tax withheld 4300.00\n"
+    "3 Social security wages 50000.00\n4 Social security tax withheld 3100.00\n"
+    "5 Medicare wages and tips 50000.00\n6 Medicare tax withheld 725.00\n"
+    "e Employee's first name and initial Last name Suff.\nAbby L Smith\n"
+    "f Employee's address and ZIP code\n123 Sample Road\nColumbus OH 43218\n"
+    "12a See instructions for box 12\nD 2000.00\n"
+    "Form W-2 Wage and Tax Statement 2025\n"
+)
+_CAPTIONS = (
+    "Copy B To Be Filed With Employee's FEDERAL Tax Return",
+    "Copy C For EMPLOYEE'S RECORDS",
+    "Copy 2 To Be Filed With Employee's State, City, or Local Income Tax Return",
+    "Copy 2 To Be Filed With Employee's State, City, or Local Income Tax Return",
+)
+
+
+def _four_copies(*copies):
+    return "".join(copy + caption + "\n" for copy, caption in zip(copies, _CAPTIONS))
+
+
+class TestW2Copies(unittest.TestCase):
+    def test_split_copies(self):
+        page = normalize_extracted_text(_four_copies(*[_IRS_COPY] * 4))
+        copies = _split_copies(page)
+        self.assertEqual(len(copies), 4)
+        self.assertTrue(all(c.endswith(cap) for c, cap in zip(copies, _CAPTIONS)))
+        self.assertEqual(_split_copies(normalize_extracted_text(_IRS_COPY)), [normalize_extracted_text(_IRS_COPY)])
+
+    def test_identical_copies_parse_like_one(self):
+        single = parse_w2_text(_IRS_COPY)
+        self.assertEqual(parse_w2_text(_four_copies(*[_IRS_COPY] * 4)), single)
+        self.assertEqual(single.confidence, 1.0)
+
+    def test_damaged_copy_is_outvoted_and_lowers_confidence(self):
+        damaged = _IRS_COPY.replace("725.00", "72.50")
+        data = parse_w2_text(_four_copies(damaged, _IRS_COPY, _IRS_COPY, _IRS_COPY))
+        self.assertEqual(data.box6_medicare_tax, 725.00)
+        self.assertEqual(data.confidence, 0.95)
+
+    def test_copies_with_different_amounts_fall_back_to_whole_text(self):
+        with_dd = _IRS_COPY.replace("D 2000.00\n", "D 2000.00\nDD 900.00\n")
+        with_w = _IRS_COPY.replace("D 2000.00\n", "D 2000.00\nW 300.00\n")
+        data = parse_w2_text(_four_copies(_IRS_COPY, with_dd, with_w, _IRS_COPY))
+        self.assertEqual(data.box12, {"D": 2000.00, "DD": 900.00, "W": 300.00})
+
+
+class TestNormalizeText(unittest.TestCase):
+    def test_rewrites(self):
+        raw = "Box l wages 1O2,3l4.50 – Box\tI\n\n\n\n  2− 3\t\t4 lO1"
+        self.assertEqual(normalize_extracted_text(raw), "Box 1 wages 102,314.50 - Box 1\n\n 2- 3 4 lO1")
+
+    def test_letters_outside_numbers_untouched(self):
+        text = "Bolivia Oil Box lid 1 O 2 Il"
+        self.assertEqual(normalize_extracted_text(text), text)
+
+
 if __name__ == "__main__":
     unittest.main()
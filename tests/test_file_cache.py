@@ -0,0 +1,127 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.file_cache import FileCache
+
+
+def _read(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _file(self, name: str, text: str) -> Path:
+        p = self.root / name
+        p.write_text(text, encoding="utf-8")
+        return p
+
+    def test_hit_miss_and_revalidation(self):
+        cache = FileCache()
+        p = self._file("a.csv", "one")
+        self.assertEqual(cache.get(p, _read), "one")
+        self.assertEqual(cache.get(p, _read), "one")
+
+        p.write_text("two!", encoding="utf-8")
+        os.utime(p, ns=(1, 1))
+        self.assertEqual(cache.get(p, _read), "two!")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["stale"], stats["entries"]), (1, 2, 1, 1))
+
+        p.unlink()
+        self.assertIsNone(cache.get(p, _read))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_by_identity_follows_renames(self):
+        cache = FileCache(by_identity=True)
+        p = self._file("a.csv", "abc")
+        self.assertIsNone(cache.peek(p, _read))
+        self.assertEqual(cache.get(p, _read), "abc")
+        moved = self.root / "moved.csv"
+        os.rename(p, moved)
+        self.assertEqual(cache.peek(moved, _read), "abc")
+        self.assertEqual(cache.get(moved, _read), "abc")
+        self.assertEqual(cache.stats()["misses"], 1)
+
+        other = self._file("b.csv", "xyz")
+        cache.put(other, _read, "precomputed")
+        self.assertEqual(cache.get(other, _read), "precomputed")
+
+    def test_by_identity_without_inode_numbers_keys_by_path(self):
+        cache = FileCache(by_identity=True)
+        a, b = self._file("a.csv", "abc"), self._file("b.csv", "xyz")
+
+        def stat(path):
+            # FAT-like: no inode numbers, and both files written in the same tick.
+            return SimpleNamespace(st_dev=1, st_ino=0, st_size=3, st_mtime_ns=1_000)
+
+        with patch("src.file_cache.os.stat", side_effect=stat):
+            self.assertEqual(cache.get(a, _read), "abc")
+            self.assertEqual(cache.get(b, _read), "xyz")
+            self.assertEqual(cache.peek(a, _read), "abc")
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_loaders_do_not_share_entries(self):
+        cache = FileCache()
+        p = self._file("a.csv", "abc")
+        self.assertEqual(cache.get(p, _read), "abc")
+        self.assertEqual(cache.get(p, lambda path: len(_read(path))), 3)
+
+    def test_bounded_by_entries_and_bytes(self):
+        cache = FileCache(max_entries=2, max_bytes=1_000)
+        paths = [self._file(f"{i}.txt", "x" * 100) for i in range(3)]
+        for p in paths:
+            cache.get(p, _read)          # third load evicts 0
+        cache.get(paths[0], _read)       # reload 0, evicts 1
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+        small = FileCache(max_bytes=250)
+        for p in paths:
+            small.get(p, _read)
+        self.assertEqual(small.stats()["bytes"], 200)
+        big = self._file("big.txt", "x" * 500)
+        self.assertEqual(small.get(big, _read), "x" * 500)  # too big to cache, still returned
+        self.assertEqual(small.stats()["entries"], 2)
+
+    def test_oversized_file_leaves_no_key_lock(self):
+        cache = FileCache(max_bytes=100)
+        big = self._file("big.txt", "x" * 500)
+        for _ in range(2):
+            self.assertEqual(cache.get(big, _read), "x" * 500)
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache._key_locks, {})
+
+    def test_concurrent_misses_load_once(self):
+        cache = FileCache()
+        p = self._file("a.csv", "slow")
+        calls = []
+
+        def slow(path):
+            calls.append(path)
+            time.sleep(0.05)
+            return _read(path)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get(p, slow))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ["slow"] * 8)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
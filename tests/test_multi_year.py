@@ -0,0 +1,104 @@
+import csv
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.config import AppConfig
+from src.main import parse_history_root, write_multi_year_reports
+from src.multi_year import collect_history, extract_metrics, find_anomalies
+
+
+def _write_extract(root: Path, client: str, data: dict) -> None:
+    wp = root / client / "_workpapers"
+    wp.mkdir(parents=True, exist_ok=True)
+    (wp / "Data_Extract.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def _w2(wages: float, **extra) -> dict:
+    return {"w2": [{"box1_wages": wages, "box2_fed_withholding": 10_000.0, "year": 2024, "confidence": 0.9,
+                    "box13_retirement_plan": True, **extra}]}
+
+
+class TestMultiYear(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        base = Path(self.tmp.name)
+        self.roots = {y: base / str(y) for y in (2021, 2022, 2023, 2024)}
+        for year, root in self.roots.items():
+            _write_extract(root, "Steady", _w2(100_000.0 + 1_000 * (year - 2021)))
+        # Jumpy: wages spike in the current year; mortgage disappears.
+        for year, wages in ((2021, 80_000.0), (2022, 81_000.0), (2023, 82_000.0), (2024, 95_000.0)):
+            data = _w2(wages)
+            if year < 2024:
+                data["form_1098"] = [{"mortgage_interest_received": 9_000.0}]
+            _write_extract(self.roots[year], "Jumpy", data)
+        # Newbie has no history at all.
+        _write_extract(self.roots[2024], "Newbie", _w2(50_000.0))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_extract_metrics_sums_every_numeric_field(self):
+        data = {
+            "w2": [{"box1_wages": 10.0, "box12": {"D": 5.0}, "confidence": 1.0, "year": 2024},
+                   {"box1_wages": 2.5, "box12": {"D": 1.0, "W": 3.0}, "box13_retirement_plan": True}],
+            "brokerage_1099": [{"div_ordinary": 7.0, "b_summary": {"wash_sales": 4.0, "note": "x"}}],
+            "brokerage_1099_trades": [{"proceeds_gross": 1e6}],
+        }
+        self.assertEqual(extract_metrics(data), {
+            "w2.box1_wages": 12.5, "w2.box12.D": 6.0, "w2.box12.W": 3.0,
+            "brokerage_1099.div_ordinary": 7.0, "brokerage_1099.b_summary.wash_sales": 4.0,
+        })
+
+    def test_anomalies(self):
+        history = collect_history(["Jumpy", "Newbie", "Steady"], self.roots)
+        self.assertEqual(history.years, [2021, 2022, 2023, 2024])
+        found = {(a.client, a.metric): a for a in find_anomalies(history)}
+        self.assertEqual(found[("Jumpy", "form_1098.mortgage_interest_received")].reason, "dropped")
+        wages = found[("Jumpy", "w2.box1_wages")]
+        self.assertEqual(wages.reason, "zscore")          # +15.9%: under the pct threshold
+        self.assertAlmostEqual(wages.zscore, 14.0)
+        self.assertNotIn("Steady", {a.client for a in found.values()})
+        self.assertNotIn("Newbie", {a.client for a in found.values()})   # no prior extract at all
+
+        strict = find_anomalies(history, pct_threshold=10.0)
+        self.assertEqual({a.reason for a in strict if a.metric == "w2.box1_wages"}, {"pct_change"})
+
+    def test_reports_written(self):
+        config = AppConfig(root=self.roots[2024], tax_year=2024,
+                           history_roots=tuple((y, r) for y, r in self.roots.items() if y < 2024))
+        clients = sorted(p for p in self.roots[2024].iterdir())
+        self.assertEqual(write_multi_year_reports(clients, config), 2)
+        md = (self.roots[2024] / "Jumpy" / "_workpapers" / "Multi_Year_Comparison.md").read_text(encoding="utf-8")
+        self.assertIn("| w2.box1_wages | 80,000.00 | 81,000.00 | 82,000.00 | 95,000.00 |", md)
+        self.assertIn("missing this year", md)
+        with (self.roots[2024] / "Firm_Anomalies.csv").open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual({r["client"] for r in rows}, {"Jumpy"})
+
+    def test_single_client_run_replaces_only_its_rows(self):
+        history_roots = tuple((y, r) for y, r in self.roots.items() if y < 2024)
+        root = self.roots[2024]
+        clients = sorted(p for p in root.iterdir())
+        write_multi_year_reports(clients, AppConfig(root=root, tax_year=2024, history_roots=history_roots))
+        # Newbie's wages now jump too, with Jumpy's history unchanged.
+        for year in (2022, 2023):
+            _write_extract(self.roots[year], "Newbie", _w2(20_000.0))
+
+        config = AppConfig(root=root, tax_year=2024, history_roots=history_roots, client_filter="newbie")
+        self.assertEqual(write_multi_year_reports([root / "Newbie"], config), 1)
+        with (root / "Firm_Anomalies.csv").open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([r["client"] for r in rows], ["Jumpy", "Jumpy", "Newbie"])
+        self.assertEqual(rows[2]["metric"], "w2.box1_wages")
+
+    def test_parse_history_root(self):
+        self.assertEqual(parse_history_root("2022=/data/old"), (2022, Path("/data/old")))
+        self.assertEqual(parse_history_root("/data/TaxClients/2021"), (2021, Path("/data/TaxClients/2021")))
+        with self.assertRaises(Exception):
+            parse_history_root("/data/archive")
+
+
+if __name__ == "__main__":
+    unittest.main()
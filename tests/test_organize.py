@@ -1,8 +1,24 @@
+import errno
+import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from src.organize import OwnerContext, detect_owner_from_name, organize_client_documents
+from src.extract.document import Document
+from src.extract.generic_pdf import cache_document, cached_document, get_document_cached
+from src.organize import (
+    OwnerContext,
+    _doc_bucket,
+    _link_or_move,
+    _write_journal,
+    detect_owner_from_name,
+    organize_client_documents,
+    plan_organization,
+    recover_organization,
+)
+
+_RYAN = OwnerContext(taxpayer_name="Ryan Kern", spouse_name="Brittany Kern")
 
 
 class TestOrganize(unittest.TestCase):
@@ -33,6 +49,110 @@ class TestOrganize(unittest.TestCase):
             self.assertTrue((client / "01_Taxpayer" / "W2" / "2024_W2_Ryan_ABC.pdf").exists())
             self.assertTrue((client / "01_Taxpayer" / "Form_1098" / "2024_1098_Mortgage_Ryan_WF.pdf").exists())
 
+    def test_organize_classifies_content_and_keeps_extraction(self):
+        with tempfile.TemporaryDirectory() as td:
+            client = Path(td) / "Kern_Ryan_Brittany_MFJ"
+            inbox = client / "Inbox"
+            inbox.mkdir(parents=True)
+            scan = inbox / "scan_0001.pdf"
+            scan.write_text("dummy", encoding="utf-8")
+            # Stands in for the PDF's text, as if a previous pass extracted it.
+            cache_document(scan, False, Document("Form SSA-1099 Social Security Benefit Statement 2024"), ["n"])
+
+            ops = organize_client_documents(client, OwnerContext(taxpayer_name="Ryan Kern"))
+            moved = client / "04_Unsorted" / "SSA_1099" / "scan_0001.pdf"
+            self.assertEqual(ops[0]["doc_type"], "ssa_1099")
+            self.assertTrue(moved.exists())
+            doc, notes = get_document_cached(moved, False)
+            self.assertIn("Social Security", doc.text)
+            self.assertEqual(notes, ["n"])
+            self.assertIsNone(cached_document(moved, True))
+
+    def test_every_doc_type_has_a_bucket(self):
+        doc_types = {"w2", "brokerage_1099", "form_1098", "form_1098_t", "form_1099_nec", "form_1099_r",
+                     "form_1099_g", "form_1099_misc", "form_1099_q", "form_1099_sa", "ssa_1099",
+                     "schedule_c", "prior_year_return"}
+        self.assertEqual(_doc_bucket("unknown"), "Other")
+        buckets = {_doc_bucket(t) for t in doc_types}
+        self.assertNotIn("Other", buckets)
+        self.assertEqual(len(buckets), len(doc_types))
+
+
+class TestOrganizePlanApply(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = Path(self.tmp.name) / "Kern_Ryan_Brittany_MFJ"
+        for rel in ("Inbox/a/2024_W2_Ryan.pdf", "Inbox/b/2024_W2_Ryan.pdf", "Inbox/2024_1098_Ryan.pdf",
+                    "01_Taxpayer/W2/2024_W2_Ryan.pdf"):
+            path = self.client / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(rel, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _files(self) -> dict[str, str]:
+        return {
+            str(p.relative_to(self.client)): p.read_text(encoding="utf-8")
+            for p in self.client.rglob("*") if p.is_file() and "_workpapers" not in p.parts
+        }
+
+    def test_plan_suffixes_collisions_without_touching_disk(self):
+        before = self._files()
+        ops = plan_organization(self.client, _RYAN)
+        self.assertEqual(self._files(), before)
+        self.assertEqual(
+            [str(Path(op["destination"]).relative_to(self.client)) for op in ops],
+            ["01_Taxpayer/Form_1098/2024_1098_Ryan.pdf", "01_Taxpayer/W2/2024_W2_Ryan_1.pdf",
+             "01_Taxpayer/W2/2024_W2_Ryan_2.pdf"],
+        )
+        self.assertFalse((self.client / "01_Taxpayer" / "Form_1098").exists())
+
+        self.assertEqual(organize_client_documents(self.client, _RYAN), ops)
+        self.assertEqual(self._files(), {
+            "01_Taxpayer/W2/2024_W2_Ryan.pdf": "01_Taxpayer/W2/2024_W2_Ryan.pdf",
+            "01_Taxpayer/W2/2024_W2_Ryan_1.pdf": "Inbox/a/2024_W2_Ryan.pdf",
+            "01_Taxpayer/W2/2024_W2_Ryan_2.pdf": "Inbox/b/2024_W2_Ryan.pdf",
+            "01_Taxpayer/Form_1098/2024_1098_Ryan.pdf": "Inbox/2024_1098_Ryan.pdf",
+        })
+        self.assertFalse((self.client / "_workpapers" / "Organization_Journal.json").exists())
+
+    def _crash_after_first_link(self) -> dict[str, str]:
+        before = self._files()
+        ops = plan_organization(self.client, _RYAN)
+        moves = [(Path(op["source"]), Path(op["destination"])) for op in ops]
+        _write_journal(self.client, moves)
+        moves[0][1].parent.mkdir(parents=True)
+        os.link(moves[0][0], moves[0][1])
+        return before
+
+    def test_interrupted_run_resumes(self):
+        self._crash_after_first_link()
+        organize_client_documents(self.client, _RYAN)
+        self.assertEqual(sorted(self._files()), [
+            "01_Taxpayer/Form_1098/2024_1098_Ryan.pdf", "01_Taxpayer/W2/2024_W2_Ryan.pdf",
+            "01_Taxpayer/W2/2024_W2_Ryan_1.pdf", "01_Taxpayer/W2/2024_W2_Ryan_2.pdf",
+        ])
+        self.assertFalse(recover_organization(self.client))
+
+    def test_interrupted_run_rolls_back(self):
+        before = self._crash_after_first_link()
+        self.assertTrue(recover_organization(self.client, rollback=True))
+        self.assertEqual(self._files(), before)
+
+    def test_link_falls_back_to_move_only_without_hardlinks(self):
+        source, taken, free = self.client / "a.pdf", self.client / "b.pdf", self.client / "c.pdf"
+        source.write_text("new")
+        taken.write_text("existing")
+        with self.assertRaises(FileExistsError):
+            _link_or_move(source, taken)
+        self.assertEqual(taken.read_text(), "existing")
+
+        with patch("src.organize.os.link", side_effect=OSError(errno.EXDEV, "cross-device")):
+            _link_or_move(source, free)
+        self.assertFalse(source.exists())
+        self.assertEqual(free.read_text(), "new")
+
 
 if __name__ == "__main__":
     unittest.main()
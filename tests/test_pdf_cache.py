@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from preparer import pdf_cache
+
+
+class TestPdfCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.forms = self.root / "forms"
+        self.forms.mkdir()
+        (self.forms / "f1040.pdf").write_bytes(b"%PDF-template")
+        self.cache = str(self.root / "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprint_tracks_data_and_templates(self):
+        key = pdf_cache.fingerprint({"lines": [1]}, str(self.forms))
+        self.assertEqual(key, pdf_cache.fingerprint({"lines": [1]}, str(self.forms)))
+        self.assertNotEqual(key, pdf_cache.fingerprint({"lines": [2]}, str(self.forms)))
+
+        (self.forms / "f1040.pdf").write_bytes(b"%PDF-template-v2")
+        self.assertNotEqual(key, pdf_cache.fingerprint({"lines": [1]}, str(self.forms)))
+
+    def test_fingerprint_tracks_filler_version(self):
+        key = pdf_cache.fingerprint({"lines": [1]}, str(self.forms))
+        with patch("preparer.pdf_cache._filler_version", return_value="next-release"):
+            self.assertNotEqual(key, pdf_cache.fingerprint({"lines": [1]}, str(self.forms)))
+
+    def test_round_trip_and_miss(self):
+        self.assertIsNone(pdf_cache.get(self.cache, "abc"))
+        pdf_cache.put(self.cache, "abc", b"%PDF-1")
+        self.assertEqual(pdf_cache.get(self.cache, "abc"), b"%PDF-1")
+
+    def test_evicts_least_recently_used(self):
+        for i, key in enumerate(["a", "b", "c"]):
+            pdf_cache.put(self.cache, key, b"x" * 100, max_bytes=1000)
+            os.utime(Path(self.cache) / f"{key}.pdf", (i, i))
+        pdf_cache.get(self.cache, "a")  # refresh "a" so "b" is now oldest
+
+        pdf_cache.put(self.cache, "d", b"x" * 100, max_bytes=300)
+        remaining = sorted(p.stem for p in Path(self.cache).glob("*.pdf"))
+        self.assertEqual(remaining, ["a", "c", "d"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from preparer.database import (
+    delete_parsed_document,
+    get_parsed_documents,
+    get_trades_page,
+    init_preparer_db,
+    upsert_parsed_document,
+)
+
+
+def _trade(i: int, box: str = "A", withheld=None) -> dict:
+    return {
+        "broker_name": "Fidelity",
+        "description": f"SECURITY {i}",
+        "security_identifier": f"T{i}",
+        "date_acquired": "2024-01-02",
+        "date_sold_or_disposed": "2024-03-04",
+        "proceeds_gross": 100.0 + i,
+        "cost_basis": 90.0,
+        "federal_income_tax_withheld": withheld,
+        "holding_period": "short",
+        "basis_reported_to_irs": "covered",
+        "form_8949_box": box,
+    }
+
+
+class TestPreparerTrades(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = str(Path(self.tmp.name) / "preparer.db")
+        init_preparer_db(self.db)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _upsert(self, upload_id: int, trades: list[dict]) -> None:
+        upsert_parsed_document(
+            db_path=self.db, upload_id=upload_id, user_id=1, tax_year=2024,
+            category="Brokerage_1099", original_name=f"b{upload_id}.pdf", file_path="",
+            doc_type="brokerage_1099", confidence=0.9, parsing_status="done", parse_error=None,
+            extracted_json={"brokerage_1099": [{"broker_name": "Fidelity", "account_number": "X123"}],
+                            "brokerage_1099_trades": trades},
+            drake_json={}, flags=[],
+        )
+
+    def test_trades_split_out_of_extracted_json(self):
+        self._upsert(10, [_trade(i, withheld=1.5) for i in range(3)])
+        docs = get_parsed_documents(self.db, 1, 2024)
+        self.assertEqual(len(docs), 1)
+        self.assertNotIn("brokerage_1099_trades", docs[0]["extracted_json"])
+        self.assertEqual(docs[0]["trade_count"], 3)
+        self.assertAlmostEqual(docs[0]["trade_fed_withheld"], 4.5)
+
+    def test_reparse_replaces_trades(self):
+        self._upsert(10, [_trade(i) for i in range(5)])
+        self._upsert(10, [_trade(i) for i in range(2)])
+        self.assertEqual(get_trades_page(self.db, 1, 2024)["total"], 2)
+
+    def test_pagination_and_box_filter(self):
+        self._upsert(10, [_trade(i, box="A" if i % 2 else "D") for i in range(25)])
+        page = get_trades_page(self.db, 1, 2024, page=3, per_page=10)
+        self.assertEqual(page["total"], 25)
+        self.assertEqual(page["pages"], 3)
+        self.assertEqual([t["description"] for t in page["trades"]],
+                         [f"SECURITY {i}" for i in range(20, 25)])
+        self.assertEqual(page["trades"][0]["account_number"], "X123")
+
+        boxed = get_trades_page(self.db, 1, 2024, form_8949_box="A", per_page=100)
+        self.assertEqual(boxed["total"], 12)
+        self.assertTrue(all(t["form_8949_box"] == "A" for t in boxed["trades"]))
+
+    def test_delete_removes_trades(self):
+        self._upsert(10, [_trade(0)])
+        delete_parsed_document(self.db, 10)
+        self.assertEqual(get_trades_page(self.db, 1, 2024)["total"], 0)
+
+    def test_init_migrates_embedded_trades(self):
+        conn = sqlite3.connect(self.db)
+        conn.execute(
+            """INSERT INTO parsed_documents
+               (upload_id, user_id, tax_year, category, original_name, file_path, extracted_json)
+               VALUES (7, 1, 2024, 'Brokerage_1099', 'old.pdf', '', ?)""",
+            (json.dumps({"brokerage_1099": [], "brokerage_1099_trades": [_trade(1), _trade(2)]}),),
+        )
+        conn.commit()
+        conn.close()
+
+        init_preparer_db(self.db)
+        docs = get_parsed_documents(self.db, 1, 2024)
+        self.assertNotIn("brokerage_1099_trades", docs[0]["extracted_json"])
+        self.assertEqual(docs[0]["trade_count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
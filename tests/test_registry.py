@@ -0,0 +1,128 @@
+import subprocess
+import sys
+import unittest
+from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import patch
+
+from src.config import AppConfig
+from src.extract import registry
+from src.extract.document import Document
+from src.extract.registry import DocTypeHandler, ParseInput, Parsed, get_handler, register_doc_type
+from src.main import _escalate_to_azure, _parse_locally, _StagedFile
+
+ROOT = Path(__file__).parent.parent
+EXAMPLES = ROOT / "examples" / "forms" / "1099"
+
+# Modules any run needs; every other src.extract module is a parser.
+_STARTUP_EXTRACT_MODULES = {"document", "generic_pdf", "registry", "text_utils"}
+
+
+@dataclass
+class _FakeForm:
+    payer_name: str
+    confidence: float
+
+
+def _staged(name: str, confidence: float) -> _StagedFile:
+    doc = Document("")
+    return _StagedFile(
+        row={"file_path": f"/tmp/{name}.pdf", "sha256": ""},
+        doc_type="fake_form",
+        notes=[],
+        input=ParseInput(Path(f"/tmp/{name}.pdf"), "", doc, 2024),
+        parsed=Parsed(_FakeForm(name, confidence)),
+    )
+
+
+class TestRegistry(unittest.TestCase):
+    def test_builtin_types_registered(self):
+        for doc_type in ("w2", "brokerage_1099", "form_1098", "ssa_1099", "schedule_c"):
+            self.assertIsNotNone(get_handler(doc_type), doc_type)
+        self.assertIsNone(get_handler("prior_year_return"))
+        self.assertEqual(get_handler("ssa_1099").issuer(None), "Social Security Administration")
+
+    def test_structured_brokerage_csv(self):
+        row = {"file_path": str(EXAMPLES / "XXXX-X341 (1).CSV"), "sha256": "abc"}
+        staged = _parse_locally(row, AppConfig(root=EXAMPLES, tax_year=2024))
+        self.assertIsNone(staged.error)
+        self.assertEqual(staged.doc_type, "brokerage_1099")
+        self.assertEqual(staged.notes, ["structured:csv"])
+        self.assertTrue(staged.parsed.structured)
+        trades = staged.parsed.related["brokerage_1099_trades"]
+        self.assertGreater(len(trades), 0)
+        self.assertEqual(staged.parsed.key_fields, {"trade_count": len(trades)})
+
+
+class TestAzureEscalation(unittest.TestCase):
+    def _escalate(self, staged, azure, **config):
+        handler = DocTypeHandler(
+            slot="form_1099_nec",
+            parse=lambda inp: Parsed(_FakeForm("local", 0.0)),
+            issuer=lambda d: d.payer_name,
+            azure_parse=azure,
+            azure_threshold=0.85,
+        )
+        with patch.dict(registry._HANDLERS):
+            register_doc_type("fake_form", handler)
+            _escalate_to_azure(staged, AppConfig(root=Path("/tmp"), tax_year=2024, **config))
+
+    def test_notes_and_results(self):
+        results = {"better": _FakeForm("azure", 0.9), "worse": _FakeForm("azure", 0.1), "missing": None}
+
+        def azure(path, endpoint, key):
+            if path.stem == "broken":
+                raise RuntimeError("service down")
+            return results[path.stem]
+
+        staged = [_staged(name, conf) for name, conf in (
+            ("better", 0.5), ("worse", 0.5), ("missing", 0.25), ("confident", 0.9), ("broken", 0.5),
+        )]
+        self._escalate(staged, azure, enable_azure=True, azure_endpoint="https://x", azure_api_key="k")
+        better, worse, missing, confident, broken = staged
+        self.assertEqual(better.parsed.data.payer_name, "azure")
+        self.assertEqual(better.notes, ["azure:used:local_confidence_was:0.50"])
+        self.assertEqual(worse.parsed.data.payer_name, "worse")
+        self.assertEqual(worse.notes, ["azure:skipped_lower_confidence:local_confidence:0.50"])
+        self.assertEqual(missing.notes, ["azure:unavailable:local_confidence:0.25"])
+        self.assertEqual(confident.notes, ["azure:skipped:high_local_confidence:0.90"])
+        self.assertEqual(broken.error, "RuntimeError")
+
+    def test_disabled_or_unconfigured(self):
+        def azure(path, endpoint, key):
+            raise AssertionError("Azure must not be called")
+
+        staged = [_staged("low", 0.5)]
+        self._escalate(staged, azure)
+        self.assertEqual(staged[0].notes, [])
+        self._escalate(staged, azure, enable_azure=True)
+        self.assertEqual(staged[0].notes, [])
+
+
+class TestLazyImports(unittest.TestCase):
+    def _loaded_after(self, code: str) -> list[str]:
+        out = subprocess.run(
+            [sys.executable, "-c", f"{code}\nimport sys; print(' '.join(sys.modules))"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        return sorted(
+            m for m in out
+            if m.split(".")[0] == "azure"
+            or (m.startswith("src.extract.") and m.split(".")[2] not in _STARTUP_EXTRACT_MODULES)
+        )
+
+    def test_startup_loads_no_parsers(self):
+        self.assertEqual(self._loaded_after("import src.main, preparer.parser_bridge"), [])
+
+    def test_parser_loaded_on_first_use(self):
+        loaded = self._loaded_after(
+            "from src.extract.document import Document\n"
+            "from src.extract.registry import ParseInput, get_handler\n"
+            "from pathlib import Path\n"
+            "get_handler('form_1099_nec').parse(ParseInput(Path('a.pdf'), '', Document('Form 1099-NEC'), 2024))"
+        )
+        self.assertEqual(loaded, ["src.extract.form_1099_nec"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
+import re
 import unittest
 
 from src.classify import classify_document
 from pathlib import Path
 
-from src.extract.schedule_c import parse_schedule_c_text
+from src.extract.schedule_c import _MarkerIndex, parse_schedule_c_text
 
 
 SAMPLE_FILLED_SCHEDULE_C = """
@@ -207,6 +208,36 @@ class TestParseScheduleC(unittest.TestCase):
         self.assertEqual(data.confidence, 0.0)
 
 
+class TestMarkerIndex(unittest.TestCase):
+    def test_search_matches_re_search(self):
+        text = "21 Gross receipts 1.00\nB Other 16B 2.00\nx8 Advertising\n8 Advertising 8 3.00\n"
+        index = _MarkerIndex(text)
+        for pattern in (
+            r"1\s+Gross\s+receipts",        # no \b: matches inside "21"
+            r"\b1\s+Gross\s+receipts",      # \b: "21" does not count
+            r"\bb\s+Other",
+            r"\b16b\b",
+            r"\b8\s+Advertising\b[^\n]{0,80}?([\d,]+\.\d{2})",
+            r"All\s+investment",             # no marker: plain search
+        ):
+            expected = re.search(pattern, text, re.IGNORECASE)
+            found = index.search(pattern)
+            self.assertEqual(
+                expected and expected.span(), found and found.span(), pattern
+            )
+
+    def test_multi_business_return_uses_first_business(self):
+        second = SAMPLE_FILLED_SCHEDULE_C.replace("Acme Advisory LLC", "Second Shop LLC").replace(
+            "8 Advertising 8 4,500.00", "8 Advertising 8 999.00"
+        )
+        data = parse_schedule_c_text(SAMPLE_FILLED_SCHEDULE_C + SAMPLE_PART_III_IV_V + second)
+        self.assertEqual(data.line_c_business_name, "Acme Advisory LLC")
+        self.assertEqual(data.line_8_advertising, 4500.00)
+        self.assertEqual(data.line_16b_other_interest, 250.00)
+        self.assertEqual(data.line_42_cogs, 53300.00)
+        self.assertTrue(data.line_47b_evidence_written)
+
+
 class TestScheduleCClassification(unittest.TestCase):
     def test_classifies_filled_schedule_c(self):
         # Use a non-existent path; classify_document only inspects text + filename
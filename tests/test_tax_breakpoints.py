@@ -0,0 +1,63 @@
+import unittest
+
+from src.models import Brokerage1099Data, ExtractionResult, W2Data
+from src.tax_breakpoints import analyze_marginal_rates
+from src.tax_calculator import calculate_tax
+
+
+def _wage_earner(wages: float = 50_000.0) -> ExtractionResult:
+    r = ExtractionResult()
+    r.w2.append(W2Data(box1_wages=wages, box2_fed_withholding=4_000.0))
+    return r
+
+
+def _with_gains(gains: float) -> ExtractionResult:
+    r = _wage_earner()
+    r.brokerage_1099.append(Brokerage1099Data(b_long_term_covered=gains))
+    return r
+
+
+class TestMarginalRates(unittest.TestCase):
+    def test_ltcg_band_niit_and_top_rate(self):
+        a = analyze_marginal_rates(_wage_earner(), "long_term_cap_gains", tax_year=2024, upper=600_000.0)
+        self.assertEqual(a.marginal_rate, 0.0)
+        self.assertEqual(a.base_total_tax, calculate_tax(_wage_earner(), tax_year=2024).total_tax)
+
+        first = a.breakpoints[0]
+        self.assertEqual(first.delta, 11_625.0)
+        self.assertEqual((first.rate_before, first.rate_after), (0.0, 0.15))
+        self.assertEqual(a.headroom()[0][1], 11_625.0)
+        rates = [round(bp.rate_after, 3) for bp in a.breakpoints]
+        self.assertEqual(rates, [0.15, 0.188, 0.238])
+
+    def test_breakpoint_totals_match_calculate_tax(self):
+        a = analyze_marginal_rates(_wage_earner(), "long_term_cap_gains", tax_year=2024, upper=600_000.0)
+        for bp in a.breakpoints:
+            est = calculate_tax(_with_gains(bp.delta), tax_year=2024)
+            self.assertAlmostEqual(bp.total_tax, est.total_tax, places=6)
+
+    def test_tax_is_linear_between_breakpoints(self):
+        a = analyze_marginal_rates(_wage_earner(), "long_term_cap_gains", tax_year=2024, upper=600_000.0)
+        for left, right in zip(a.curve, a.curve[1:]):
+            mid = round((left["delta"] + right["delta"]) / 2, 2)
+            expected = left["total_tax"] + (right["total_tax"] - left["total_tax"]) * (
+                (mid - left["delta"]) / (right["delta"] - left["delta"]))
+            actual = calculate_tax(_with_gains(mid), tax_year=2024).total_tax
+            self.assertAlmostEqual(actual, expected, delta=0.02)
+
+    def test_ctc_phase_out_window_reported_with_steps(self):
+        a = analyze_marginal_rates(_wage_earner(), "w2_wages", num_children=2, tax_year=2024, upper=300_000.0)
+        ctc = [bp for bp in a.breakpoints if any("Child Tax Credit" in lbl and "phas" in lbl for lbl in bp.labels)]
+        self.assertEqual([bp.income for bp in ctc], [201_000.0, 280_000.0])
+        self.assertTrue(all(bp.step == 50.0 for bp in ctc))
+        self.assertIn(0.0, [p["delta"] for p in a.curve])
+
+    def test_rejects_unknown_dimension_and_empty_range(self):
+        with self.assertRaises(ValueError):
+            analyze_marginal_rates(_wage_earner(), "lottery_winnings")
+        with self.assertRaises(ValueError):
+            analyze_marginal_rates(_wage_earner(), "w2_wages", lower=10.0, upper=5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import csv
+import json
+import tempfile
+import time
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+
+from src.config import AppConfig
+from src.main import recompute_tax_estimates
+from src.models import (
+    Brokerage1099Data, ExtractionResult, Form1098Data, Form1099MISCData,
+    Form1099NECData, Form1099RData, FormSSA1099Data, ScheduleCData, W2Data,
+)
+from src.tax_calculator import calculate_tax
+from src.tax_scenarios import Scenario, calculate_tax_batch, run_scenarios, scenario_grid
+
+_COMPARED = (
+    "w2_wages", "ss_benefits_taxable", "total_income", "se_tax", "se_tax_deduction", "agi",
+    "standard_deduction", "itemized_deduction", "deduction_used", "qbi_deduction",
+    "taxable_income", "preferred_income", "ordinary_income_for_brackets", "regular_tax",
+    "ltcg_tax", "niit", "total_tax_before_credits", "child_tax_credit", "foreign_tax_credit",
+    "total_credits", "total_tax", "total_payments", "refund_or_owed",
+)
+
+
+def _client() -> ExtractionResult:
+    r = ExtractionResult()
+    r.w2.append(W2Data(box1_wages=182_000.0, box2_fed_withholding=31_000.0, box17_state_tax=9_400.0))
+    r.brokerage_1099.append(Brokerage1099Data(
+        div_ordinary=6_200.0, div_qualified=5_100.0, int_interest_income=1_350.0,
+        b_short_term_covered=-2_400.0, b_long_term_covered=38_000.0, section_1256_net_gain_loss=1_500.0,
+    ))
+    r.form_1098.append(Form1098Data(mortgage_interest_received=14_800.0, real_estate_taxes=7_300.0))
+    r.form_1099_nec.append(Form1099NECData(box1_nonemployee_compensation=24_000.0))
+    r.form_1099_misc.append(Form1099MISCData(box1_rents=6_000.0))
+    r.ssa_1099.append(FormSSA1099Data(box5_net_benefits=18_000.0))
+    return r
+
+
+def _with_deltas(s: Scenario) -> ExtractionResult:
+    """Scalar equivalent of a scenario's income deltas: extra documents appended last."""
+    r = _client()
+    r.w2.append(W2Data(box1_wages=s.w2_wages))
+    r.brokerage_1099.append(Brokerage1099Data(
+        int_interest_income=s.taxable_interest, b_long_term_covered=s.long_term_cap_gains,
+    ))
+    r.form_1099_nec.append(Form1099NECData(box1_nonemployee_compensation=s.schedule_c_net))
+    return r
+
+
+class TestTaxScenarios(unittest.TestCase):
+    def test_parity_with_scalar_calculate_tax(self):
+        grid = scenario_grid(
+            filing_status=["single", "mfj", "mfs", "hoh", "qss"],
+            num_children=[0, 3],
+            w2_wages=[0.0, -20_000.0, 350_000.0],
+            long_term_cap_gains=[0.0, -60_000.0],
+            schedule_c_net=[0.0, -30_000.0, 90_000.0],
+            foreign_tax_credit=[0.0, 400.0],
+        )
+        for year in (2024, 2025):
+            table = run_scenarios(_client(), grid, estimated_payments=2_000.0, tax_year=year)
+            for i, s in enumerate(grid):
+                est = calculate_tax(_with_deltas(s), filing_status=s.filing_status,
+                                    num_children=s.num_children, estimated_payments=2_000.0,
+                                    foreign_tax_credit=s.foreign_tax_credit, tax_year=year)
+                for name in _COMPARED:
+                    self.assertEqual(float(table.columns[name][i]), getattr(est, name),
+                                     f"{year} {s.label}: {name}")
+
+    def test_base_arguments_apply_when_not_overridden(self):
+        table = run_scenarios(_client(), [Scenario(), Scenario(filing_status="MFJ ")],
+                              filing_status="hoh", num_children=2, tax_year=2024)
+        self.assertEqual(list(table.columns["filing_status"]), ["hoh", "mfj"])
+        self.assertEqual(list(table.columns["num_children"]), [2, 2])
+        base = calculate_tax(_client(), filing_status="hoh", num_children=2, tax_year=2024)
+        self.assertEqual(table.rows()[0]["total_tax"], base.total_tax)
+
+    def test_unknown_field_rejected(self):
+        with self.assertRaises(ValueError):
+            scenario_grid(wages=[1.0])
+
+    def test_thousands_of_scenarios_are_fast(self):
+        grid = scenario_grid(filing_status=["single", "mfj", "mfs", "hoh"], num_children=[0, 1, 2, 3],
+                             w2_wages=[float(d) for d in range(-25_000, 25_000, 200)])
+        start = time.perf_counter()
+        table = run_scenarios(_client(), grid, tax_year=2025)
+        self.assertEqual(len(table), 4_000)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+def _firm() -> list:
+    """A spread of clients covering every notes branch in calculate_tax."""
+    clients = [ExtractionResult(), _client()]
+    for wages in (18_000.0, 64_000.0, 240_000.0, 900_000.0):
+        r = ExtractionResult()
+        r.w2.append(W2Data(box1_wages=wages, box2_fed_withholding=wages * 0.15, box17_state_tax=wages * 0.05))
+        r.schedule_c.append(ScheduleCData(line_31_net_profit_loss=wages / 4))
+        r.form_1099_nec.append(Form1099NECData(box1_nonemployee_compensation=5_000.0))
+        r.form_1099_r.append(Form1099RData(box1_gross_distribution=12_000.0, box2b_taxable_not_determined=True))
+        r.ssa_1099.append(FormSSA1099Data(box5_net_benefits=wages / 10))
+        r.brokerage_1099.append(Brokerage1099Data(div_qualified=wages / 20, div_ordinary=wages / 15,
+                                                  b_long_term_covered=wages / 8))
+        clients.append(r)
+    return clients
+
+
+class TestCalculateTaxBatch(unittest.TestCase):
+    def test_matches_scalar_estimates_including_notes(self):
+        for fs in ("single", "mfj", "mfs", "hoh", "bogus"):
+            for year in (2024, 2025):
+                batch = calculate_tax_batch(_firm(), filing_status=fs, num_children=2,
+                                            estimated_payments=1_500, foreign_tax_credit=300.0,
+                                            tax_year=year)
+                for client, est in zip(_firm(), batch):
+                    scalar = calculate_tax(client, filing_status=fs, num_children=2,
+                                           estimated_payments=1_500, foreign_tax_credit=300.0,
+                                           tax_year=year)
+                    self.assertEqual(asdict(est), asdict(scalar))
+
+    def test_recompute_writes_estimates_and_firm_summary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for i, client in enumerate(_firm()):
+                out_dir = root / f"Client_{i}" / "_workpapers"
+                out_dir.mkdir(parents=True)
+                (out_dir / "Data_Extract.json").write_text(json.dumps(client.to_dict()), encoding="utf-8")
+            (root / "No_Outputs_Yet").mkdir()
+
+            config = AppConfig(root=root, tax_year=2024, filing_status="mfj")
+            count = recompute_tax_estimates(sorted(p for p in root.iterdir() if p.is_dir()), config)
+
+            self.assertEqual(count, 6)
+            saved = json.loads((root / "Client_1" / "_workpapers" / "Tax_Estimate.json").read_text("utf-8"))
+            self.assertEqual(saved, asdict(calculate_tax(_client(), filing_status="mfj", tax_year=2024)))
+            summary = (root / "Firm_Tax_Summary.csv").read_text("utf-8").splitlines()
+            self.assertEqual(len(summary), 7)
+            self.assertTrue(summary[0].startswith("client,filing_status,tax_year"))
+
+            single = AppConfig(root=root, tax_year=2024, filing_status="single", client_filter="client_1")
+            self.assertEqual(recompute_tax_estimates([root / "Client_1"], single), 1)
+            with (root / "Firm_Tax_Summary.csv").open(newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([r["client"] for r in rows], [f"Client_{i}" for i in range(6)])
+            self.assertEqual([r["filing_status"] for r in rows], ["mfj", "single", "mfj", "mfj", "mfj", "mfj"])
+
+
+if __name__ == "__main__":
+    unittest.main()
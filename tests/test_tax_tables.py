@@ -0,0 +1,57 @@
+import unittest
+from dataclasses import FrozenInstanceError
+
+from src.tax_calculator import (
+    _CONSTANTS,
+    _SS_THRESHOLDS,
+    _TABLES,
+    _compute_bracket_tax,
+    _get_table,
+)
+
+
+def _incomes(brackets: list) -> list:
+    """Sweep including every bracket floor and values just either side of it."""
+    values = [-100.0, 0.0, 0.01, 1.0, 5_000.5, 2_000_000.0]
+    for floor, _ in brackets:
+        values += [floor - 0.01, float(floor), floor + 0.01, floor * 1.5 + 7.25]
+    return values
+
+
+class TestCompiledTaxTables(unittest.TestCase):
+    def test_every_year_and_status_is_compiled(self):
+        expected = {(y, fs) for y, c in _CONSTANTS.items() for fs in c["standard_deductions"]}
+        self.assertEqual(set(_TABLES), expected)
+
+    def test_tables_mirror_constants(self):
+        for (year, fs), t in _TABLES.items():
+            c = _CONSTANTS[year]
+            self.assertEqual(list(zip(t.floors, t.rates)), [(float(f), r) for f, r in c["brackets"][fs]])
+            self.assertEqual((t.ltcg_zero_top, t.ltcg_fifteen_top), c["ltcg_thresholds"][fs])
+            self.assertEqual(t.standard_deduction, c["standard_deductions"][fs])
+            self.assertEqual(t.salt_cap, c["salt_cap"][fs])
+            self.assertEqual(t.ctc_phase_out, c["ctc_phase_out"][fs])
+            self.assertEqual(t.niit_threshold, c["niit_threshold"][fs])
+            self.assertEqual(t.se_ss_wage_base, c["se_ss_wage_base"])
+            self.assertEqual(t.ctc_per_child, c["ctc_per_child"])
+            self.assertEqual((t.ss_low, t.ss_high), _SS_THRESHOLDS[fs])
+
+    def test_bisect_bracket_tax_matches_naive_loop(self):
+        for (year, fs), t in _TABLES.items():
+            brackets = _CONSTANTS[year]["brackets"][fs]
+            for income in _incomes(brackets):
+                self.assertEqual(t.bracket_tax(income), _compute_bracket_tax(income, brackets),
+                                 f"{year} {fs} income={income}")
+
+    def test_unknown_year_falls_back_to_2025(self):
+        self.assertIs(_get_table(2031, "mfj"), _TABLES[(2025, "mfj")])
+
+    def test_records_are_immutable_and_slotted(self):
+        t = _get_table(2024, "single")
+        with self.assertRaises(FrozenInstanceError):
+            t.salt_cap = 0.0
+        self.assertFalse(hasattr(t, "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
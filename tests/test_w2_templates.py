@@ -0,0 +1,121 @@
+import unittest
+
+from src.extract import w2
+from src.extract.text_utils import normalize_extracted_text
+from src.extract.w2 import clear_w2_templates, parse_w2_text, w2_template_stats
+
+
+def _webb(name, street, wages, fed, ss_wages, ss_tax, medi_tax):
+    """WEBB-style doubled-copy W-2 text with no box labels."""
+    return (
+        f"{wages} {fed} {wages} {fed}\n"
+        f"{ss_wages} {ss_tax} {ss_wages} {ss_tax}\n"
+        "35- 35-\n"
+        f"{ss_wages} {medi_tax} {ss_wages} {medi_tax}\n"
+        "The Companies, Inc. The Companies, Inc.\n"
+        "220 Avenue 220 Avenue\n"
+        "Indianapolis, IN 46204 Indianapolis, IN 46204\n"
+        f"{name} {name}\n"
+        f"{street} {street}\n"
+        "Houston, TX 77008 Houston, TX 77008\n"
+        "D 4686.12 D 4686.12\n"
+        "DD 9664.46 DD 9664.46\n"
+        "X X\n"
+    )
+
+
+_LABELED = (
+    "Form W-2 Wage and Tax Statement 2024\n"
+    "c Employer's name, address, and ZIP code\n"
+    "SAMPLE COMPANY INC\n"
+    "123 MAIN ST\n"
+    "ANYWHERE CA 90001\n"
+    "b Employer identification number (EIN)\n"
+    "12-3456789\n"
+    "e Employee's first name and initial Last name\n"
+    "JOHN SMITH\n"
+    "1234 S MAPLE ST\n"
+    "ANYWHERE CA 90001\n"
+    "1 Wages, tips, other comp. 23500.00\n"
+    "2 Federal income tax withheld 1500.00\n"
+    "3 Social security wages 23500.00\n"
+    "4 Social security tax withheld 1457.00\n"
+    "5 Medicare wages and tips 23500.00\n"
+    "6 Medicare tax withheld 340.75\n"
+    "12a See instructions for box 12\n"
+    "W 500.00\n"
+)
+
+_FIRST = _webb("BRITTANY T WEBB", "6311 Woodbrook Ln", "68357.36", "6879.62", "73043.48", "4528.70", "1059.13")
+_SECOND = _webb("JOHN Q PUBLIC", "12 Main St", "50000.00", "5000.00", "52000.00", "3224.00", "754.00")
+
+
+def _fingerprint(text):
+    return w2._layout_fingerprint(normalize_extracted_text(text))
+
+
+class TestW2LayoutTemplates(unittest.TestCase):
+    def setUp(self):
+        clear_w2_templates()
+
+    def tearDown(self):
+        clear_w2_templates()
+
+    def test_fingerprint_ignores_employee_details_but_not_layout(self):
+        self.assertEqual(_fingerprint(_FIRST), _fingerprint(_SECOND))
+        self.assertNotEqual(_fingerprint(_FIRST), _fingerprint(_LABELED))
+        self.assertIsNone(_fingerprint("W-2\n2024"))
+
+    def test_learned_layout_is_reused_with_identical_output(self):
+        cold = [parse_w2_text(_FIRST), parse_w2_text(_LABELED)]
+        self.assertEqual(w2_template_stats()["learned"], 2)
+        stats_before = w2_template_stats()
+
+        warm = [parse_w2_text(_FIRST), parse_w2_text(_LABELED)]
+        self.assertEqual(warm, cold)
+        second = parse_w2_text(_SECOND)
+        self.assertEqual(second.employee_name, "JOHN Q PUBLIC")
+        self.assertEqual(second.box1_wages, 50000.00)
+        self.assertEqual(second.box4_ss_tax, 3224.00)
+        self.assertEqual(second.box12, {"D": 4686.12, "DD": 9664.46})
+
+        stats = w2_template_stats()
+        self.assertEqual(stats["hits"] - stats_before["hits"], 3)
+        self.assertEqual(stats["misses"], stats_before["misses"])
+        self.assertEqual(stats["fallbacks"], 0)
+        self.assertEqual(stats["templates"], 2)
+
+    def test_plan_miss_falls_back_to_full_cascade(self):
+        expected = parse_w2_text(_LABELED)
+        plan = w2._templates[_fingerprint(_LABELED)]
+        # Pretend the layout was learned from documents with no labels at all.
+        plan.update(employer_name="suffix", employee_name="doubled", labels=(), box12=("A",))
+
+        self.assertEqual(parse_w2_text(_LABELED), expected)
+        stats = w2_template_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertGreaterEqual(stats["fallbacks"], 3)
+        # The plan is relearned from the successful cascade.
+        self.assertEqual(w2._templates[_fingerprint(_LABELED)]["employee_name"], "label")
+
+    def test_plan_does_not_override_higher_priority_strategies(self):
+        # Same layout; only the second W-2 prints the year in the form title.
+        own_line = "Form W-2 Wage and Tax Statement\n2023\n" + _FIRST
+        titled = "Form W-2 Wage and Tax Statement 2024\n2023\n" + _FIRST
+        self.assertEqual(_fingerprint(own_line), _fingerprint(titled))
+        cold = parse_w2_text(titled)
+        self.assertEqual(cold.year, 2024)
+
+        clear_w2_templates()
+        self.assertEqual(parse_w2_text(own_line).year, 2023)
+        self.assertEqual(w2._templates[_fingerprint(own_line)]["year"], "own_line")
+        self.assertEqual(parse_w2_text(titled), cold)
+
+    def test_low_confidence_parse_is_not_learned(self):
+        parse_w2_text("Form W-2 2024\nEIN 12-3456789\nsomething else\n")
+        stats = w2_template_stats()
+        self.assertEqual((stats["misses"], stats["learned"], stats["templates"]), (1, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from src.config import AppConfig
+from src.watch import Debouncer, InotifyWatcher, watch
+
+
+class TestDebouncer(unittest.TestCase):
+    def test_quiet_period_and_max_delay(self):
+        d = Debouncer(debounce=2.0, max_delay=5.0)
+        d.touch("A", 0.0)
+        d.touch("A", 1.5)
+        self.assertEqual(d.pop_ready(3.0), [])
+        self.assertAlmostEqual(d.wait_time(3.0, idle=9.0), 0.5)
+        self.assertEqual(d.pop_ready(3.5), ["A"])
+        self.assertEqual(d.wait_time(3.5, idle=9.0), 9.0)
+
+        for t in (10.0, 11.5, 13.0, 14.5):   # never quiet for 2s
+            d.touch("B", t)
+        self.assertEqual(d.pop_ready(15.0), ["B"])
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for name in ("Alpha", "Beta"):
+            (self.root / name / "Inbox").mkdir(parents=True)
+            (self.root / name / "_workpapers").mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, force_polling: bool, actions, process=None, **config) -> list:
+        calls = []
+
+        def record(client_dir, config):
+            calls.append(client_dir.name)
+            if process is not None:
+                process(client_dir, config)
+
+        stop = threading.Event()
+        t = threading.Thread(target=watch, kwargs=dict(
+            config=AppConfig(root=self.root, tax_year=2024, **config), debounce=0.2,
+            force_polling=force_polling, poll_interval=0.1, stop=stop, process=record,
+        ))
+        t.start()
+        try:
+            time.sleep(0.3)   # watcher set up
+            actions()
+            deadline = time.monotonic() + 5.0
+            while not calls and time.monotonic() < deadline:
+                time.sleep(0.05)
+            time.sleep(0.6)   # let any extra (unwanted) reprocess show up
+        finally:
+            stop.set()
+            t.join(5)
+        return calls
+
+    def _drop_documents(self):
+        (self.root / "Alpha" / "_workpapers" / "Document_Index.csv").write_text("ignored")
+        for i in range(5):
+            (self.root / "Alpha" / "Inbox" / f"w2_{i}.pdf").write_bytes(b"%PDF")
+        (self.root / "Beta" / "Inbox" / "notes.txt").write_text("unsupported")
+
+    def test_polling_reprocesses_only_affected_client_once(self):
+        self.assertEqual(self._run(True, self._drop_documents), ["Alpha"])
+
+    def test_inotify_reprocesses_only_affected_client_once(self):
+        try:
+            InotifyWatcher(self.root).close()
+        except OSError:
+            self.skipTest("inotify unavailable")
+
+        def drop_into_new_folder():
+            sub = self.root / "Beta" / "Inbox" / "scans"
+            sub.mkdir()
+            time.sleep(0.1)
+            (sub / "1098.pdf").write_bytes(b"%PDF")
+
+        self.assertEqual(self._run(False, self._drop_documents), ["Alpha"])
+        self.assertEqual(self._run(False, drop_into_new_folder), ["Beta"])
+
+    def test_own_organize_moves_do_not_trigger_reprocess(self):
+        def organize(client_dir, config):
+            w2_dir = client_dir / "01_Taxpayer" / "W2"
+            w2_dir.mkdir(parents=True, exist_ok=True)
+            for path in (client_dir / "Inbox").glob("*.pdf"):
+                path.rename(w2_dir / path.name)
+
+        backends = [True]
+        try:
+            InotifyWatcher(self.root).close()
+            backends.append(False)
+        except OSError:
+            pass
+        for force_polling in backends:
+            with self.subTest(force_polling=force_polling):
+                shutil.rmtree(self.root / "Alpha" / "01_Taxpayer", ignore_errors=True)
+                self.assertEqual(self._run(force_polling, self._drop_documents, organize, organize=True), ["Alpha"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -119,6 +119,83 @@ class TestWebApp(unittest.TestCase):
         body = resp.data.decode()
         self.assertIn("Generate workpapers first", body)
 
+    # --- client list paging / sorting / filtering ---
+
+    def _add_busy_client(self):
+        busy = _make_client(self.root, "Busy_C")
+        (busy / "_workpapers" / "Document_Index.csv").write_text(
+            "client,file_path,file_name,sha256,doc_type,confidence,detected_year,issuer,key_fields,extraction_notes\n"
+            + "".join(f"C,/c/{i}.pdf,{i}.pdf,s{i},error,0,2024,,{{}},\n" for i in range(5)),
+            encoding="utf-8",
+        )
+
+    def test_api_clients_sorted_and_paged(self):
+        self._add_busy_client()
+        data = self.client.get("/api/clients?sort=docs&order=desc&per_page=2").get_json()
+        self.assertEqual((data["total"], data["pages"]), (3, 2))
+        self.assertEqual([c["client"] for c in data["clients"]], ["Busy_C", "TestClient_A"])
+        self.assertEqual(data["clients"][0]["error_count"], 5)
+        self.assertEqual(data["clients"][1]["url"], "/client/TestClient_A")
+
+        page2 = self.client.get("/api/clients?sort=docs&order=desc&per_page=2&page=2").get_json()
+        self.assertEqual([c["client"] for c in page2["clients"]], ["TestClient_B"])
+
+    def test_api_clients_filters(self):
+        self._add_busy_client()
+        (self.root / "Empty").mkdir()
+        errors = self.client.get("/api/clients?filter=errors").get_json()
+        self.assertEqual([c["client"] for c in errors["clients"]], ["Busy_C"])
+        named = self.client.get("/api/clients?q=client_b").get_json()
+        self.assertEqual([c["client"] for c in named["clients"]], ["TestClient_B"])
+        empty = self.client.get("/api/clients?filter=no_outputs&filter=bogus&sort=bogus").get_json()
+        self.assertEqual([c["client"] for c in empty["clients"]], ["Empty"])
+
+    def test_index_paginates(self):
+        self._add_busy_client()
+        body = self.client.get("/?per_page=1&page=2&filter=tasks").data.decode()
+        self.assertIn("Page 2 of 3", body)
+        self.assertIn("TestClient_A", body)
+        self.assertNotIn('href="/client/Busy_C"', body)
+        self.assertIn("filter=tasks", body)
+
+    # --- CSV export ---
+
+    def test_client_export_streams_rows_with_overrides(self):
+        wp = self.root / "TestClient_A" / "_workpapers"
+        (wp / "Document_Index.csv").write_text(
+            "client,file_path,file_name,sha256,doc_type,confidence,detected_year,issuer,key_fields,extraction_notes\n"
+            + "".join(
+                f'A,/a/{i}.pdf,{i}.pdf,s{i},w2,0.9,2024,ACME,"{{""box1_wages"": {i}, ""box12"": []}}",\n'
+                for i in range(600)
+            ),
+            encoding="utf-8",
+        )
+        (wp / "overrides.json").write_text('{"s7": {"fields": {"box1_wages": "70"}, "notes": "checked"}}', encoding="utf-8")
+        resp = self.client.get("/client/TestClient_A/export.csv")
+        self.assertTrue(resp.is_streamed)
+        lines = resp.data.decode().splitlines()
+        self.assertEqual(lines[0], "file_name,doc_type,confidence,detected_year,issuer,sha256,extraction_notes,"
+                                   "box1_wages,preparer_notes")
+        self.assertEqual(len(lines), 601)
+        self.assertEqual(lines[8], "7.pdf,w2,0.9,2024,ACME,s7,,70,checked")
+
+    def test_whole_root_export_concatenates_clients(self):
+        resp = self.client.get("/export.csv")
+        self.assertEqual(resp.status_code, 200)
+        lines = resp.data.decode().splitlines()
+        self.assertTrue(lines[0].startswith("client,file_name,"))
+        self.assertEqual([ln.split(",")[0] for ln in lines[1:]], ["TestClient_A"] * 2 + ["TestClient_B"] * 2)
+
+    # --- debug ---
+
+    def test_debug_cache_reports_hits_and_misses(self):
+        self.client.get("/client/TestClient_A")
+        self.client.get("/client/TestClient_A")
+        stats = self.client.get("/debug/cache").get_json()
+        self.assertGreater(stats["hits"], 0)
+        self.assertGreater(stats["misses"], 0)
+        self.assertLessEqual(stats["entries"], stats["max_entries"])
+
 
 if __name__ == "__main__":
     unittest.main()